@@ -0,0 +1,588 @@
+"""benchmark toolsql operations across drivers, output formats, and table sizes
+
+usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare baseline.json results.json
+
+- measures insert, select, update, and delete throughput in rows per second
+- measures peak python memory of each case using tracemalloc
+- postgresql cases are skipped if no server is reachable at --postgres-uri
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+import uuid
+
+import toolsql
+from toolsql.spec.typedefs import statement_types
+
+
+default_row_counts = [1000, 10000]
+default_widths = [4, 16, 64]
+default_repeats = 3
+
+default_postgres_uri = os.environ.get(
+    'TOOLSQL_BENCHMARK_POSTGRES_URI',
+    'postgresql://toolsql_test@localhost/toolsql_test',
+)
+
+operations = ['insert', 'select', 'update', 'delete']
+
+# (driver, dbms, sync)
+drivers = [
+    ('sqlite3', 'sqlite', True),
+    ('aiosqlite', 'sqlite', False),
+    ('psycopg', 'postgresql', True),
+    ('psycopg', 'postgresql', False),
+    ('connectorx', 'sqlite', True),
+    ('connectorx', 'postgresql', True),
+]
+
+# every output format of toolsql, so that new formats are benchmarked too
+output_formats = list(typing.get_args(statement_types.QueryOutputFormat))
+
+# output formats that require a single row or single column of output
+single_row_formats = [
+    'single_tuple',
+    'single_tuple_or_none',
+    'single_dict',
+    'single_dict_or_none',
+    'cell',
+    'cell_or_none',
+]
+single_column_formats = ['cell', 'cell_or_none', 'single_column']
+
+column_kinds = ['plain', 'json', 'sparse_json', 'binary']
+
+
+#
+# # tables
+#
+
+
+def get_benchmark_table(width: int, column_kind: str) -> dict[str, typing.Any]:
+    """create table schema with id column plus width data columns
+
+    column_kind determines the type of data columns
+    - plain: alternating int, float, and text columns
+    - json: alternating int and JSON columns
+    - sparse_json: plain columns plus a single JSON column, as in wide tables
+    - binary: alternating int and BINARY columns
+    """
+
+    columns: dict[str, typing.Any] = {'id': {'type': int, 'primary': True}}
+    for c in range(width):
+        if column_kind == 'plain':
+            column_type = [int, float, str][c % 3]
+        elif column_kind == 'json':
+            column_type = [int, dict][c % 2]
+        elif column_kind == 'sparse_json':
+            column_type = dict if c == 0 else [int, float, str][c % 3]
+        elif column_kind == 'binary':
+            column_type = [int, bytes][c % 2]
+        else:
+            raise Exception('unknown column kind: ' + str(column_kind))
+        columns['column_' + str(c)] = column_type
+
+    return toolsql.normalize_shorthand_table_schema(
+        {'name': 'benchmark_' + uuid.uuid4().hex[:12], 'columns': columns}
+    )
+
+
+def get_benchmark_rows(
+    n_rows: int, table: typing.Mapping[str, typing.Any]
+) -> list[tuple[typing.Any, ...]]:
+    column_types = [column['type'] for column in table['columns'][1:]]
+    rows = []
+    for i in range(n_rows):
+        row: list[typing.Any] = [i]
+        for c, column_type in enumerate(column_types):
+            if column_type in ('INTEGER', 'BIGINT'):
+                row.append(i * c)
+            elif column_type == 'FLOAT':
+                row.append(i / (c + 1))
+            elif column_type == 'TEXT':
+                row.append('value_' + str(i))
+            elif column_type == 'JSON':
+                row.append({'i': i, 'c': c, 'tags': ['a', 'b']})
+            elif column_type == 'BINARY':
+                row.append(i.to_bytes(8, 'big'))
+            else:
+                raise Exception('unknown column type: ' + str(column_type))
+        rows.append(tuple(row))
+    return rows
+
+
+_update_values = {
+    'INTEGER': -1,
+    'BIGINT': -1,
+    'FLOAT': -1.0,
+    'TEXT': 'updated',
+    'BINARY': b'updated',
+    # update() binds values as given, so JSON is written as encoded text
+    'JSON': '{"updated": true}',
+}
+
+
+def get_update_values(
+    table: typing.Mapping[str, typing.Any]
+) -> dict[str, typing.Any]:
+    """get values of update case, in first data column that is not JSON"""
+    data_columns = table['columns'][1:]
+    for column in data_columns:
+        if column['type'] != 'JSON':
+            break
+    else:
+        column = data_columns[0]
+    return {column['name']: _update_values[column['type']]}
+
+
+#
+# # measurement
+#
+
+
+def measure(
+    run: typing.Callable[[], typing.Any],
+    *,
+    setup: typing.Callable[[], typing.Any] | None = None,
+    teardown: typing.Callable[[], typing.Any] | None = None,
+    repeats: int,
+    trace_memory: bool,
+) -> dict[str, typing.Any]:
+    """time run() over repeats
+
+    setup() and teardown() are called around each repeat, outside of timing
+    """
+
+    times = []
+    for r in range(repeats):
+        if setup is not None:
+            setup()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        finally:
+            if teardown is not None:
+                teardown()
+
+    peak_memory = None
+    if trace_memory:
+        if setup is not None:
+            setup()
+        try:
+            tracemalloc.start()
+            try:
+                run()
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            if teardown is not None:
+                teardown()
+
+    return {
+        'min_seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def get_postgres_db_config(uri: str) -> dict[str, typing.Any]:
+    db_config = toolsql.parse_uri(uri)
+    return {key: value for key, value in db_config.items() if value is not None}
+
+
+def postgres_available(uri: str) -> bool:
+    try:
+        db_config = get_postgres_db_config(uri)
+        with toolsql.connect({'driver': 'psycopg', **db_config}) as conn:
+            toolsql.raw_select('SELECT 1', conn=conn)
+        return True
+    except Exception:
+        return False
+
+
+#
+# # cases
+#
+
+
+def run_case(
+    *,
+    driver: str,
+    db_config: dict[str, typing.Any],
+    sync: bool,
+    operation: str,
+    output_format: str | None,
+    n_rows: int,
+    width: int,
+    column_kind: str,
+    repeats: int,
+    trace_memory: bool,
+) -> dict[str, typing.Any]:
+
+    table = get_benchmark_table(width=width, column_kind=column_kind)
+    rows = get_benchmark_rows(n_rows, table)
+
+    # tables are created and written through a sync dbapi connection
+    write_config = dict(db_config)
+    if driver in ['aiosqlite', 'connectorx']:
+        write_config['driver'] = (
+            'sqlite3' if db_config['dbms'] == 'sqlite' else 'psycopg'
+        )
+
+    def reset(populate: bool) -> None:
+        with toolsql.connect(write_config) as conn:
+            toolsql.drop_table(
+                table=table['name'], conn=conn, confirm=True, if_exists=True
+            )
+            toolsql.create_table(table=table, conn=conn, confirm=True)
+            if populate:
+                toolsql.insert(rows=rows, table=table, conn=conn)
+
+    kwargs: dict[str, typing.Any] = {'table': table}
+    if operation == 'select':
+        kwargs['output_format'] = output_format
+        if output_format in single_row_formats:
+            kwargs['where_equals'] = {'id': 0}
+        if output_format in single_column_formats:
+            kwargs['columns'] = ['column_0']
+    elif operation == 'insert':
+        kwargs['rows'] = rows
+    elif operation == 'update':
+        kwargs['values'] = get_update_values(table)
+        kwargs['where_gte'] = {'id': 0}
+    elif operation == 'delete':
+        kwargs['where_gte'] = {'id': 0}
+
+    # connections are opened in setup() so that only the operation is timed
+    conns: list[typing.Any] = []
+    loop = None if sync else asyncio.new_event_loop()
+
+    if sync:
+        function = getattr(toolsql, operation)
+
+        def connect() -> None:
+            conns.append(toolsql.connect(db_config, as_context=False))
+
+        def disconnect() -> None:
+            conns.pop().close()
+
+        def run() -> None:
+            result = function(conn=conns[-1], **kwargs)
+            if output_format == 'polars_lazy':
+                result.collect()
+
+    else:
+        async_function = getattr(toolsql, 'async_' + operation)
+
+        async def async_connect() -> typing.Any:
+            return await toolsql.async_connect(db_config, as_context=False)
+
+        def connect() -> None:
+            conns.append(loop.run_until_complete(async_connect()))
+
+        def disconnect() -> None:
+            loop.run_until_complete(conns.pop().close())
+
+        def run() -> None:
+            loop.run_until_complete(async_function(conn=conns[-1], **kwargs))
+
+    def setup() -> None:
+        if operation != 'select':
+            reset(populate=operation != 'insert')
+        connect()
+
+    try:
+        if operation == 'select':
+            reset(populate=True)
+        result = measure(
+            run,
+            setup=setup,
+            teardown=disconnect,
+            repeats=repeats,
+            trace_memory=trace_memory,
+        )
+        status = 'ok'
+        error = None
+    except Exception as e:
+        result = None
+        status = 'error'
+        error = type(e).__name__ + ': ' + str(e)
+    finally:
+        if loop is not None:
+            loop.close()
+        try:
+            with toolsql.connect(write_config) as conn:
+                toolsql.drop_table(
+                    table=table['name'], conn=conn, confirm=True, if_exists=True
+                )
+        except Exception:
+            pass
+
+    case: dict[str, typing.Any] = {
+        'driver': driver,
+        'dbms': db_config['dbms'],
+        'sync': sync,
+        'operation': operation,
+        'output_format': output_format,
+        'n_rows': n_rows,
+        'width': width,
+        'column_kind': column_kind,
+        'status': status,
+        'error': error,
+    }
+    if result is not None:
+        case.update(result)
+        if operation == 'select' and output_format in single_row_formats:
+            processed_rows = 1
+        else:
+            processed_rows = n_rows
+        case['rows_per_second'] = processed_rows / result['min_seconds']
+    return case
+
+
+def get_cases(
+    *,
+    row_counts: typing.Sequence[int],
+    widths: typing.Sequence[int],
+    selected_drivers: typing.Sequence[str] | None,
+    selected_operations: typing.Sequence[str],
+    selected_formats: typing.Sequence[str],
+    selected_column_kinds: typing.Sequence[str],
+) -> typing.Iterator[dict[str, typing.Any]]:
+    for driver, dbms, sync in drivers:
+        if selected_drivers is not None and driver not in selected_drivers:
+            continue
+        for operation in selected_operations:
+            # connectorx is read-only
+            if driver == 'connectorx' and operation != 'select':
+                continue
+            if operation == 'select':
+                # connectorx has no cursors and async selects are not lazy
+                formats: typing.Sequence[str | None] = [
+                    output_format
+                    for output_format in selected_formats
+                    if not (driver == 'connectorx' and output_format == 'cursor')
+                    and not (not sync and output_format == 'polars_lazy')
+                ]
+            else:
+                formats = [None]
+            for output_format in formats:
+                for column_kind in selected_column_kinds:
+                    for width in widths:
+                        for n_rows in row_counts:
+                            yield {
+                                'driver': driver,
+                                'dbms': dbms,
+                                'sync': sync,
+                                'operation': operation,
+                                'output_format': output_format,
+                                'n_rows': n_rows,
+                                'width': width,
+                                'column_kind': column_kind,
+                            }
+
+
+def run_benchmarks(
+    *,
+    row_counts: typing.Sequence[int] = default_row_counts,
+    widths: typing.Sequence[int] = default_widths,
+    selected_drivers: typing.Sequence[str] | None = None,
+    selected_operations: typing.Sequence[str] = operations,
+    selected_formats: typing.Sequence[str] = output_formats,
+    selected_column_kinds: typing.Sequence[str] = column_kinds,
+    repeats: int = default_repeats,
+    trace_memory: bool = True,
+    postgres_uri: str = default_postgres_uri,
+    verbose: bool = True,
+) -> dict[str, typing.Any]:
+
+    tempdir = tempfile.mkdtemp()
+    sqlite_config = {
+        'dbms': 'sqlite',
+        'path': os.path.join(tempdir, 'benchmark.sqlite'),
+    }
+    has_postgres = postgres_available(postgres_uri)
+    if not has_postgres and verbose:
+        print('postgresql not available at', postgres_uri, ', skipping')
+
+    results = []
+    for case in get_cases(
+        row_counts=row_counts,
+        widths=widths,
+        selected_drivers=selected_drivers,
+        selected_operations=selected_operations,
+        selected_formats=selected_formats,
+        selected_column_kinds=selected_column_kinds,
+    ):
+        if case['dbms'] == 'postgresql':
+            if not has_postgres:
+                results.append(dict(case, status='skipped'))
+                continue
+            base_config = get_postgres_db_config(postgres_uri)
+        else:
+            base_config = sqlite_config
+        db_config = {'driver': case['driver'], **base_config}
+
+        result = run_case(
+            driver=case['driver'],
+            db_config=db_config,
+            sync=case['sync'],
+            operation=case['operation'],
+            output_format=case['output_format'],
+            n_rows=case['n_rows'],
+            width=case['width'],
+            column_kind=case['column_kind'],
+            repeats=repeats,
+            trace_memory=trace_memory,
+        )
+        results.append(result)
+        if verbose:
+            print(format_result(result))
+
+    return {
+        'metadata': {
+            'toolsql_version': toolsql.__version__,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+#
+# # reporting
+#
+
+
+def get_case_key(result: typing.Mapping[str, typing.Any]) -> tuple[typing.Any, ...]:
+    return (
+        result['driver'],
+        result['dbms'],
+        result['sync'],
+        result['operation'],
+        result['output_format'],
+        result['n_rows'],
+        result['width'],
+        result['column_kind'],
+    )
+
+
+def format_case(result: typing.Mapping[str, typing.Any]) -> str:
+    name = result['driver'] + ('' if result['sync'] else '[async]')
+    name += ' ' + result['dbms'] + ' ' + result['operation']
+    if result['output_format'] is not None:
+        name += ' ' + result['output_format']
+    name += ' rows={n_rows} width={width} {column_kind}'.format(**result)
+    return name
+
+
+def format_result(result: typing.Mapping[str, typing.Any]) -> str:
+    if result['status'] != 'ok':
+        return format_case(result) + ': ' + str(result.get('error'))
+    line = format_case(result) + ': {:,.0f} rows/s'.format(
+        result['rows_per_second']
+    )
+    if result.get('peak_memory_bytes') is not None:
+        line += ', peak {:,.1f} MiB'.format(
+            result['peak_memory_bytes'] / 1024 / 1024
+        )
+    return line
+
+
+def compare_results(
+    baseline: typing.Mapping[str, typing.Any],
+    current: typing.Mapping[str, typing.Any],
+) -> list[str]:
+    """compare rows per second of matching cases from two runs"""
+    baseline_results = {
+        get_case_key(result): result
+        for result in baseline['results']
+        if result['status'] == 'ok'
+    }
+    lines = []
+    for result in current['results']:
+        if result['status'] != 'ok':
+            continue
+        before = baseline_results.get(get_case_key(result))
+        if before is None:
+            continue
+        ratio = result['rows_per_second'] / before['rows_per_second']
+        lines.append('{:6.2f}x  {}'.format(ratio, format_case(result)))
+    return lines
+
+
+def parse_ints(text: str) -> list[int]:
+    return [int(item) for item in text.split(',')]
+
+
+def parse_strs(text: str) -> list[str]:
+    return text.split(',')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=parse_ints, default=default_row_counts)
+    parser.add_argument('--widths', type=parse_ints, default=default_widths)
+    parser.add_argument('--drivers', type=parse_strs)
+    parser.add_argument('--operations', type=parse_strs, default=operations)
+    parser.add_argument('--formats', type=parse_strs, default=output_formats)
+    parser.add_argument(
+        '--column-kinds', type=parse_strs, default=column_kinds
+    )
+    parser.add_argument('--repeats', type=int, default=default_repeats)
+    parser.add_argument('--no-memory', action='store_true')
+    parser.add_argument('--postgres-uri', default=default_postgres_uri)
+    parser.add_argument('--output', help='path of JSON results file')
+    parser.add_argument(
+        '--compare',
+        nargs=2,
+        metavar=('BASELINE', 'CURRENT'),
+        help='compare two JSON results files',
+    )
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        for line in compare_results(baseline, current):
+            print(line)
+        return
+
+    results = run_benchmarks(
+        row_counts=args.rows,
+        widths=args.widths,
+        selected_drivers=args.drivers,
+        selected_operations=args.operations,
+        selected_formats=args.formats,
+        selected_column_kinds=args.column_kinds,
+        repeats=args.repeats,
+        trace_memory=not args.no_memory,
+        postgres_uri=args.postgres_uri,
+    )
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+        print('results saved to', args.output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
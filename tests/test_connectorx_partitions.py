@@ -0,0 +1,115 @@
+import pytest
+
+import conf.conf_db_configs as conf_db_configs
+import toolsql
+
+
+db_configs = [
+    (
+        {'driver': 'sqlite3', **conf_db_configs.sqlite_db_config},
+        {'driver': 'connectorx', **conf_db_configs.sqlite_db_config},
+    ),
+    (
+        {'driver': 'psycopg', **conf_db_configs.postgres_db_config},
+        {'driver': 'connectorx', **conf_db_configs.postgres_db_config},
+    ),
+]
+
+
+@pytest.fixture(params=db_configs)
+def partition_table(request, fresh_simple_table):
+    sync_db_config, connectorx_db_config = request.param
+    schema = fresh_simple_table['schema']
+    rows = [(i, 'row_' + str(i), 'alright', b'', i % 2 == 0) for i in range(100)]
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+    return connectorx_db_config, schema, rows
+
+
+@pytest.mark.parametrize('partition_num', [1, 4])
+def test_select_partitioned(partition_table, partition_num):
+
+    db_config, schema, rows = partition_table
+    with toolsql.connect(db_config) as conn:
+        result = toolsql.select(
+            table=schema['name'],
+            conn=conn,
+            output_format='tuple',
+            partition_num=partition_num,
+        )
+        filtered = toolsql.select(
+            table=schema['name'],
+            conn=conn,
+            output_format='polars',
+            where_gte={'id': 50},
+            partition_on='id',
+            partition_num=partition_num,
+            partition_range=(0, 99),
+        )
+
+    assert sorted(result) == rows
+    assert sorted(filtered['id'].to_list()) == list(range(50, 100))
+
+
+def test_select_partitioned_uses_schema_cache(partition_table, monkeypatch):
+
+    db_config, schema, rows = partition_table
+    with toolsql.connect(db_config) as conn:
+        toolsql.select(table=schema['name'], conn=conn, partition_num=2)
+        cached = toolsql.get_cached_table_partition_column(
+            schema['name'], cache_key=toolsql.get_schema_cache_key(conn)
+        )
+        assert cached == 'id'
+
+        # cached partition column does not connect to read table schema
+        def connect(*args, **kwargs):
+            raise Exception('schema connection opened')
+
+        monkeypatch.setattr(toolsql.drivers, 'connect', connect)
+        result = toolsql.select(
+            table=schema['name'],
+            conn=conn,
+            output_format='tuple',
+            partition_num=2,
+        )
+
+    assert sorted(result) == rows
+
+
+def test_raw_select_partitioned(partition_table):
+
+    db_config, schema, rows = partition_table
+    with toolsql.connect(db_config) as conn:
+        result = toolsql.raw_select(
+            sql='SELECT id, name FROM ' + schema['name'],
+            conn=conn,
+            output_format='tuple',
+            partition_on='id',
+            partition_num=3,
+        )
+        with pytest.raises(Exception):
+            toolsql.raw_select(
+                sql='SELECT id, name FROM ' + schema['name'],
+                conn=conn,
+                partition_num=3,
+            )
+
+    assert sorted(result) == [row[:2] for row in rows]
+
+
+def test_select_partitioned_requires_connectorx(fresh_simple_table):
+
+    db_config = {'driver': 'sqlite3', **conf_db_configs.sqlite_db_config}
+    schema = fresh_simple_table['schema']
+    with toolsql.connect(db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        with pytest.raises(Exception):
+            toolsql.select(table=schema['name'], conn=conn, partition_num=2)
+        with pytest.raises(Exception):
+            toolsql.select(
+                table=schema['name'],
+                conn=conn,
+                partition_on='id',
+                order_by='id',
+            )
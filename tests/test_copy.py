@@ -0,0 +1,127 @@
+import polars as pl
+import pytest
+
+import conf.conf_db_configs as conf_db_configs
+import toolsql
+
+
+postgres_db_config = {'driver': 'psycopg', **conf_db_configs.postgres_db_config}
+
+
+def _create_table(schema):
+    with toolsql.connect(postgres_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+
+
+@pytest.mark.parametrize('row_format', ['tuple', 'dict', 'polars'])
+@pytest.mark.parametrize('binary', [None, False])
+def test_copy_insert(fresh_simple_table, row_format, binary):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    columns = [column['name'] for column in schema['columns']]
+    _create_table(schema)
+
+    if row_format == 'tuple':
+        copy_rows = rows
+    elif row_format == 'dict':
+        copy_rows = [dict(zip(columns, row)) for row in rows]
+    elif row_format == 'polars':
+        copy_rows = pl.DataFrame(rows, schema=columns, orient='row')
+    else:
+        raise Exception('unknown row format')
+
+    with toolsql.connect(postgres_db_config) as conn:
+        toolsql.copy_insert(
+            rows=copy_rows, table=schema['name'], conn=conn, binary=binary
+        )
+        result = toolsql.select(
+            table=schema['name'], conn=conn, output_format='tuple'
+        )
+    assert result == rows
+
+
+def test_copy_insert_upsert(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    _create_table(schema)
+
+    with toolsql.connect(postgres_db_config) as conn:
+        toolsql.copy_insert(rows=rows[:3], table=schema, conn=conn)
+
+        # ignore existing rows
+        changed = [(row[0], row[1] + '!') + tuple(row[2:]) for row in rows]
+        toolsql.copy_insert(
+            rows=changed[:4], table=schema, conn=conn, on_conflict='ignore'
+        )
+        result = toolsql.select(
+            table=schema, conn=conn, output_format='tuple', order_by='id'
+        )
+        assert result == rows[:3] + changed[3:4]
+
+        # overwrite existing rows
+        toolsql.copy_insert(rows=changed, table=schema, conn=conn, upsert=True)
+        result = toolsql.select(
+            table=schema, conn=conn, output_format='tuple', order_by='id'
+        )
+        assert result == changed
+
+
+def test_copy_insert_unknown_dict_key(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    columns = [column['name'] for column in schema['columns']]
+    _create_table(schema)
+
+    copy_rows = [dict(zip(columns, row), extra=1) for row in rows]
+    with toolsql.connect(postgres_db_config) as conn:
+        with pytest.raises(Exception, match='not a column of table'):
+            toolsql.copy_insert(rows=copy_rows, table=schema, conn=conn)
+        result = toolsql.select(table=schema, conn=conn, output_format='tuple')
+    assert result == []
+
+
+def test_copy_insert_via_insert(fresh_pokemon_table):
+
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+    _create_table(schema)
+
+    toolsql.insert(
+        rows=rows,
+        table=schema,
+        conn=postgres_db_config,
+        _use_postgresql_copy=True,
+    )
+    with toolsql.connect(postgres_db_config) as conn:
+        result = toolsql.select(
+            table=schema, conn=conn, output_format='tuple', order_by='id'
+        )
+    assert result == rows
+
+
+async def test_async_copy_insert(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    _create_table(schema)
+
+    async with toolsql.async_connect(postgres_db_config) as conn:
+        await toolsql.async_insert(
+            rows=rows,
+            table=schema['name'],
+            conn=conn,
+            _use_postgresql_copy=True,
+        )
+        await toolsql.async_copy_insert(
+            rows=rows,
+            table=schema,
+            conn=conn,
+            on_conflict='ignore',
+        )
+        result = await toolsql.async_select(
+            table=schema['name'], conn=conn, output_format='tuple'
+        )
+    assert result == rows
@@ -190,3 +190,100 @@ async def test_async_delete(
     with toolsql.connect(sync_db_config) as conn:
         toolsql.drop_table(table=schema, conn=conn, confirm=True)
 
+
+
+def test_sync_delete_many(sync_write_db_config, fresh_pokemon_table):
+
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        # keys streamed from a generator, including missing keys
+        n_deleted = toolsql.delete_many(
+            conn=conn,
+            table=schema,
+            keys=(i for i in range(0, 1000, 2)),
+            key_columns='id',
+            chunk_size=150,
+        )
+        assert n_deleted == len([row for row in rows if row[0] % 2 == 0])
+
+        # composite keys
+        n_deleted = toolsql.delete_many(
+            conn=conn,
+            table=schema['name'],
+            keys=[(row[0], row[1]) for row in rows[:9]] + [(3, 'Ivysaur')],
+            key_columns=['id', 'name'],
+            chunk_size=2,
+        )
+        assert n_deleted == 5
+
+        result = toolsql.select(
+            table=schema,
+            columns=['id'],
+            order_by='id',
+            conn=conn,
+            output_format='single_column',
+        )
+
+    assert list(result) == [row[0] for row in rows[9:] if row[0] % 2 == 1]
+
+
+async def test_async_delete_many(async_write_db_config, fresh_simple_table):
+
+    sync_db_config = toolsql.create_db_config(async_write_db_config, sync=True)
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+    async with toolsql.async_connect(async_write_db_config) as conn:
+        n_deleted = await toolsql.async_delete_many(
+            conn=conn,
+            table=schema,
+            keys=[{'id': row[0], 'raw_data': row[3]} for row in rows[1:]],
+            key_columns=['id', 'raw_data'],
+        )
+        result = await toolsql.async_select(
+            table=schema, conn=conn, output_format='tuple'
+        )
+
+    assert n_deleted == len(rows) - 1
+    assert result == rows[:1]
+
+
+def test_delete_many_statements():
+
+    chunks = list(
+        toolsql.build_delete_many_statements(
+            dialect='postgresql',
+            table='simple',
+            keys=range(25),
+            key_columns='id',
+            chunk_size=10,
+        )
+    )
+    assert [parameters for _, parameters in chunks] == [
+        (list(range(0, 10)),),
+        (list(range(10, 20)),),
+        (list(range(20, 25)),),
+    ]
+    assert chunks[0][0] == 'DELETE FROM simple WHERE id = ANY(%s)'
+
+    sql, parameters = next(
+        toolsql.build_delete_many_statements(
+            dialect='sqlite',
+            table='simple',
+            keys=[(1, 'a'), (2, 'b')],
+            key_columns=['id', 'name'],
+        )
+    )
+    assert sql == (
+        'DELETE FROM simple WHERE (id, name) IN (VALUES (?, ?), (?, ?))'
+    )
+    assert parameters == [1, 'a', 2, 'b']
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import toolsql
+
+
+# cumulative microseconds of `import toolsql`, previously ~100ms
+import_time_budget = 50000
+
+lazy_dependencies = [
+    'connectorx',
+    'numpy',
+    'pandas',
+    'polars',
+    'psycopg',
+    'pyarrow',
+]
+
+
+def _run_import(code):
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_import_time_budget():
+
+    times = []
+    for i in range(3):
+        stderr = _run_import('import toolsql').stderr
+        for line in stderr.splitlines():
+            fields = [field.strip() for field in line.split('|')]
+            if fields[-1] == 'toolsql':
+                times.append(int(fields[1]))
+    assert min(times) < import_time_budget
+
+
+def test_import_is_lazy():
+
+    code = 'import sys, toolsql; print(",".join(sorted(sys.modules)))'
+    modules = _run_import(code).stdout.strip().split(',')
+    for dependency in lazy_dependencies:
+        assert dependency not in modules
+    assert [module for module in modules if module.startswith('toolsql')] == [
+        'toolsql'
+    ]
+
+
+def test_lazy_namespace():
+
+    assert toolsql.select is toolsql.executors.select
+    statements = toolsql.statements
+    assert toolsql.build_select_statement is statements.build_select_statement
+    assert toolsql.formats.format_row_tuples is not None
+    assert 'select' in dir(toolsql)
+    assert 'connect' in toolsql.__all__
+
+    namespace = {}
+    exec('from toolsql import *', namespace)
+    assert namespace['async_select'] is toolsql.async_select
@@ -474,3 +474,64 @@ def test_insert_using_default_value(
 #         )
 #     helpers.assert_results_equal(result=result, target_result=polars_pokemon)
 
+
+
+def test_sync_insert_multirow(sync_write_db_config, fresh_pokemon_table, helpers):
+
+    sync_db_config = sync_write_db_config
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(
+            table=schema, rows=rows, conn=conn, multirow=True, chunk_size=7
+        )
+        result = toolsql.select(
+            table=schema, order_by='id', conn=conn, output_format='polars'
+        )
+    helpers.assert_results_equal(result=result, target_result=polars_pokemon)
+
+
+async def test_async_insert_multirow(
+    async_write_db_config, fresh_pokemon_table, helpers
+):
+
+    async_db_config = async_write_db_config
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+    dict_rows = [dict(zip(pokemon_columns, row)) for row in rows]
+
+    sync_db_config = toolsql.create_db_config(async_db_config, sync=True)
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+
+    async with toolsql.async_connect(async_db_config) as conn:
+        await toolsql.async_insert(
+            table=schema, rows=dict_rows, conn=conn, multirow=True
+        )
+        result = await toolsql.async_select(
+            table=schema, order_by='id', conn=conn, output_format='polars'
+        )
+    helpers.assert_results_equal(result=result, target_result=polars_pokemon)
+
+
+def test_multirow_insert_chunking():
+
+    rows = [(i, str(i)) for i in range(10)]
+    statements = toolsql.build_multirow_insert_statements(
+        rows=rows, table='t', columns=['a', 'b'], dialect='postgresql', chunk_size=4
+    )
+    assert [len(parameters) for _, parameters in statements] == [8, 8, 4]
+    assert statements[0][0].count('(%s, %s)') == 4
+
+    # chunk size is capped by parameter limit
+    max_parameters = toolsql.get_max_parameters('sqlite')
+    rows = [(i, i, i) for i in range(max_parameters)]
+    statements = toolsql.build_multirow_insert_statements(
+        rows=rows, table='t', dialect='sqlite', chunk_size=10 ** 9
+    )
+    assert all(
+        len(parameters) <= max_parameters for _, parameters in statements
+    )
+    assert sum(len(parameters) for _, parameters in statements) == 3 * len(rows)
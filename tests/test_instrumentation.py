@@ -0,0 +1,176 @@
+import logging
+
+import pytest
+
+import toolsql
+
+
+@pytest.fixture
+def aggregator():
+    aggregator = toolsql.QueryStatsAggregator()
+    events = []
+    toolsql.add_query_hook(aggregator)
+    toolsql.add_query_hook(events.append)
+    yield aggregator, events
+    toolsql.clear_query_hooks()
+
+
+def test_select_events(sync_read_conn_db_config, aggregator, fresh_simple_table):
+
+    aggregator, events = aggregator
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    write_config = dict(sync_read_conn_db_config)
+    if write_config['driver'] == 'connectorx':
+        write_config['driver'] = None
+    with toolsql.connect(write_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+    events.clear()
+    aggregator.reset()
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        for i in range(3):
+            toolsql.select(
+                table=schema,
+                where_gte={'id': 5 + i},
+                conn=conn,
+                output_format='polars',
+            )
+
+    assert len(events) == 3
+    event = events[-1]
+    assert event['operation'] == 'select'
+    assert event['driver'] == sync_read_conn_db_config['driver']
+    assert event['n_rows'] == 2
+    assert event['error'] is None
+    assert {'build', 'fetch', 'decode', 'format'} <= set(event['timings'])
+    assert event['duration'] >= sum(event['timings'].values()) * 0.999
+
+    stats = aggregator.get_stats()
+    assert len(stats) == 1
+    (fingerprint,) = stats.keys()
+    assert stats[fingerprint]['n_queries'] == 3
+    assert stats[fingerprint]['n_rows'] == 4 + 3 + 2
+    assert stats[fingerprint]['p50_seconds'] <= stats[fingerprint]['p99_seconds']
+
+
+def test_write_events(sync_write_db_config, aggregator, fresh_simple_table):
+
+    aggregator, events = aggregator
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        events.clear()
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        toolsql.delete(table=schema, where_equals={'id': 5}, conn=conn)
+
+    insert_event, delete_event = events
+    assert insert_event['operation'] == 'executemany'
+    assert insert_event['n_rows'] == len(rows)
+    assert insert_event['n_parameters'] == len(rows) * len(rows[0])
+    assert delete_event['operation'] == 'execute'
+    assert delete_event['n_parameters'] == 1
+
+
+def test_build_timings(sync_write_db_config, aggregator, fresh_simple_table):
+
+    aggregator, events = aggregator
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        # build time of statements that are not executed is discarded
+        toolsql.update_many(table=schema, rows=[], key_columns='id', conn=conn)
+        with pytest.raises(Exception):
+            toolsql.update(table=schema, values=[1], conn=conn)
+        events.clear()
+        toolsql.raw_select('SELECT 1', conn=conn)
+        assert 'build' not in events[-1]['timings']
+
+        # build time is split among statements of each chunk
+        events.clear()
+        toolsql.update_many(
+            table=schema,
+            rows=[{'id': row[0], 'name': row[1]} for row in rows],
+            key_columns='id',
+            chunk_size=2,
+            conn=conn,
+        )
+        toolsql.raw_select('SELECT 1', conn=conn)
+    chunk_events = events[:-1]
+    assert len(chunk_events) > 1
+    assert all('build' in event['timings'] for event in chunk_events)
+    assert len({event['timings']['build'] for event in chunk_events}) == 1
+    assert 'build' not in events[-1]['timings']
+
+
+def test_error_events(sync_dbapi_db_config, aggregator):
+
+    aggregator, events = aggregator
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        with pytest.raises(Exception):
+            toolsql.raw_select('SELECT * FROM missing_table', conn=conn)
+    assert events[-1]['error'] is not None
+    assert list(aggregator.get_stats().values())[-1]['n_errors'] == 1
+
+
+async def test_async_select_events(async_dbapi_db_config, aggregator):
+
+    aggregator, events = aggregator
+    async with toolsql.async_connect(async_dbapi_db_config) as conn:
+        await toolsql.async_raw_select('SELECT 1', conn=conn)
+    assert events[-1]['operation'] == 'select'
+    assert events[-1]['n_rows'] == 1
+
+
+def test_failing_hook(sync_dbapi_db_config, caplog):
+
+    def hook(event):
+        raise ValueError('hook failure')
+
+    toolsql.add_query_hook(hook)
+    try:
+        with caplog.at_level(logging.ERROR, logger='toolsql'):
+            with toolsql.connect(sync_dbapi_db_config) as conn:
+                result = toolsql.raw_select('SELECT 1 AS x', conn=conn)
+                with pytest.raises(Exception) as exc_info:
+                    toolsql.raw_select('SELECT * FROM missing_table', conn=conn)
+    finally:
+        toolsql.clear_query_hooks()
+    assert result == [{'x': 1}]
+    assert 'hook failure' not in str(exc_info.value)
+    assert 'query hook failed' in caplog.text
+
+
+def test_slow_query_logger(sync_dbapi_db_config, caplog):
+
+    toolsql.add_query_hook(toolsql.SlowQueryLogger(threshold=0))
+    try:
+        with caplog.at_level(logging.WARNING, logger='toolsql'):
+            with toolsql.connect(sync_dbapi_db_config) as conn:
+                toolsql.raw_select('SELECT 1', conn=conn)
+    finally:
+        toolsql.clear_query_hooks()
+    assert 'slow query' in caplog.text
+
+
+def test_sql_fingerprint():
+
+    fingerprint = toolsql.get_sql_fingerprint
+    assert fingerprint('SELECT * FROM t WHERE id IN (%s,%s)') == fingerprint(
+        'SELECT * FROM t WHERE id IN (%s,%s,%s)'
+    )
+    assert fingerprint("SELECT * FROM t WHERE a = 'x' LIMIT 5") == (
+        'SELECT * FROM t WHERE a = ? LIMIT ?'
+    )
+    assert fingerprint('INSERT INTO t VALUES (?, ?), (?, ?), (?, ?)') == (
+        'INSERT INTO t VALUES (?...), ...'
+    )
+    assert fingerprint('SELECT column_0 FROM t') == 'SELECT column_0 FROM t'
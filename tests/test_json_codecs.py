@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+import toolsql
+
+
+codec_names = ['stdlib', 'orjson', 'msgspec']
+
+
+@pytest.fixture(params=codec_names)
+def codec_name(request):
+    if request.param not in toolsql.formats.get_available_json_codecs():
+        pytest.skip(request.param + ' not installed')
+    return request.param
+
+
+def test_codec_round_trip(codec_name):
+    codec = toolsql.formats.get_json_codec(codec_name)
+    value = {'a': [1, 2.5, None], 'b': {'c': 'ü'}}
+    encoded = codec['dumps'](value)
+    assert isinstance(encoded, str)
+    assert json.loads(encoded) == value
+    assert codec['loads'](encoded) == value
+
+
+def test_insert_select_with_codec(
+    sync_write_db_config, fresh_pokemon_table, codec_name
+):
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+    column_names = [column['name'] for column in schema['columns']]
+    all_types = [list(row[column_names.index('all_types')]) for row in rows]
+
+    with toolsql.formats.using_json_codec(codec_name):
+        with toolsql.connect(sync_write_db_config) as conn:
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.insert(table=schema, rows=rows, conn=conn)
+            result = toolsql.select(
+                table=schema,
+                columns=['all_types'],
+                order_by='id',
+                conn=conn,
+                output_format='single_column',
+            )
+
+    assert [list(item) for item in result] == all_types
+
+
+def test_custom_codec_scoped_to_context():
+
+    calls = []
+
+    def dumps(obj):
+        calls.append(obj)
+        return json.dumps(obj)
+
+    toolsql.formats.register_json_codec('custom', dumps=dumps, loads=json.loads)
+    default_name = toolsql.formats.get_json_codec()['name']
+    with toolsql.formats.using_json_codec('custom'):
+        assert toolsql.formats.encode_json_cell([1], 'sqlite') == '[1]'
+    assert toolsql.formats.get_json_codec()['name'] == default_name
+    toolsql.formats.encode_json_cell([2], 'sqlite')
+    assert calls == [[1]]
+
+
+def test_set_json_codec():
+
+    with pytest.raises(Exception):
+        toolsql.formats.set_json_codec('unknown_codec')
+    toolsql.formats.set_json_codec('stdlib')
+    try:
+        assert toolsql.formats.get_json_codec()['name'] == 'stdlib'
+    finally:
+        toolsql.formats.set_json_codec('auto')
+
+
+def _register_marker_codec(calls):
+
+    def loads(data):
+        calls.append(data)
+        return json.loads(data)
+
+    toolsql.formats.register_json_codec('marker', dumps=json.dumps, loads=loads)
+
+
+def test_codec_applies_per_query(sync_write_db_config, fresh_pokemon_table):
+
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+    calls = []
+    _register_marker_codec(calls)
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        kwargs = dict(table=schema, columns=['all_types'], conn=conn)
+
+        toolsql.select(**kwargs)
+        assert len(calls) == 0
+        with toolsql.formats.using_json_codec('marker'):
+            toolsql.select(**kwargs)
+        assert len(calls) == len(rows)
+        toolsql.select(**kwargs)
+        assert len(calls) == len(rows)
+
+        toolsql.formats.set_json_codec('marker')
+        try:
+            toolsql.select(**kwargs)
+        finally:
+            toolsql.formats.set_json_codec('auto')
+        assert len(calls) == 2 * len(rows)
+
+
+async def test_async_codec_applies_per_query(
+    async_write_db_config, fresh_pokemon_table
+):
+
+    sync_db_config = toolsql.create_db_config(async_write_db_config, sync=True)
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+    calls = []
+    _register_marker_codec(calls)
+
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+    async with toolsql.async_connect(async_write_db_config) as conn:
+        kwargs = dict(table=schema, columns=['all_types'], conn=conn)
+        await toolsql.async_select(**kwargs)
+        assert len(calls) == 0
+        with toolsql.formats.using_json_codec('marker'):
+            await toolsql.async_select(**kwargs)
+        assert len(calls) == len(rows)
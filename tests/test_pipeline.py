@@ -0,0 +1,95 @@
+import pytest
+
+import conf.conf_db_configs as conf_db_configs
+import toolsql
+
+
+postgres_db_config = {'driver': 'psycopg', **conf_db_configs.postgres_db_config}
+
+
+def test_pipeline(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(postgres_db_config) as conn:
+        with toolsql.pipeline(conn):
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.insert(rows=rows, table=schema, conn=conn)
+            toolsql.delete(
+                table=schema, conn=conn, where_equals={'id': rows[0][0]}
+            )
+        result = toolsql.select(
+            table=schema, conn=conn, output_format='tuple', order_by='id'
+        )
+
+    assert result == rows[1:]
+
+
+def test_pipeline_select(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(postgres_db_config) as conn:
+        with toolsql.pipeline(conn):
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.insert(rows=rows, table=schema, conn=conn)
+            result = toolsql.select(
+                table=schema, conn=conn, output_format='tuple', order_by='id'
+            )
+
+    assert result == rows
+
+
+def test_pipeline_error(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(postgres_db_config) as conn:
+        with pytest.raises(toolsql.TableDoesNotExist):
+            with toolsql.pipeline(conn):
+                toolsql.insert(rows=rows, table=schema, conn=conn)
+
+
+def test_pipeline_sqlite(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    db_config = {'driver': 'sqlite3', **conf_db_configs.sqlite_db_config}
+
+    with toolsql.connect(db_config) as conn:
+        with toolsql.pipeline(conn):
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.insert(rows=rows, table=schema, conn=conn)
+        result = toolsql.select(
+            table=schema, conn=conn, output_format='tuple', order_by='id'
+        )
+
+    assert result == rows
+
+
+async def test_async_pipeline(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(postgres_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+
+    async with toolsql.async_connect(postgres_db_config) as conn:
+        async with toolsql.async_pipeline(conn):
+            await toolsql.async_insert(rows=rows, table=schema, conn=conn)
+            await toolsql.async_update(
+                table=schema,
+                conn=conn,
+                values={'name': 'updated'},
+                where_equals={'id': rows[0][0]},
+            )
+        result = await toolsql.async_select(
+            table=schema, conn=conn, output_format='tuple', order_by='id'
+        )
+
+    assert result[0][1] == 'updated'
+    assert result[1:] == rows[1:]
@@ -0,0 +1,85 @@
+import pytest
+
+import toolsql
+
+
+def test_pool_reuses_connections(sync_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.pool(sync_dbapi_db_config, min_size=1, max_size=2) as pool:
+        with pool.connection() as conn:
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        with pool.connection(readonly=True) as conn:
+            first = conn
+            result = toolsql.select(table=schema['name'], conn=conn)
+            assert len(result) == len(rows)
+        with pool.connection(readonly=True) as conn:
+            assert conn is first
+
+        stats = pool.get_stats()
+        assert stats['n_in_use'] == 0
+        assert stats['n_open'] <= 2
+
+
+def test_pool_timeout(sync_dbapi_db_config):
+
+    with toolsql.pool(
+        sync_dbapi_db_config, min_size=0, max_size=1, timeout=0.05
+    ) as pool:
+        with pool.connection(readonly=True):
+            with pytest.raises(toolsql.PoolTimeout):
+                with pool.connection(readonly=True):
+                    pass
+
+
+def test_pool_rolls_back_on_return(sync_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.pool(sync_dbapi_db_config, max_size=1) as pool:
+        with pool.connection() as conn:
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.begin(conn)
+            toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        with pool.connection() as conn:
+            result = toolsql.select(table=schema['name'], conn=conn)
+            assert len(result) == 0
+
+
+def test_pool_max_idle_eviction(sync_dbapi_db_config):
+
+    with toolsql.pool(
+        sync_dbapi_db_config, min_size=0, max_size=2, max_idle=0
+    ) as pool:
+        with pool.connection(readonly=True):
+            pass
+        pool.evict_idle()
+        assert pool.get_stats()['n_open'] == 0
+
+
+async def test_async_pool(async_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    sync_db_config = toolsql.create_db_config(async_dbapi_db_config, sync=True)
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+
+    async with toolsql.async_pool(async_dbapi_db_config, max_size=2) as pool:
+        async with pool.connection() as conn:
+            await toolsql.async_insert(table=schema, rows=rows, conn=conn)
+
+        async with pool.connection(readonly=True) as conn:
+            result = await toolsql.async_select(
+                table=schema['name'], conn=conn
+            )
+            assert len(result) == len(rows)
+
+        assert pool.get_stats()['n_in_use'] == 0
@@ -0,0 +1,171 @@
+import pytest
+
+import toolsql
+
+
+def test_insert_returning(sync_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        ids = toolsql.insert(
+            table=schema,
+            rows=rows[:2],
+            conn=conn,
+            returning='id',
+            output_format='single_column',
+        )
+        assert list(ids) == [row[0] for row in rows[:2]]
+
+        n_inserted = toolsql.insert(
+            table=schema, rows=rows[2:], conn=conn, return_count=True
+        )
+        assert n_inserted == len(rows) - 2
+
+        inserted = toolsql.insert(
+            table=schema,
+            row={'id': 100, 'name': 'new', 'completed': True},
+            conn=conn,
+            returning=['id', 'completed'],
+        )
+        assert inserted == [{'id': 100, 'completed': True}]
+
+
+def test_update_returning(sync_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        updated = toolsql.update(
+            table=schema,
+            conn=conn,
+            values={'completed': True},
+            where_gte={'id': 7},
+            returning=['id', 'completed'],
+            output_format='tuple',
+        )
+        assert sorted(updated) == [(7, True), (8, True)]
+
+        n_updated = toolsql.update(
+            table=schema,
+            conn=conn,
+            values={'rating': 'great'},
+            where_equals={'rating': 'alright'},
+            return_count=True,
+        )
+        assert n_updated == 2
+
+        n_updated = toolsql.update_many(
+            table=schema,
+            conn=conn,
+            rows=[{'id': 5, 'name': 'a'}, {'id': 1000, 'name': 'b'}],
+            key_columns='id',
+            return_count=True,
+        )
+        assert n_updated == 1
+
+        with pytest.raises(Exception):
+            toolsql.update(
+                table=schema,
+                conn=conn,
+                values={'rating': 'great'},
+                returning='id',
+                return_count=True,
+            )
+
+
+def test_delete_returning(sync_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        deleted = toolsql.delete(
+            table=schema,
+            conn=conn,
+            where_equals={'id': rows[0][0]},
+            returning='*',
+            output_format='polars',
+        )
+        assert deleted.rows() == rows[:1]
+
+        deleted = toolsql.delete_many(
+            table=schema,
+            conn=conn,
+            keys=[rows[1][0], rows[2][0]],
+            key_columns='id',
+            returning='name',
+            output_format='single_column',
+        )
+        assert sorted(deleted) == sorted(row[1] for row in rows[1:3])
+
+        n_deleted = toolsql.delete(table=schema, conn=conn, return_count=True)
+        assert n_deleted == len(rows) - 3
+
+
+async def test_async_returning(async_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    sync_db_config = toolsql.create_db_config(async_write_db_config, sync=True)
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+
+    async with toolsql.async_connect(async_write_db_config) as conn:
+        ids = await toolsql.async_insert(
+            table=schema,
+            rows=rows,
+            conn=conn,
+            returning='id',
+            output_format='single_column',
+        )
+        assert list(ids) == [row[0] for row in rows]
+
+        updated = await toolsql.async_update(
+            table=schema,
+            conn=conn,
+            values={'name': 'updated'},
+            where_lt={'id': 7},
+            returning=['id', 'name'],
+        )
+        assert sorted(updated, key=lambda row: row['id']) == [
+            {'id': row[0], 'name': 'updated'} for row in rows if row[0] < 7
+        ]
+
+        n_deleted = await toolsql.async_delete(
+            table=schema, conn=conn, return_count=True
+        )
+        assert n_deleted == len(rows)
+
+
+def test_returning_statements():
+
+    sql, _ = toolsql.build_delete_statement(
+        dialect='postgresql',
+        table='simple',
+        where_equals={'id': 1},
+        returning=['id', 'name'],
+    )
+    assert sql == 'DELETE FROM simple WHERE id = %s RETURNING id, name'
+
+    sql, _ = toolsql.build_update_statement(
+        dialect='sqlite',
+        table='simple',
+        values={'name': 'a'},
+        returning='*',
+    )
+    assert sql == 'UPDATE simple SET name = ? RETURNING *'
+
+    with pytest.raises(Exception):
+        toolsql.build_delete_statement(
+            dialect='sqlite', table='simple', returning='id; DROP TABLE'
+        )
@@ -0,0 +1,96 @@
+import toolsql
+
+
+def test_schema_cache_hit(sync_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        toolsql.select(table=schema['name'], conn=conn)
+        cache_key = toolsql.get_schema_cache_key(conn)
+        cached = toolsql.get_cached_table_raw_column_types(
+            schema['name'], cache_key=cache_key
+        )
+        assert cached is not None
+        assert list(cached.keys()) == [
+            column['name'] for column in schema['columns']
+        ]
+
+
+def test_schema_cache_invalidated_by_ddl(
+    sync_dbapi_db_config, fresh_simple_table
+):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    new_column = toolsql.normalize_shorthand_column_schema(
+        {'name': 'extra', 'type': 'INTEGER'}
+    )
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        result = toolsql.select(table=schema['name'], conn=conn)
+        assert 'extra' not in result[0]
+
+        toolsql.alter_table_add_column(
+            table=schema['name'], column=new_column, conn=conn, confirm=True
+        )
+        result = toolsql.select(table=schema['name'], conn=conn)
+        assert result[0]['extra'] is None
+
+        toolsql.drop_table(table=schema['name'], conn=conn, confirm=True)
+        cache_key = toolsql.get_schema_cache_key(conn)
+        cached = toolsql.get_cached_table_raw_column_types(
+            schema['name'], cache_key=cache_key
+        )
+        assert cached is None
+
+
+def test_schema_cache_ttl(sync_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    try:
+        toolsql.configure_schema_cache(ttl=0)
+        with toolsql.connect(sync_dbapi_db_config) as conn:
+            toolsql.create_table(table=schema, conn=conn, confirm=True)
+            toolsql.insert(table=schema, rows=rows, conn=conn)
+            toolsql.select(table=schema['name'], conn=conn)
+
+            # external DDL, not seen by invalidation hooks
+            conn.execute(
+                'ALTER TABLE ' + schema['name'] + ' ADD COLUMN extra INTEGER'
+            )
+            result = toolsql.select(table=schema['name'], conn=conn)
+            assert result[0]['extra'] is None
+    finally:
+        toolsql.configure_schema_cache()
+
+
+async def test_async_schema_cache_shared(
+    async_dbapi_db_config, fresh_simple_table
+):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    # populate cache using sync connection
+    sync_db_config = toolsql.create_db_config(async_dbapi_db_config, sync=True)
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        toolsql.select(table=schema['name'], conn=conn)
+        sync_cache_key = toolsql.get_schema_cache_key(conn)
+
+    # async connection should share cache entry
+    async with toolsql.async_connect(async_dbapi_db_config) as conn:
+        async_cache_key = await toolsql.async_get_schema_cache_key(conn)
+        assert async_cache_key == sync_cache_key
+        result = await toolsql.async_select(table=schema['name'], conn=conn)
+        assert len(result) == len(rows)
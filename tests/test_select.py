@@ -1,5 +1,10 @@
+import decimal
+import uuid
+
+import conf.conf_db_configs as conf_db_configs
 import conf.conf_tables as conf_tables
 
+import numpy as np
 import pandas as pd
 import polars as pl
 import pytest
@@ -13,10 +18,12 @@ test_tables = conf_tables.get_test_tables()
 simple = test_tables['simple']
 simple_columns = list(simple['schema']['columns'].keys())
 simple_schema = toolsql.normalize_shorthand_table_schema(simple['schema'])
+simple_record = toolsql.formats.get_record_class(tuple(simple_columns))
 
 # pokemon
 pokemon = test_tables['pokemon']
 pokemon_columns = list(pokemon['schema']['columns'].keys())
+pokemon_record = toolsql.formats.get_record_class(tuple(pokemon_columns))
 
 polars_pokemon = pl.DataFrame(pokemon['rows'], schema=pokemon_columns)
 polars_pokemon = polars_pokemon.with_columns(
@@ -40,6 +47,12 @@ select_queries = [
             dict(zip(simple_columns, datum)) for datum in simple['rows']
         ],
     },
+    {
+        'select_kwargs': {'table': simple_schema, 'output_format': 'record'},
+        'target_result': [
+            simple_record._make(datum) for datum in simple['rows']
+        ],
+    },
     {
         'select_kwargs': {'table': simple_schema, 'output_format': 'polars'},
         'target_result': pl.DataFrame(
@@ -62,6 +75,12 @@ select_queries = [
             dict(zip(pokemon_columns, datum)) for datum in pokemon['rows']
         ],
     },
+    {
+        'select_kwargs': {'table': 'pokemon', 'output_format': 'record'},
+        'target_result': [
+            pokemon_record._make(datum) for datum in pokemon['rows']
+        ],
+    },
     {
         'select_kwargs': {'table': 'pokemon', 'output_format': 'polars'},
         'target_result': polars_pokemon,
@@ -276,6 +295,46 @@ parameterized_select_queries = [
             == pl.Series([b'\xde\xad\xbe\xef'] * len(simple['rows']))
         ),
     },
+    {
+        'select_kwargs': {
+            'table': 'pokemon',
+            'output_format': 'polars',
+            'where_in': {'id': list(range(0, 1000, 3))},
+            'order_by': 'id',
+        },
+        'target_result': polars_pokemon.filter(
+            pl.col('id').is_in(list(range(0, 1000, 3)))
+        ),
+    },
+    {
+        'select_kwargs': {
+            'table': 'pokemon',
+            'output_format': 'polars',
+            'where_in': {
+                'primary_type': ['GROUND', "O'BRIEN"]
+                + ['TYPE_' + str(i) for i in range(200)]
+            },
+            'order_by': 'id',
+        },
+        'target_result': polars_pokemon.filter(
+            pl.col('primary_type') == 'GROUND'
+        ),
+    },
+    {
+        'select_kwargs': {
+            'table': simple_schema,
+            'output_format': 'polars',
+            'where_in': {
+                'raw_data': ['deadbeef'] + ['00' * i for i in range(1, 200)]
+            },
+        },
+        'target_result': pl.DataFrame(
+            simple['rows'], schema=simple_columns, orient='row'
+        ).filter(
+            pl.col('raw_data')
+            == pl.Series([b'\xde\xad\xbe\xef'] * len(simple['rows']))
+        ),
+    },
     #
     # where or
     {
@@ -424,3 +483,317 @@ async def test_async_parameterized_sync_select(
 
     helpers.assert_results_equal(result=result, target_result=target_result)
 
+
+def test_sync_select_where_in_crossing_threshold(sync_write_db_config):
+
+    threshold = toolsql.statements.statement_utils.sqlite_where_in_json_threshold
+    schema = toolsql.normalize_shorthand_table_schema(
+        {
+            'name': 'where_in_' + str(uuid.uuid4()).replace('-', '_'),
+            'columns': {'id': 'INTEGER', 'code': 'TEXT', 'size': 'FLOAT'},
+            'primary_key': ['id'],
+        }
+    )
+    n_rows = 2 * threshold
+    rows = [(i, str(i), i + 0.5 if i % 2 else i) for i in range(n_rows)]
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        for table in [schema, schema['name']]:
+
+            # values of mixed types
+            for n_values in [threshold // 2, threshold + 50]:
+                values = [i + 0.5 if i % 2 else i for i in range(n_values)]
+                result = toolsql.select(
+                    table=table,
+                    columns=['id'],
+                    where_in={'size': values},
+                    conn=conn,
+                    output_format='single_column',
+                )
+                assert len(result) == n_values
+
+            # values of another type than the TEXT column, below and above
+            # the threshold where sqlite binds the list as a JSON array
+            if sync_write_db_config['dbms'] == 'sqlite':
+                for n_values in [threshold // 2, threshold + 50]:
+                    result = toolsql.select(
+                        table=table,
+                        columns=['id'],
+                        where_in={'code': list(range(n_values))},
+                        conn=conn,
+                        output_format='single_column',
+                    )
+                    assert len(result) == n_values
+
+        if sync_write_db_config['dbms'] == 'sqlite':
+            n_deleted = toolsql.delete_many(
+                table=schema,
+                keys=range(threshold + 50),
+                key_columns='code',
+                conn=conn,
+            )
+            assert n_deleted == threshold + 50
+
+        toolsql.drop_table(table=schema, conn=conn, confirm=True)
+
+
+
+@pytest.mark.parametrize('table', ['simple', 'pokemon'])
+def test_sync_select_arrow(sync_read_conn_db_config, table):
+
+    rows = test_tables[table]['rows']
+    columns = list(test_tables[table]['schema']['columns'].keys())
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        result = toolsql.select(
+            conn=conn, table=table, order_by='id', output_format='arrow'
+        )
+
+    assert result.column_names == columns
+    assert result.num_rows == len(rows)
+    assert result.to_pylist() == [dict(zip(columns, row)) for row in rows]
+
+
+@pytest.mark.parametrize('output_format', ['dict', 'record'])
+def test_sync_select_row_factory(sync_read_conn_db_config, output_format):
+
+    rows = test_tables['pokemon']['rows']
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        result = toolsql.select(
+            conn=conn,
+            table='pokemon',
+            columns=['id', 'name'],
+            order_by='id',
+            output_format=output_format,
+        )
+
+    assert len(result) == len(rows)
+    if output_format == 'dict':
+        assert result[0] == {'id': 1, 'name': 'Bulbasaur'}
+    else:
+        assert result[0].id == 1 and result[0].name == 'Bulbasaur'
+        assert result[0] == (1, 'Bulbasaur')
+
+
+def test_record_class():
+
+    record_class = toolsql.formats.get_record_class(('id', 'COUNT(*)'))
+    record = record_class._make((1, 2))
+    assert record._fields == ('id', '_1')
+    assert record.id == 1 and record[1] == 2
+    assert toolsql.formats.get_record_class(('id', 'COUNT(*)')) is record_class
+
+
+def test_polars_decimal_dtype_keeps_fraction():
+
+    df = toolsql.formats.format_row_tuples(
+        [(1, 1.5), (2, 2)],
+        'polars',
+        names=['id', 'amount'],
+        output_dtypes=[pl.Int64, pl.Decimal],
+    )
+    assert df['amount'].to_list() == [1.5, 2.0]
+
+
+def _assert_numpy_pokemon(result):
+    rows = test_tables['pokemon']['rows']
+    columns = list(test_tables['pokemon']['schema']['columns'].keys())
+    assert list(result.keys()) == columns
+    assert result['id'].dtype == 'int64'
+    assert result['height'].dtype == 'float64'
+    assert result['name'].dtype == 'object'
+    for c, column in enumerate(columns):
+        assert result[column].tolist() == [row[c] for row in rows]
+
+
+def test_sync_select_numpy(sync_read_conn_db_config):
+
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        result = toolsql.select(
+            conn=conn, table='pokemon', order_by='id', output_format='numpy'
+        )
+    _assert_numpy_pokemon(result)
+
+
+async def test_async_select_numpy(async_read_conn_db_config):
+
+    async with toolsql.async_connect(async_read_conn_db_config) as conn:
+        result = await toolsql.async_select(
+            conn=conn, table='pokemon', order_by='id', output_format='numpy'
+        )
+    _assert_numpy_pokemon(result)
+
+
+def test_numpy_column_builder():
+
+    builder = toolsql.formats.NumpyColumnBuilder(
+        names=['id', 'value', 'name', 'count'],
+        dtypes=['int64', 'float64', 'object', None],
+        capacity=2,
+    )
+    builder.append([(1, 1.5, 'a', 10), (2, None, None, 20)])
+    builder.append([(3, 3.5, 'c', 30)])
+    result = builder.finish()
+
+    assert result['id'].tolist() == [1, 2, 3]
+    assert isinstance(result['value'], np.ma.MaskedArray)
+    assert result['value'].mask.tolist() == [False, True, False]
+    assert result['value'].tolist() == [1.5, None, 3.5]
+    assert result['name'].tolist() == ['a', None, 'c']
+    assert result['count'].dtype == 'int64'
+
+
+def test_sync_raw_select_numpy_nulls(sync_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows[:3], conn=conn)
+        result = toolsql.raw_select(
+            'SELECT id, CASE WHEN id = 6 THEN NULL'
+            ' ELSE CAST(id AS FLOAT) / 2 END AS f'
+            ' FROM ' + schema['name'] + ' ORDER BY id',
+            conn=conn,
+            output_format='numpy',
+        )
+
+    # untyped numeric columns with nulls are masked instead of objects
+    assert result['id'].dtype == 'int64'
+    assert isinstance(result['f'], np.ma.MaskedArray)
+    assert result['f'].dtype == 'float64'
+    assert result['f'].tolist() == [2.5, None, 3.5]
+
+
+def test_sync_select_polars_json_decoding(sync_read_conn_db_config):
+
+    rows = test_tables['pokemon']['rows']
+    columns = list(test_tables['pokemon']['schema']['columns'].keys())
+    all_types = [list(row[columns.index('all_types')]) for row in rows]
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        result = toolsql.select(
+            conn=conn,
+            table='pokemon',
+            columns=['id', 'all_types'],
+            order_by='id',
+            output_format='polars',
+            json_decoding='polars',
+        )
+        typed_result = toolsql.select(
+            conn=conn,
+            table='pokemon',
+            columns=['id', 'all_types'],
+            order_by='id',
+            output_format='polars',
+            json_decoding='polars',
+            json_dtypes={'all_types': pl.List(pl.Utf8)},
+        )
+
+    assert result['all_types'].dtype == pl.List(pl.Utf8)
+    assert result['all_types'].to_list() == all_types
+    assert typed_result['all_types'].dtype == pl.List(pl.Utf8)
+
+
+def test_polars_json_decoding_requires_polars(sync_read_conn_db_config):
+
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        with pytest.raises(Exception):
+            toolsql.select(
+                conn=conn,
+                table='pokemon',
+                output_format='dict',
+                json_decoding='polars',
+            )
+
+
+def test_rows_to_polars():
+
+    rows = [(1, 'a', None, [1, 2]), (2, None, 2.5, {'b': 3})]
+    names = ['id', 'name', 'value', 'data']
+    df = toolsql.formats.rows_to_polars(
+        rows, names=names, output_dtypes=[pl.Int64, pl.Utf8, None, None]
+    )
+    assert df.dtypes == [pl.Int64, pl.Utf8, pl.Float64, pl.Object]
+    assert df['data'].to_list() == [[1, 2], {'b': 3}]
+
+    empty = toolsql.formats.rows_to_polars(
+        [], names=names[:2], output_dtypes=[pl.Int64, pl.Utf8]
+    )
+    assert empty.columns == names[:2] and len(empty) == 0
+
+    # decimals are floats, as when converted through arrow
+    rows = [(decimal.Decimal('1.5'), 1.5, 'a', [1]), (None, 2, 'b', None)]
+    df = toolsql.formats.rows_to_polars(
+        rows, names=names, output_dtypes=[None, pl.Decimal, pl.Utf8, None]
+    )
+    assert df.dtypes == [pl.Float64, pl.Float64, pl.Utf8, pl.Object]
+    assert df.rows()[0][:3] == (1.5, 1.5, 'a')
+
+
+def test_sync_select_polars_numeric_and_json(sync_write_db_config):
+
+    schema = toolsql.normalize_shorthand_table_schema(
+        {
+            'name': 'numeric_' + str(uuid.uuid4()).replace('-', '_'),
+            'columns': {'id': 'INTEGER', 'amount': 'NUMERIC', 'data': 'JSON'},
+            'primary_key': ['id'],
+        }
+    )
+    rows = [(1, 1.5, {'a': 1}), (2, 2, [1, 2])]
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        results = [
+            toolsql.select(
+                table=table, columns=columns, conn=conn, output_format='polars'
+            )
+            for table in [schema, schema['name']]
+            for columns in [None, ['id', 'amount']]
+        ]
+        toolsql.drop_table(table=schema, conn=conn, confirm=True)
+
+    for result in results:
+        assert result['amount'].dtype == pl.Float64
+        assert result['amount'].to_list() == [1.5, 2.0]
+
+
+def test_psycopg_cursor_output_dtypes():
+
+    db_config = {'driver': 'psycopg', **conf_db_configs.postgres_db_config}
+    with toolsql.connect(db_config) as conn:
+        result = toolsql.raw_select(
+            sql='SELECT id, name, all_types, height FROM pokemon ORDER BY id',
+            conn=conn,
+            output_format='polars',
+        )
+
+    rows = test_tables['pokemon']['rows']
+    assert result.dtypes == [pl.Int64, pl.Utf8, pl.Object, pl.Float64]
+    assert result['all_types'].to_list() == [row[10] for row in rows]
+
+
+def test_decode_columns_of_wide_rows():
+
+    decode_columns = [None] * 20
+    decode_columns[3] = 'JSON'
+    decode_columns[10] = 'BOOLEAN'
+    rows = [
+        tuple(
+            '[' + str(i) + ']' if c == 3 else i if c == 10 else c
+            for c in range(20)
+        )
+        for i in range(3)
+    ]
+
+    for _ in range(2):
+        result = toolsql.formats.decode_columns(
+            rows=rows, columns=decode_columns
+        )
+        for i, row in enumerate(result):
+            assert len(row) == 20
+            assert row[3] == [i]
+            assert row[10] == bool(i)
+            assert row[:3] == (0, 1, 2)
+            assert row[11:] == tuple(range(11, 20))
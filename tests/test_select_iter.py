@@ -0,0 +1,92 @@
+import polars as pl
+import pytest
+
+import toolsql
+
+
+@pytest.mark.parametrize('output_format', ['tuple', 'dict'])
+def test_select_iter(sync_dbapi_db_config, fresh_pokemon_table, output_format):
+
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        target = toolsql.select(
+            table=schema['name'],
+            conn=conn,
+            order_by='id',
+            output_format=output_format,
+        )
+        batches = list(
+            toolsql.select_iter(
+                table=schema['name'],
+                conn=conn,
+                order_by='id',
+                output_format=output_format,
+                batch_size=7,
+            )
+        )
+
+    assert [len(batch) for batch in batches[:-1]] == [7] * (len(batches) - 1)
+    assert [row for batch in batches for row in batch] == list(target)
+
+
+def test_select_iter_polars(sync_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+        target = toolsql.select(
+            table=schema['name'], conn=conn, output_format='polars'
+        )
+        batches = list(
+            toolsql.select_iter(
+                table=schema['name'],
+                conn=conn,
+                output_format='polars',
+                batch_size=3,
+            )
+        )
+
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert pl.concat(batches).frame_equal(target)
+
+
+def test_select_iter_invalid_output_format(sync_dbapi_db_config):
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        with pytest.raises(Exception):
+            toolsql.raw_select_iter(
+                'SELECT 1', conn=conn, output_format='cell'
+            )
+
+
+async def test_async_select_iter(async_dbapi_db_config, fresh_pokemon_table):
+
+    schema = fresh_pokemon_table['schema']
+    rows = fresh_pokemon_table['rows']
+
+    sync_db_config = toolsql.create_db_config(async_dbapi_db_config, sync=True)
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+    async with toolsql.async_connect(async_dbapi_db_config) as conn:
+        target = await toolsql.async_select(
+            table=schema['name'], conn=conn, order_by='id'
+        )
+        result = []
+        async for batch in toolsql.async_select_iter(
+            table=schema['name'], conn=conn, order_by='id', batch_size=5
+        ):
+            assert len(batch) <= 5
+            result.extend(batch)
+
+    assert result == target
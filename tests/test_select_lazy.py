@@ -0,0 +1,94 @@
+import polars as pl
+import pytest
+
+import toolsql
+from toolsql.executors.dml_executors import lazy_select_executors
+
+
+def _query(frame):
+    predicate = (pl.col('id') > 3) & pl.col('primary_type').is_in(
+        ['FIRE', 'WATER']
+    ) | (pl.col('hp') < 40)
+    return (
+        frame.filter(predicate)
+        .select(['id', 'name', pl.col('hp')])
+        .sort('id', descending=True)
+        .head(3)
+    )
+
+
+def test_lazy_select_pushdown(sync_read_conn_db_config):
+
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        lazy = toolsql.select(
+            conn=conn, table='pokemon', output_format='polars_lazy'
+        )
+        query = _query(lazy)
+        assert isinstance(query, toolsql.LazySelect)
+        kwargs = query.select_kwargs
+        assert kwargs['where_or'] == [
+            {
+                'where_gt': {'id': 3},
+                'where_in': {'primary_type': ['FIRE', 'WATER']},
+            },
+            {'where_lt': {'hp': 40}},
+        ]
+        assert kwargs['columns'] == ['id', 'name', 'hp']
+        assert kwargs['order_by'] == [{'column': 'id', 'desc': True}]
+        assert kwargs['limit'] == 3
+
+        result = query.collect()
+        eager = toolsql.select(
+            conn=conn, table='pokemon', output_format='polars'
+        )
+
+    assert result.rows() == _query(eager.lazy()).collect().rows()
+
+
+def test_lazy_select_fallback(sync_read_conn_db_config):
+
+    with toolsql.connect(sync_read_conn_db_config) as conn:
+        lazy = toolsql.select(
+            conn=conn, table='pokemon', output_format='polars_lazy'
+        )
+        eager = lazy.collect().lazy()
+
+        # column comparisons are applied by polars after pushed down terms
+        predicate = (pl.col('hp') >= pl.col('attack')) & (pl.col('id') < 50)
+        partial = lazy.filter(predicate)
+        assert isinstance(partial, pl.LazyFrame)
+        expected = eager.filter(predicate).collect()
+        assert partial.collect().rows() == expected.rows()
+
+        # filters after a limit cannot be pushed down
+        limited = lazy.sort('id').head(10).filter(pl.col('hp') > 50)
+        assert isinstance(limited, pl.LazyFrame)
+        expected = eager.sort('id').head(10).filter(pl.col('hp') > 50)
+        assert limited.collect().rows() == expected.collect().rows()
+
+
+def test_compile_lazy_predicate():
+
+    def compile(expr):
+        node = lazy_select_executors._serialize_expr(expr)
+        return lazy_select_executors._compile_predicate(node)
+
+    assert compile(pl.col('a') == 'x') == {'where_equals': {'a': 'x'}}
+    assert compile(1 < pl.col('a')) == {'where_gt': {'a': 1}}
+    assert compile((pl.col('a') >= 1) & (pl.col('b') <= 2.5)) == {
+        'where_gte': {'a': 1},
+        'where_lte': {'b': 2.5},
+    }
+    assert compile((pl.col('a') > 1) & (pl.col('a') > 2)) is None
+    assert compile(pl.col('a') > pl.col('b')) is None
+    assert compile(pl.col('a') == None) is None  # noqa: E711
+    assert compile(pl.col('a').is_null()) is None
+
+
+async def test_async_lazy_select_unsupported(async_read_conn_db_config):
+
+    async with toolsql.async_connect(async_read_conn_db_config) as conn:
+        with pytest.raises(Exception):
+            await toolsql.async_select(
+                conn=conn, table='pokemon', output_format='polars_lazy'
+            )
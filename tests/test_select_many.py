@@ -0,0 +1,111 @@
+import pytest
+
+import conf.conf_db_configs as conf_db_configs
+import toolsql
+
+
+postgres_db_config = {'driver': 'psycopg', **conf_db_configs.postgres_db_config}
+
+
+def _create_table(db_config, schema, rows):
+    sync_config = dict(db_config)
+    if sync_config['driver'] == 'aiosqlite':
+        sync_config['driver'] = 'sqlite3'
+    with toolsql.connect(sync_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+
+def _get_queries(schema, rows):
+    return [
+        {
+            'table': schema['name'],
+            'where_equals': {'id': row[0]},
+            'output_format': 'single_tuple',
+        }
+        for row in reversed(rows)
+    ] + [{'table': schema['name'], 'output_format': 'tuple', 'order_by': 'id'}]
+
+
+async def test_async_select_many_pool(async_dbapi_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    _create_table(async_dbapi_db_config, schema, rows)
+
+    async with toolsql.async_pool(async_dbapi_db_config, max_size=3) as pool:
+        results = await toolsql.async_select_many(
+            _get_queries(schema, rows), pool
+        )
+        assert pool.get_stats()['n_in_use'] == 0
+
+    assert results == list(reversed(rows)) + [rows]
+
+
+async def test_async_select_many_targets(
+    async_dbapi_db_config, fresh_simple_table
+):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    _create_table(async_dbapi_db_config, schema, rows)
+    expected = list(reversed(rows)) + [rows]
+
+    results = await toolsql.async_select_many(
+        _get_queries(schema, rows), async_dbapi_db_config, max_concurrency=2
+    )
+    assert results == expected
+
+    async with toolsql.async_connect(async_dbapi_db_config) as conn:
+        results = await toolsql.async_select_many(
+            _get_queries(schema, rows), conn
+        )
+    assert results == expected
+
+
+async def test_async_select_many_errors(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    _create_table(postgres_db_config, schema, rows)
+    queries = [
+        {'table': schema['name'], 'output_format': 'tuple'},
+        {'table': 'does_not_exist', 'output_format': 'tuple'},
+    ]
+
+    async with toolsql.async_pool(postgres_db_config, max_size=2) as pool:
+        with pytest.raises(toolsql.TableDoesNotExist):
+            await toolsql.async_select_many(queries, pool)
+
+        results = await toolsql.async_select_many(
+            queries, pool, return_exceptions=True
+        )
+        assert len(results[0]) == len(rows)
+        assert isinstance(results[1], toolsql.TableDoesNotExist)
+        assert pool.get_stats()['n_in_use'] == 0
+
+
+async def test_async_select_many_timeout(fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    _create_table(postgres_db_config, schema, rows)
+    queries = [
+        {'table': schema['name'], 'output_format': 'tuple'},
+        {
+            'table': schema['name'],
+            'columns': ['id', 'pg_sleep(5)'],
+            'output_format': 'tuple',
+        },
+    ]
+
+    async with toolsql.async_pool(postgres_db_config, max_size=2) as pool:
+        results = await toolsql.async_select_many(
+            queries, pool, timeout=0.5, return_exceptions=True
+        )
+        assert len(results[0]) == len(rows)
+        assert isinstance(results[1], toolsql.QueryTimeout)
+
+        # pool remains usable after timeout
+        results = await toolsql.async_select_many(queries[:1], pool)
+        assert len(results[0]) == len(rows)
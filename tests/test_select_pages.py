@@ -0,0 +1,102 @@
+import pytest
+
+import toolsql
+
+
+def _get_paging_table(fresh_simple_table):
+    schema = fresh_simple_table['schema']
+    for column in schema['columns']:
+        if column['name'] == 'rating':
+            column['primary'] = True
+    rows = [
+        (i, 'row_' + str(i), ['a', 'b', 'c'][i % 3], b'', i % 2 == 0)
+        for i in range(25)
+    ]
+    return schema, rows
+
+
+@pytest.mark.parametrize('output_format', ['tuple', 'dict', 'polars', 'pandas'])
+def test_select_pages(sync_dbapi_db_config, fresh_simple_table, output_format):
+
+    schema = fresh_simple_table['schema']
+    rows = [(i, 'row_' + str(i), 'alright', b'', True) for i in range(25)]
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        pages = list(
+            toolsql.select_pages(
+                table=schema['name'],
+                conn=conn,
+                order_by='id',
+                page_size=10,
+                output_format=output_format,
+            )
+        )
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    if output_format == 'tuple':
+        ids = [row[0] for page in pages for row in page]
+    elif output_format == 'dict':
+        ids = [row['id'] for page in pages for row in page]
+    else:
+        ids = [i for page in pages for i in page['id'].to_list()]
+    assert ids == list(range(25))
+
+
+def test_select_pages_composite_key(sync_dbapi_db_config, fresh_simple_table):
+
+    schema, rows = _get_paging_table(fresh_simple_table)
+    order_by = [{'column': 'rating', 'desc': True}, 'id']
+    expected = sorted(rows, key=lambda row: (-ord(row[2]), row[0]))
+
+    with toolsql.connect(sync_dbapi_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        pages = list(
+            toolsql.select_pages(
+                table=schema,
+                conn=conn,
+                order_by=order_by,
+                page_size=4,
+                output_format='tuple',
+            )
+        )
+        filtered = list(
+            toolsql.select_pages(
+                table=schema,
+                conn=conn,
+                order_by=order_by,
+                page_size=3,
+                where_or=[{'where_lt': {'id': 5}}, {'where_gte': {'id': 20}}],
+                output_format='dict',
+            )
+        )
+
+    assert [row for page in pages for row in page] == expected
+    assert [row['id'] for page in filtered for row in page] == [
+        row[0] for row in expected if row[0] < 5 or row[0] >= 20
+    ]
+
+
+async def test_async_select_pages(async_dbapi_db_config, fresh_simple_table):
+
+    schema, rows = _get_paging_table(fresh_simple_table)
+    sync_db_config = dict(async_dbapi_db_config)
+    if sync_db_config['driver'] == 'aiosqlite':
+        sync_db_config['driver'] = 'sqlite3'
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+    async with toolsql.async_connect(async_dbapi_db_config) as conn:
+        ids = []
+        async for page in toolsql.async_select_pages(
+            table=schema['name'],
+            conn=conn,
+            order_by=[{'column': 'id', 'desc': True}],
+            page_size=7,
+        ):
+            ids.extend(row['id'] for row in page)
+
+    assert ids == list(reversed(range(25)))
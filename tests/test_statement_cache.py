@@ -0,0 +1,122 @@
+import pytest
+
+import toolsql
+
+
+def test_select_statement_reuses_shape():
+
+    toolsql.clear_statement_cache()
+    sql1, parameters1 = toolsql.build_select_statement(
+        dialect='postgresql',
+        table='pokemon',
+        where_equals={'name': 'Bulbasaur'},
+        where_in={'id': [1, 2]},
+        order_by='id',
+    )
+    sql2, parameters2 = toolsql.build_select_statement(
+        dialect='postgresql',
+        table='pokemon',
+        where_equals={'name': 'Ivysaur'},
+        where_in={'id': [3, 4]},
+        order_by='id',
+    )
+    assert sql1 is sql2
+    assert list(parameters1) == ['Bulbasaur', [1, 2]]
+    assert list(parameters2) == ['Ivysaur', [3, 4]]
+
+
+def test_where_in_array_parameters():
+
+    sql1, parameters1 = toolsql.build_select_statement(
+        dialect='postgresql', table='pokemon', where_in={'id': [1, 2]}
+    )
+    sql2, parameters2 = toolsql.build_select_statement(
+        dialect='postgresql', table='pokemon', where_in={'id': [1, 2, 3]}
+    )
+    assert sql1 is sql2
+    assert sql1.endswith('id = ANY(%s)')
+    assert list(parameters2) == [[1, 2, 3]]
+
+    # lists of mixed types are bound as separate values
+    sql, parameters = toolsql.build_select_statement(
+        dialect='postgresql', table='pokemon', where_in={'height': [1.5, 2]}
+    )
+    assert sql.endswith('height IN (%s,%s)')
+    assert list(parameters) == [1.5, 2]
+
+    n_values = toolsql.statements.statement_utils.sqlite_where_in_json_threshold
+    sql, parameters = toolsql.build_select_statement(
+        dialect='sqlite',
+        table='pokemon',
+        where_in={'id': list(range(n_values + 1))},
+    )
+    assert sql.endswith('id IN (SELECT +value FROM json_each(?))')
+    assert len(parameters) == 1
+
+
+def test_where_in_arity_changes_statement():
+
+    sql1, parameters1 = toolsql.build_select_statement(
+        dialect='sqlite', table='pokemon', where_in={'id': [1, 2]}
+    )
+    sql2, parameters2 = toolsql.build_select_statement(
+        dialect='sqlite', table='pokemon', where_in={'id': [1, 2, 3]}
+    )
+    assert sql1.endswith('id IN (?,?)')
+    assert sql2.endswith('id IN (?,?,?)')
+    assert list(parameters2) == [1, 2, 3]
+
+
+def test_where_or_binding_order():
+
+    where_or = [
+        {'where_equals': {'name': 'Bulbasaur'}},
+        {'where_gt': {'id': 100}, 'where_lt': {'id': 110}},
+    ]
+    for name in ['Bulbasaur', 'Mew']:
+        where_or[0]['where_equals']['name'] = name
+        sql, parameters = toolsql.build_delete_statement(
+            dialect='postgresql',
+            table='pokemon',
+            where_equals={'primary_type': 'GRASS'},
+            where_or=where_or,
+        )
+        assert sql == (
+            'DELETE FROM pokemon WHERE primary_type = %s'
+            ' AND (name = %s OR id > %s AND id < %s)'
+        )
+        assert list(parameters) == ['GRASS', name, 100, 110]
+
+
+def test_binary_columns_convert_hex():
+
+    table = {
+        'name': 'hashes',
+        'columns': [
+            {'name': 'hash', 'type': 'BINARY'},
+            {'name': 'label', 'type': 'TEXT'},
+        ],
+        'indices': [],
+        'constraints': [],
+    }
+    for value in ['0x1234', '0xabcd']:
+        sql, parameters = toolsql.build_update_statement(
+            dialect='sqlite',
+            table=table,
+            columns=['label'],
+            values={'label': 'x'},
+            where_equals={'hash': value},
+        )
+        assert list(parameters) == ['x', bytes.fromhex(value[2:])]
+
+
+def test_invalid_shapes_still_raise():
+
+    with pytest.raises(Exception):
+        toolsql.build_select_statement(
+            dialect='sqlite', table='pokemon', where_in={'id': []}
+        )
+    with pytest.raises(NotImplementedError):
+        toolsql.build_select_statement(
+            dialect='sqlite', table='pokemon', where_like={'name': 'B%'}
+        )
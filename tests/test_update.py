@@ -1,4 +1,5 @@
 import polars as pl
+import pytest
 
 import toolsql
 import conf.conf_tables as conf_tables
@@ -109,3 +110,150 @@ async def test_async_update(async_write_db_config, fresh_pokemon_table, helpers)
     )
     helpers.assert_results_equal(result=result, target_result=target_result)
 
+
+def test_sync_update_dict_values(sync_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        toolsql.update(
+            conn=conn,
+            table=schema,
+            values={'rating': 'great'},
+            where_gte={'id': 7},
+        )
+        result = toolsql.select(
+            table=schema,
+            columns=['rating'],
+            order_by='id',
+            conn=conn,
+            output_format='single_column',
+        )
+
+    assert list(result) == ['alright', 'incredible', 'great', 'great']
+
+
+def test_sync_update_many(sync_write_db_config, fresh_simple_table):
+
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+    new_rows = [
+        {'id': row[0], 'name': row[1] + '_new', 'rating': 'r' + str(row[0])}
+        for row in rows[::2]
+    ]
+    expected = [
+        (row[0], row[1] + '_new', 'r' + str(row[0])) if r % 2 == 0 else row[:3]
+        for r, row in enumerate(rows)
+    ]
+
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+        toolsql.update_many(
+            conn=conn, table=schema, rows=new_rows, key_columns='id'
+        )
+        result = toolsql.select(
+            table=schema,
+            columns=['id', 'name', 'rating'],
+            order_by='id',
+            conn=conn,
+            output_format='tuple',
+        )
+    assert result == expected
+
+    # tuple rows in chunks, matched on a composite key
+    tuple_rows = [(row[1] + '_new', row[0], row[0] * 10) for row in rows]
+    with toolsql.connect(sync_write_db_config) as conn:
+        toolsql.update_many(
+            conn=conn,
+            table=schema['name'],
+            rows=[(row[0], row[1], str(row[2])) for row in tuple_rows],
+            columns=['name', 'id', 'rating'],
+            key_columns=['id', 'name'],
+            chunk_size=2,
+        )
+        result = toolsql.select(
+            table=schema,
+            columns=['id', 'rating'],
+            order_by='id',
+            conn=conn,
+            output_format='tuple',
+        )
+    assert result == [
+        (row[0], str(row[0] * 10)) if r % 2 == 0 else (row[0], row[2])
+        for r, row in enumerate(rows)
+    ]
+
+
+async def test_async_update_many(async_write_db_config, fresh_simple_table):
+
+    sync_db_config = toolsql.create_db_config(async_write_db_config, sync=True)
+    schema = fresh_simple_table['schema']
+    rows = fresh_simple_table['rows']
+
+    with toolsql.connect(sync_db_config) as conn:
+        toolsql.create_table(table=schema, conn=conn, confirm=True)
+        toolsql.insert(table=schema, rows=rows, conn=conn)
+
+    async with toolsql.async_connect(async_write_db_config) as conn:
+        await toolsql.async_update_many(
+            conn=conn,
+            table=schema,
+            rows=[(row[0], row[0] % 2 == 0) for row in rows],
+            columns=['id', 'completed'],
+            key_columns='id',
+        )
+        result = await toolsql.async_select(
+            table=schema,
+            columns=['completed'],
+            order_by='id',
+            conn=conn,
+            output_format='single_column',
+        )
+
+    assert list(result) == [row[0] % 2 == 0 for row in rows]
+
+
+def test_update_many_statements():
+
+    rows = [{'id': i, 'name': str(i)} for i in range(10)]
+    chunks = toolsql.build_update_many_statements(
+        dialect='postgresql',
+        table='simple',
+        rows=rows,
+        key_columns='id',
+        chunk_size=4,
+    )
+    assert [len(parameters) for _, parameters in chunks] == [8, 8, 4]
+    assert chunks[0][0] == (
+        'UPDATE simple SET name = update_values.name FROM ('
+        'SELECT column1 AS id, column2 AS name FROM (VALUES '
+        '((NULL::simple).id, (NULL::simple).name), '
+        '(%s, %s), (%s, %s), (%s, %s), (%s, %s)) AS update_rows'
+        ') AS update_values '
+        'WHERE simple.id = update_values.id'
+    )
+
+    # chunks are capped by parameter limit
+    max_parameters = toolsql.get_max_parameters('sqlite')
+    rows = [{'id': i, 'name': str(i)} for i in range(max_parameters)]
+    chunks = toolsql.build_update_many_statements(
+        dialect='sqlite', table='simple', rows=rows, key_columns='id'
+    )
+    assert len(chunks) == 2
+    assert all(len(parameters) <= max_parameters for _, parameters in chunks)
+
+    # dict keys must be columns of a table schema
+    schema = toolsql.normalize_shorthand_table_schema(
+        conf_tables.get_simple_table()['schema']
+    )
+    with pytest.raises(Exception, match='not a column of table'):
+        toolsql.build_update_many_statements(
+            dialect='sqlite',
+            table=schema,
+            rows=[{'id': 1, 'name': 'a', 'extra': 2}],
+            key_columns='id',
+        )
@@ -1,11 +1,68 @@
 """toolsql is an async+sync sql builder+executor for sqlite+postgres"""
 
-from .dbs import *
-from .drivers import *
-from .executors import *
-from .schemas import *
-from .spec import *
-from .statements import *
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from .dbs import *
+    from .drivers import *
+    from .executors import *
+    from .schemas import *
+    from .spec import *
+    from .statements import *
 
 __version__ = '0.6.4'
 
+
+# submodules are imported on first attribute access (PEP 562), in the
+# reverse order of the star imports they replace so that later wins
+_star_submodules = (
+    'statements',
+    'spec',
+    'schemas',
+    'executors',
+    'drivers',
+    'dbs',
+)
+_submodules = _star_submodules + ('formats',)
+
+
+def __getattr__(name: str) -> typing.Any:
+    import importlib
+
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    if name == '__all__':
+        return _get_all_names()
+
+    for submodule_name in _star_submodules:
+        submodule = importlib.import_module('.' + submodule_name, __name__)
+        if name in _get_star_names(submodule):
+            value = getattr(submodule, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(
+        'module ' + repr(__name__) + ' has no attribute ' + repr(name)
+    )
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals().keys()) | set(_get_all_names()))
+
+
+def _get_all_names() -> list[str]:
+    import importlib
+
+    names: set[str] = set(_submodules)
+    for submodule_name in _star_submodules:
+        submodule = importlib.import_module('.' + submodule_name, __name__)
+        names.update(_get_star_names(submodule))
+    return sorted(names)
+
+
+def _get_star_names(module: typing.Any) -> typing.Sequence[str]:
+    names: typing.Sequence[str] | None = getattr(module, '__all__', None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith('_')]
+    return names
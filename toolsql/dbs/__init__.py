@@ -1,2 +1,3 @@
 from .db_utils import *
 from .login_utils import *
+from .schema_cache_utils import *
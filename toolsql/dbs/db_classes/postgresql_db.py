@@ -9,26 +9,6 @@ from toolsql import statements
 from . import abstract_db
 
 
-_copy_header = """
-
-SET statement_timeout = 0;
-SET lock_timeout = 0;
-SET idle_in_transaction_session_timeout = 0;
-SET client_encoding = 'UTF8';
-SET standard_conforming_strings = on;
-SELECT pg_catalog.set_config('search_path', '', false);
-SET check_function_bodies = false;
-SET xmloption = content;
-SET client_min_messages = warning;
-SET row_security = off;
-
-COPY public.{table} ({columns}) FROM stdin;
-"""
-_copy_footer = """
-\.
-"""
-
-
 class PostgresqlDb(abstract_db.AbstractDb):
     @classmethod
     def create_db(cls, db_config: spec.DBConfig) -> None:
@@ -487,56 +467,17 @@ class PostgresqlDb(abstract_db.AbstractDb):
         on_conflict: spec.OnConflictOption | None = None,
         upsert: bool | None = None,
     ) -> None:
-        """note that postgres will execute every COPY within a transaction"""
+        """insert rows using COPY, see executors.copy_insert()"""
 
-        import os
-        import tempfile
-        import time
-
-        # validate inputs
-        if rows is None:
-            if row is None:
-                raise Exception('must specify row or rows')
-            rows = [row]
-        if len(rows) == 0:
-            return
-        if upsert or on_conflict:
-            raise NotImplementedError('advanced options for copy')
-
-        # parse inputs
-        if not isinstance(conn, dict):
-            raise Exception('for postgresql COPY, use a DBConfig for the conn')
-        table = statements.get_table_name(table)
-        if columns is None:
-            if isinstance(table, dict):
-                columns = [column['name'] for column in table['columns']]
-
-            elif isinstance(rows[0], dict):
-                columns = list(rows[0].keys())
-                columns_set = set(columns)
-                for row in rows:
-                    if (
-                        not isinstance(row, dict)
-                        or set(row.keys()) != columns_set
-                    ):
-                        raise Exception('all rows should have same columns')
-            else:
-                raise Exception('must specify column names')
-
-        # create sql file
-        filename = 'copy_{time}.sql'.format(time=time.time())
-        temp_path = os.path.join(tempfile.mkdtemp(), filename)
-        with open(temp_path, 'w') as f:
-            f.write(_copy_header.format(table=table, columns=columns))
-            for row in rows:
-                if isinstance(row, dict):
-                    row = [row[column] for column in columns]
-                row = [_format_cell(cell) for cell in row]
-                f.write('\t'.join(row) + '\n')
-            f.write(_copy_footer)
-
-        # execute sql file
-        cls.execute_sql_file(path=temp_path, db_config=conn)
+        executors.copy_insert(
+            row=row,
+            rows=rows,
+            table=table,
+            columns=columns,
+            conn=conn,
+            on_conflict=on_conflict,
+            upsert=upsert,
+        )
 
     @classmethod
     def execute_sql_file(
@@ -568,12 +509,3 @@ class PostgresqlDb(abstract_db.AbstractDb):
 
         subprocess.call(psql_command, env=env)
 
-
-def _format_cell(cell: typing.Any) -> str:
-    import psycopg
-
-    if isinstance(cell, bytes):
-        return "\\\\x" + cell.hex()
-    else:
-        return psycopg.sql.Literal(cell).as_string(None)
-
@@ -0,0 +1,249 @@
+"""cache of table column types, used by select() to skip schema queries
+
+entries are keyed by database identity and table name
+- partition columns of connectorx reads are cached alongside column types
+- DDL executors invalidate affected tables across all databases
+- use a ttl to pick up DDL performed outside of toolsql
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import typing
+import weakref
+
+from toolsql import drivers
+from toolsql import spec
+from toolsql import statements
+
+if typing.TYPE_CHECKING:
+    import aiosqlite
+
+
+_schema_cache: typing.MutableMapping[
+    str, typing.MutableMapping[str, tuple[float, typing.Mapping[str, str]]]
+] = {}
+_partition_column_cache: typing.MutableMapping[
+    str, typing.MutableMapping[str, tuple[float, str]]
+] = {}
+_schema_cache_enabled = True
+_schema_cache_ttl: float | None = None
+
+# sqlite3 connections cannot be weakly referenced, only aiosqlite paths memoized
+_aiosqlite_keys: weakref.WeakKeyDictionary[
+    aiosqlite.Connection, str | None
+] = weakref.WeakKeyDictionary()
+
+
+def configure_schema_cache(
+    *,
+    enabled: bool = True,
+    ttl: float | None = None,
+) -> None:
+    """configure schema cache
+
+    - enabled: whether select() should reuse cached column types
+    - ttl: number of seconds that entries remain valid, None for no expiry
+    """
+    global _schema_cache_enabled
+    global _schema_cache_ttl
+
+    if ttl is not None and ttl < 0:
+        raise Exception('ttl must be non-negative')
+
+    _schema_cache_enabled = enabled
+    _schema_cache_ttl = ttl
+    if not enabled:
+        _schema_cache.clear()
+        _partition_column_cache.clear()
+
+
+def is_schema_cache_enabled() -> bool:
+    return _schema_cache_enabled
+
+
+def invalidate_schema_cache(
+    table: str | spec.TableSchema | None = None,
+) -> None:
+    """invalidate cached schema of table in every db, or all tables if None"""
+
+    if table is None:
+        _schema_cache.clear()
+        _partition_column_cache.clear()
+    else:
+        table_name = statements.get_table_name(table)
+        for db_entries in list(_schema_cache.values()):
+            db_entries.pop(table_name, None)
+        for partition_entries in list(_partition_column_cache.values()):
+            partition_entries.pop(table_name, None)
+
+
+def get_cached_table_raw_column_types(
+    table: str | spec.TableSchema,
+    *,
+    cache_key: str | None,
+) -> typing.Mapping[str, str] | None:
+    return _get_cache_entry(_schema_cache, table, cache_key=cache_key)
+
+
+def set_cached_table_raw_column_types(
+    table: str | spec.TableSchema,
+    raw_column_types: typing.Mapping[str, str],
+    *,
+    cache_key: str | None,
+) -> None:
+    _set_cache_entry(
+        _schema_cache, table, raw_column_types, cache_key=cache_key
+    )
+
+
+def get_cached_table_partition_column(
+    table: str | spec.TableSchema,
+    *,
+    cache_key: str | None,
+) -> str | None:
+    return _get_cache_entry(
+        _partition_column_cache, table, cache_key=cache_key
+    )
+
+
+def set_cached_table_partition_column(
+    table: str | spec.TableSchema,
+    partition_column: str,
+    *,
+    cache_key: str | None,
+) -> None:
+    _set_cache_entry(
+        _partition_column_cache, table, partition_column, cache_key=cache_key
+    )
+
+
+_T = typing.TypeVar('_T')
+
+
+def _get_cache_entry(
+    cache: typing.Mapping[str, typing.Mapping[str, tuple[float, _T]]],
+    table: str | spec.TableSchema,
+    *,
+    cache_key: str | None,
+) -> _T | None:
+
+    if cache_key is None or not _schema_cache_enabled:
+        return None
+
+    db_entries = cache.get(cache_key)
+    if db_entries is None:
+        return None
+    entry = db_entries.get(statements.get_table_name(table))
+    if entry is None:
+        return None
+
+    timestamp, value = entry
+    if (
+        _schema_cache_ttl is not None
+        and time.monotonic() - timestamp > _schema_cache_ttl
+    ):
+        return None
+
+    return value
+
+
+def _set_cache_entry(
+    cache: typing.MutableMapping[
+        str, typing.MutableMapping[str, tuple[float, _T]]
+    ],
+    table: str | spec.TableSchema,
+    value: _T,
+    *,
+    cache_key: str | None,
+) -> None:
+
+    if cache_key is None or not _schema_cache_enabled:
+        return
+
+    table_name = statements.get_table_name(table)
+    db_entries = cache.setdefault(cache_key, {})
+    db_entries[table_name] = (time.monotonic(), value)
+
+
+#
+# # cache keys
+#
+
+
+def get_schema_cache_key(
+    conn: spec.Connection | spec.AsyncConnection | str | spec.DBConfig,
+) -> str | None:
+    """get key identifying database of conn, or None if not cacheable"""
+
+    if isinstance(conn, str):
+        return _normalize_uri(conn)
+    elif isinstance(conn, dict):
+        return _normalize_uri(drivers.get_db_uri(conn))
+    elif spec.is_psycopg_sync_connection(
+        conn
+    ) or spec.is_psycopg_async_connection(conn):
+        return _get_psycopg_key(conn)
+    elif spec.is_sqlite3_connection(conn):
+        # in-process query, does not require a round trip
+        rows = conn.execute('PRAGMA database_list').fetchall()
+        return _get_sqlite_key(rows)
+    elif spec.is_aiosqlite_connection(conn):
+        if conn in _aiosqlite_keys:
+            return _aiosqlite_keys[conn]
+        else:
+            raise Exception('use async_get_schema_cache_key() for aiosqlite')
+    else:
+        return None
+
+
+async def async_get_schema_cache_key(
+    conn: spec.AsyncConnection | str | spec.DBConfig,
+) -> str | None:
+    """get key identifying database of conn, or None if not cacheable"""
+
+    if spec.is_aiosqlite_connection(conn):
+        if conn in _aiosqlite_keys:
+            return _aiosqlite_keys[conn]
+        async with conn.execute('PRAGMA database_list') as cursor:
+            rows = await cursor.fetchall()
+        key = _get_sqlite_key(rows)
+        _aiosqlite_keys[conn] = key
+        return key
+    else:
+        return get_schema_cache_key(conn)
+
+
+def _normalize_uri(uri: str) -> str | None:
+    if uri.startswith('sqlite://'):
+        path = uri.split('sqlite://')[1]
+        if path in ('', ':memory:'):
+            return None
+        return 'sqlite://' + os.path.abspath(path)
+    else:
+        return uri
+
+
+def _get_sqlite_key(
+    rows: typing.Iterable[typing.Sequence[typing.Any]],
+) -> str | None:
+    for seq, name, path in rows:
+        if name == 'main':
+            if path in (None, ''):
+                # in-memory and temporary dbs are private to each conn
+                return None
+            abspath: str = os.path.abspath(path)
+            return 'sqlite://' + abspath
+    else:
+        return None
+
+
+def _get_psycopg_key(conn: typing.Any) -> str:
+    info = conn.info
+    return 'postgresql://{user}@{host}:{port}/{dbname}'.format(
+        user=info.user,
+        host=info.host,
+        port=info.port,
+        dbname=info.dbname,
+    )
@@ -1,3 +1,4 @@
 from .conn_utils import *
 from .driver_classes import *
 from .driver_utils import *
+from .instrumentation_utils import *
@@ -3,3 +3,5 @@ from .connect_utils import *
 from .db_config_utils import *
 from .transaction_utils import *
 from .uri_utils import *
+from .pool_utils import *
+from .pipeline_utils import *
@@ -0,0 +1,114 @@
+"""psycopg pipeline mode, which sends queued statements in fewer round trips
+
+    with toolsql.connect(db_config) as conn:
+        with toolsql.pipeline(conn):
+            toolsql.insert(...)
+            toolsql.update(...)
+
+- statements are sent when the context exits or when results are fetched
+- errors of queued statements are raised when they are sent
+- sqlite connections execute statements immediately
+"""
+
+from __future__ import annotations
+
+import typing
+
+from toolsql import spec
+
+if typing.TYPE_CHECKING:
+    import types
+
+    import psycopg
+
+
+class _PipelineContext:
+
+    conn: spec.Connection
+    pipeline: typing.ContextManager[psycopg.Pipeline] | None
+
+    def __init__(self, conn: spec.Connection) -> None:
+        if spec.is_psycopg_sync_connection(conn):
+            pass
+        elif spec.is_sqlite3_connection(conn):
+            pass
+        else:
+            raise Exception('invalid driver')
+        self.conn = conn
+        self.pipeline = None
+
+    def __enter__(self) -> None:
+        if spec.is_psycopg_sync_connection(self.conn):
+            self.pipeline = self.conn.pipeline()
+            self.pipeline.__enter__()
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: types.TracebackType | None,
+    ) -> None:
+        if self.pipeline is None:
+            return
+        try:
+            self.pipeline.__exit__(
+                exception_type, exception_value, exception_traceback
+            )
+        except Exception as e:
+            raise spec.convert_exception(e)
+        finally:
+            self.pipeline = None
+
+
+class _AsyncPipelineContext:
+
+    conn: spec.AsyncConnection
+    pipeline: typing.AsyncContextManager[psycopg.AsyncPipeline] | None
+
+    def __init__(self, conn: spec.AsyncConnection) -> None:
+        if spec.is_psycopg_async_connection(conn):
+            pass
+        elif spec.is_aiosqlite_connection(conn):
+            pass
+        else:
+            raise Exception('invalid driver')
+        self.conn = conn
+        self.pipeline = None
+
+    async def __aenter__(self) -> None:
+        if spec.is_psycopg_async_connection(self.conn):
+            self.pipeline = self.conn.pipeline()
+            await self.pipeline.__aenter__()
+
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: types.TracebackType | None,
+    ) -> None:
+        if self.pipeline is None:
+            return
+        try:
+            await self.pipeline.__aexit__(
+                exception_type, exception_value, exception_traceback
+            )
+        except Exception as e:
+            raise spec.convert_exception(e)
+        finally:
+            self.pipeline = None
+
+
+def pipeline(conn: spec.Connection) -> _PipelineContext:
+    """queue statements of context and send them together
+
+    use as `with toolsql.pipeline(conn):`
+    """
+    return _PipelineContext(conn=conn)
+
+
+def async_pipeline(conn: spec.AsyncConnection) -> _AsyncPipelineContext:
+    """queue statements of context and send them together
+
+    use as `async with toolsql.async_pipeline(conn):`
+    """
+    return _AsyncPipelineContext(conn=conn)
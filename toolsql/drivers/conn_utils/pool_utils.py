@@ -0,0 +1,646 @@
+"""connection pools for reusing connections across queries
+
+- postgresql pools treat all connections equally
+- sqlite pools keep a single writer connection and many reader connections,
+  readers are opened with `PRAGMA query_only` so they cannot take write locks
+- sqlite readers only run concurrently with the writer if db uses WAL mode
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+import typing
+
+from toolsql import spec
+from . import conn_attributes
+from . import connect_utils
+from . import db_config_utils
+
+if typing.TYPE_CHECKING:
+    import asyncio
+    import threading
+
+
+def pool(
+    target: str | spec.DBConfig,
+    *,
+    min_size: int = 1,
+    max_size: int = 10,
+    max_idle: float | None = 600,
+    health_check_interval: float = 30,
+    timeout: float = 30,
+    extra_kwargs: typing.Mapping[str, typing.Any] | None = None,
+) -> ConnectionPool:
+    """create pool of sync connections
+
+    - min_size: number of reader connections to keep open
+    - max_size: maximum number of reader connections
+    - max_idle: close connections idle for this many seconds beyond min_size
+    - health_check_interval: ping connections idle for this many seconds
+    - timeout: seconds to wait for a connection before raising PoolTimeout
+    """
+    return ConnectionPool(
+        target,
+        min_size=min_size,
+        max_size=max_size,
+        max_idle=max_idle,
+        health_check_interval=health_check_interval,
+        timeout=timeout,
+        extra_kwargs=extra_kwargs,
+    )
+
+
+def async_pool(
+    target: str | spec.DBConfig,
+    *,
+    min_size: int = 1,
+    max_size: int = 10,
+    max_idle: float | None = 600,
+    health_check_interval: float = 30,
+    timeout: float = 30,
+    extra_kwargs: typing.Mapping[str, typing.Any] | None = None,
+) -> AsyncConnectionPool:
+    """create pool of async connections, open using `async with` or open()
+
+    see pool() for description of parameters
+    """
+    return AsyncConnectionPool(
+        target,
+        min_size=min_size,
+        max_size=max_size,
+        max_idle=max_idle,
+        health_check_interval=health_check_interval,
+        timeout=timeout,
+        extra_kwargs=extra_kwargs,
+    )
+
+
+class _BasePool:
+
+    target: str | spec.DBConfig
+    dialect: spec.Dialect
+    min_size: int
+    max_size: int
+    max_idle: float | None
+    health_check_interval: float
+    timeout: float
+    extra_kwargs: typing.Mapping[str, typing.Any] | None
+
+    _n_open: int
+    _closed: bool
+
+    def __init__(
+        self,
+        target: str | spec.DBConfig,
+        *,
+        sync: bool,
+        min_size: int,
+        max_size: int,
+        max_idle: float | None,
+        health_check_interval: float,
+        timeout: float,
+        extra_kwargs: typing.Mapping[str, typing.Any] | None,
+    ) -> None:
+
+        if max_size < 1:
+            raise Exception('max_size must be at least 1')
+        if min_size < 0 or min_size > max_size:
+            raise Exception('min_size must be between 0 and max_size')
+
+        if isinstance(target, dict):
+            if target.get('driver') == 'connectorx':
+                raise Exception('connectorx connections cannot be pooled')
+            if target.get('driver') is not None:
+                target = db_config_utils.create_db_config(target, sync=sync)
+        elif not isinstance(target, str):
+            raise Exception('must specify uri or db_config')
+
+        self.target = target
+        self.dialect = conn_attributes.get_conn_dialect(target)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.extra_kwargs = extra_kwargs
+        self._n_open = 0
+        self._closed = False
+
+    def _select_idle_to_evict(
+        self, idle: list[tuple[typing.Any, float]]
+    ) -> list[typing.Any]:
+        """remove connections idle longer than max_idle, keeping min_size"""
+
+        if self.max_idle is None:
+            return []
+        evicted = []
+        now = time.monotonic()
+        # idle list is LIFO, so stalest connections are at the front
+        while (
+            len(idle) > 0
+            and self._n_open > self.min_size
+            and now - idle[0][1] > self.max_idle
+        ):
+            conn, _ = idle.pop(0)
+            self._n_open -= 1
+            evicted.append(conn)
+        return evicted
+
+
+class ConnectionPool(_BasePool):
+    """pool of sync connections, use `with pool.connection() as conn:`"""
+
+    _idle: list[tuple[spec.Connection, float]]
+    _condition: threading.Condition
+    _writer: spec.Connection | None
+    _writer_last_used: float
+    _writer_lock: threading.Lock
+
+    def __init__(
+        self,
+        target: str | spec.DBConfig,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float | None = 600,
+        health_check_interval: float = 30,
+        timeout: float = 30,
+        extra_kwargs: typing.Mapping[str, typing.Any] | None = None,
+    ) -> None:
+        import threading
+
+        super().__init__(
+            target,
+            sync=True,
+            min_size=min_size,
+            max_size=max_size,
+            max_idle=max_idle,
+            health_check_interval=health_check_interval,
+            timeout=timeout,
+            extra_kwargs=extra_kwargs,
+        )
+
+        self._idle = []
+        self._condition = threading.Condition()
+        self._writer = None
+        self._writer_last_used = 0
+        self._writer_lock = threading.Lock()
+
+        for i in range(min_size):
+            self._idle.append((self._connect(readonly=True), time.monotonic()))
+            self._n_open += 1
+
+    def __enter__(self) -> ConnectionPool:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def connection(
+        self, *, readonly: bool = False
+    ) -> typing.Iterator[spec.Connection]:
+        """check out connection, sqlite writes require readonly=False"""
+
+        if self.dialect == 'sqlite' and not readonly:
+            with self._writer_connection() as conn:
+                yield conn
+        else:
+            conn = self._acquire()
+            try:
+                yield conn
+            finally:
+                self._release(conn)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._n_open -= len(idle)
+            self._idle = []
+            self._condition.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+        if self._writer_lock.acquire(timeout=self.timeout):
+            try:
+                if self._writer is not None:
+                    _close_quietly(self._writer)
+                    self._writer = None
+            finally:
+                self._writer_lock.release()
+
+    def get_stats(self) -> spec.PoolStats:
+        with self._condition:
+            return {
+                'n_open': self._n_open,
+                'n_idle': len(self._idle),
+                'n_in_use': self._n_open - len(self._idle),
+                'has_writer': self._writer is not None,
+            }
+
+    def evict_idle(self) -> None:
+        """close connections that have exceeded max_idle"""
+        with self._condition:
+            evicted = self._select_idle_to_evict(self._idle)
+        for conn in evicted:
+            _close_quietly(conn)
+
+    #
+    # # internal
+    #
+
+    def _connect(self, *, readonly: bool) -> spec.Connection:
+        extra_kwargs = self.extra_kwargs
+        if self.dialect == 'sqlite':
+            # pool hands connections between threads, one user at a time
+            extra_kwargs = dict(extra_kwargs or {}, check_same_thread=False)
+        conn = connect_utils.connect(self.target, extra_kwargs=extra_kwargs)
+        if self.dialect == 'sqlite' and readonly:
+            conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def _acquire(self) -> spec.Connection:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn: spec.Connection | None = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise Exception('pool is closed')
+                    if len(self._idle) > 0:
+                        conn, last_used = self._idle.pop()
+                        break
+                    elif self._n_open < self.max_size:
+                        self._n_open += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise spec.PoolTimeout(
+                            'timed out waiting for pool connection'
+                        )
+                    self._condition.wait(remaining)
+
+            # create new connection in reserved slot
+            if conn is None:
+                try:
+                    return self._connect(readonly=True)
+                except BaseException:
+                    with self._condition:
+                        self._n_open -= 1
+                        self._condition.notify()
+                    raise
+
+            # check health of idle connection
+            if _is_healthy(conn, last_used, self.health_check_interval):
+                return conn
+            else:
+                _close_quietly(conn)
+                with self._condition:
+                    self._n_open -= 1
+                    self._condition.notify()
+
+    def _release(self, conn: spec.Connection) -> None:
+        healthy = _reset(conn)
+        with self._condition:
+            if self._closed or not healthy:
+                self._n_open -= 1
+                evicted = [conn]
+            else:
+                self._idle.append((conn, time.monotonic()))
+                evicted = self._select_idle_to_evict(self._idle)
+            self._condition.notify()
+        for evicted_conn in evicted:
+            _close_quietly(evicted_conn)
+
+    @contextlib.contextmanager
+    def _writer_connection(self) -> typing.Iterator[spec.Connection]:
+        if not self._writer_lock.acquire(timeout=self.timeout):
+            raise spec.PoolTimeout('timed out waiting for writer connection')
+        try:
+            if self._closed:
+                raise Exception('pool is closed')
+            if self._writer is not None and not _is_healthy(
+                self._writer, self._writer_last_used, self.health_check_interval
+            ):
+                _close_quietly(self._writer)
+                self._writer = None
+            if self._writer is None:
+                self._writer = self._connect(readonly=False)
+
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                if not _reset(conn) or self._closed:
+                    _close_quietly(conn)
+                    self._writer = None
+                self._writer_last_used = time.monotonic()
+        finally:
+            self._writer_lock.release()
+
+
+class AsyncConnectionPool(_BasePool):
+    """pool of async connections, use `async with pool.connection() as conn:`"""
+
+    _idle: list[tuple[spec.AsyncConnection, float]]
+    _condition: asyncio.Condition
+    _writer: spec.AsyncConnection | None
+    _writer_last_used: float
+    _writer_lock: asyncio.Lock
+
+    def __init__(
+        self,
+        target: str | spec.DBConfig,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float | None = 600,
+        health_check_interval: float = 30,
+        timeout: float = 30,
+        extra_kwargs: typing.Mapping[str, typing.Any] | None = None,
+    ) -> None:
+        import asyncio
+
+        super().__init__(
+            target,
+            sync=False,
+            min_size=min_size,
+            max_size=max_size,
+            max_idle=max_idle,
+            health_check_interval=health_check_interval,
+            timeout=timeout,
+            extra_kwargs=extra_kwargs,
+        )
+
+        self._idle = []
+        self._condition = asyncio.Condition()
+        self._writer = None
+        self._writer_last_used = 0
+        self._writer_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> AsyncConnectionPool:
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """open min_size connections"""
+        async with self._condition:
+            n_new = max(0, self.min_size - self._n_open)
+            self._n_open += n_new
+        for i in range(n_new):
+            conn = await self._connect(readonly=True)
+            async with self._condition:
+                self._idle.append((conn, time.monotonic()))
+                self._condition.notify()
+
+    @contextlib.asynccontextmanager
+    async def connection(
+        self, *, readonly: bool = False
+    ) -> typing.AsyncIterator[spec.AsyncConnection]:
+        """check out connection, sqlite writes require readonly=False"""
+
+        if self.dialect == 'sqlite' and not readonly:
+            async with self._writer_connection() as conn:
+                yield conn
+        else:
+            conn = await self._acquire()
+            try:
+                yield conn
+            finally:
+                await self._release(conn)
+
+    async def close(self) -> None:
+        import asyncio
+
+        async with self._condition:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._n_open -= len(idle)
+            self._idle = []
+            self._condition.notify_all()
+        for conn in idle:
+            await _async_close_quietly(conn)
+        try:
+            await asyncio.wait_for(self._writer_lock.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            return
+        try:
+            if self._writer is not None:
+                await _async_close_quietly(self._writer)
+                self._writer = None
+        finally:
+            self._writer_lock.release()
+
+    def get_stats(self) -> spec.PoolStats:
+        return {
+            'n_open': self._n_open,
+            'n_idle': len(self._idle),
+            'n_in_use': self._n_open - len(self._idle),
+            'has_writer': self._writer is not None,
+        }
+
+    async def evict_idle(self) -> None:
+        """close connections that have exceeded max_idle"""
+        async with self._condition:
+            evicted = self._select_idle_to_evict(self._idle)
+        for conn in evicted:
+            await _async_close_quietly(conn)
+
+    #
+    # # internal
+    #
+
+    async def _connect(self, *, readonly: bool) -> spec.AsyncConnection:
+        pending = connect_utils.async_connect(
+            self.target, extra_kwargs=self.extra_kwargs
+        )
+        conn: spec.AsyncConnection = await pending  # type: ignore
+        if self.dialect == 'sqlite' and readonly:
+            await conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    async def _acquire(self) -> spec.AsyncConnection:
+        import asyncio
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn: spec.AsyncConnection | None = None
+            async with self._condition:
+                while True:
+                    if self._closed:
+                        raise Exception('pool is closed')
+                    if len(self._idle) > 0:
+                        conn, last_used = self._idle.pop()
+                        break
+                    elif self._n_open < self.max_size:
+                        self._n_open += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise spec.PoolTimeout(
+                            'timed out waiting for pool connection'
+                        )
+                    try:
+                        await asyncio.wait_for(
+                            self._condition.wait(), remaining
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+
+            # create new connection in reserved slot
+            if conn is None:
+                try:
+                    return await self._connect(readonly=True)
+                except BaseException:
+                    async with self._condition:
+                        self._n_open -= 1
+                        self._condition.notify()
+                    raise
+
+            # check health of idle connection
+            healthy = await _async_is_healthy(
+                conn, last_used, self.health_check_interval
+            )
+            if healthy:
+                return conn
+            else:
+                await _async_close_quietly(conn)
+                async with self._condition:
+                    self._n_open -= 1
+                    self._condition.notify()
+
+    async def _release(self, conn: spec.AsyncConnection) -> None:
+        healthy = await _async_reset(conn)
+        async with self._condition:
+            if self._closed or not healthy:
+                self._n_open -= 1
+                evicted = [conn]
+            else:
+                self._idle.append((conn, time.monotonic()))
+                evicted = self._select_idle_to_evict(self._idle)
+            self._condition.notify()
+        for evicted_conn in evicted:
+            await _async_close_quietly(evicted_conn)
+
+    @contextlib.asynccontextmanager
+    async def _writer_connection(
+        self,
+    ) -> typing.AsyncIterator[spec.AsyncConnection]:
+        import asyncio
+
+        try:
+            await asyncio.wait_for(self._writer_lock.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise spec.PoolTimeout('timed out waiting for writer connection')
+        try:
+            if self._closed:
+                raise Exception('pool is closed')
+            if self._writer is not None:
+                healthy = await _async_is_healthy(
+                    self._writer,
+                    self._writer_last_used,
+                    self.health_check_interval,
+                )
+                if not healthy:
+                    await _async_close_quietly(self._writer)
+                    self._writer = None
+            if self._writer is None:
+                self._writer = await self._connect(readonly=False)
+
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                if not await _async_reset(conn) or self._closed:
+                    await _async_close_quietly(conn)
+                    self._writer = None
+                self._writer_last_used = time.monotonic()
+        finally:
+            self._writer_lock.release()
+
+
+#
+# # connection maintenance
+#
+
+
+def _is_healthy(
+    conn: spec.Connection, last_used: float, health_check_interval: float
+) -> bool:
+
+    if spec.is_psycopg_sync_connection(conn) and (conn.closed or conn.broken):
+        return False
+    if time.monotonic() - last_used < health_check_interval:
+        return True
+    try:
+        conn.execute('SELECT 1')
+        return True
+    except Exception:
+        return False
+
+
+async def _async_is_healthy(
+    conn: spec.AsyncConnection, last_used: float, health_check_interval: float
+) -> bool:
+
+    if spec.is_psycopg_async_connection(conn) and (
+        conn.closed or conn.broken
+    ):
+        return False
+    if time.monotonic() - last_used < health_check_interval:
+        return True
+    try:
+        await conn.execute('SELECT 1')
+        return True
+    except Exception:
+        return False
+
+
+def _reset(conn: spec.Connection) -> bool:
+    """roll back any transaction left open, return whether conn is reusable"""
+    try:
+        if spec.is_sqlite3_connection(conn):
+            if conn.in_transaction:
+                conn.rollback()
+        elif spec.is_psycopg_sync_connection(conn):
+            if conn.closed or conn.broken:
+                return False
+            if conn.info.transaction_status != 0:
+                conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+async def _async_reset(conn: spec.AsyncConnection) -> bool:
+    """roll back any transaction left open, return whether conn is reusable"""
+    try:
+        if spec.is_aiosqlite_connection(conn):
+            if conn.in_transaction:
+                await conn.rollback()
+        elif spec.is_psycopg_async_connection(conn):
+            if conn.closed or conn.broken:
+                return False
+            if conn.info.transaction_status != 0:
+                await conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _close_quietly(conn: spec.Connection) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+async def _async_close_quietly(conn: spec.AsyncConnection) -> None:
+    try:
+        await conn.close()
+    except Exception:
+        pass
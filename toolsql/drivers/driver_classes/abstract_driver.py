@@ -3,6 +3,7 @@ from __future__ import annotations
 import typing
 
 from toolsql import spec
+from .. import instrumentation_utils
 
 
 class AbstractDriver:
@@ -47,10 +48,37 @@ class AbstractDriver:
     ) -> tuple[str, ...] | None:
         raise NotImplementedError('get_cursor_output_names() for ' + cls.name)
 
+    @classmethod
+    def get_cursor_output_dtypes(
+        cls,
+        cursor: spec.Cursor | spec.AsyncCursor,
+    ) -> spec.OutputDtypes | None:
+        """get polars dtypes of cursor output columns, None where unknown"""
+        return None
+
+    @classmethod
+    def _set_row_factory(
+        cls,
+        cursor: spec.Cursor | spec.AsyncCursor,
+        output_format: spec.QueryOutputFormat,
+    ) -> bool:
+        """have cursor build rows of output_format while fetching
+
+        returns whether output_format is supported, otherwise rows are tuples
+        """
+        return False
+
     #
     # # executions
     #
 
+    @classmethod
+    def _get_execute_kwargs(
+        cls, parameters: spec.ExecuteParams | None
+    ) -> typing.Mapping[str, typing.Any]:
+        """extra driver-specific kwargs for cursor.execute()"""
+        return {}
+
     @classmethod
     def execute(
         cls,
@@ -58,16 +86,28 @@ class AbstractDriver:
         sql: str,
         parameters: spec.ExecuteParams | None = None,
         conn: spec.Connection,
-    ) -> None:
+    ) -> int:
+        """execute statement, returning number of rows affected"""
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='execute', parameters=parameters
+        )
+        execute_kwargs = cls._get_execute_kwargs(parameters)
         with conn.cursor() as cursor:  # type: ignore
             try:
                 if parameters is None:
-                    cursor.execute(sql)
+                    cursor.execute(sql, **execute_kwargs)
                 else:
-                    cursor.execute(sql, parameters)
+                    cursor.execute(sql, parameters, **execute_kwargs)
             except Exception as e:
+                if timer is not None:
+                    timer.finish(error=e)
                 raise spec.convert_exception(e, sql)
+            rowcount: int = cursor.rowcount
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
 
     @classmethod
     def executemany(
@@ -76,13 +116,27 @@ class AbstractDriver:
         sql: str,
         parameters: spec.ExecuteManyParams,
         conn: spec.Connection,
-    ) -> None:
-
+    ) -> int:
+        """execute statement for each parameter set, returning rows affected"""
+
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql,
+            driver=cls.name,
+            operation='executemany',
+            parameters=parameters,
+        )
         with conn.cursor() as cursor:  # type: ignore
             try:
                 cursor.executemany(sql, parameters)
             except Exception as e:
+                if timer is not None:
+                    timer.finish(error=e)
                 raise spec.convert_exception(e, sql)
+            rowcount: int = cursor.rowcount
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
 
     @classmethod
     async def async_execute(
@@ -91,7 +145,7 @@ class AbstractDriver:
         sql: str,
         parameters: spec.ExecuteParams | None = None,
         conn: spec.AsyncConnection,
-    ) -> None:
+    ) -> int:
         raise NotImplementedError()
 
     @classmethod
@@ -101,7 +155,7 @@ class AbstractDriver:
         sql: str,
         parameters: spec.ExecuteManyParams,
         conn: spec.AsyncConnection,
-    ) -> None:
+    ) -> int:
         raise NotImplementedError()
 
     #
@@ -134,3 +188,33 @@ class AbstractDriver:
     ) -> spec.AsyncSelectOutput:
         raise NotImplementedError('_async_select() for ' + str(cls.__name__))
 
+
+    @classmethod
+    def _select_iter(
+        cls,
+        *,
+        sql: str,
+        parameters: spec.ExecuteParams | None = None,
+        conn: spec.Connection | str | spec.DBConfig,
+        batch_size: int,
+        decode_columns: spec.DecodeColumns | None = None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None = None,
+    ) -> typing.Iterator[spec.SelectOutputData]:
+        raise NotImplementedError('_select_iter() for ' + str(cls.__name__))
+
+    @classmethod
+    def _async_select_iter(
+        cls,
+        *,
+        sql: str,
+        parameters: spec.ExecuteParams | None = None,
+        conn: spec.AsyncConnection | str | spec.DBConfig,
+        batch_size: int,
+        decode_columns: spec.DecodeColumns | None = None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None = None,
+    ) -> typing.AsyncIterator[spec.SelectOutputData]:
+        raise NotImplementedError(
+            '_async_select_iter() for ' + str(cls.__name__)
+        )
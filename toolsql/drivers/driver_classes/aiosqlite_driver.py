@@ -5,7 +5,9 @@ import typing
 import aiosqlite
 
 from toolsql import spec
+from .. import instrumentation_utils
 from . import dbapi_driver
+from . import sqlite3_driver
 
 
 class AiosqliteDriver(dbapi_driver.DbapiDriver):
@@ -44,6 +46,24 @@ class AiosqliteDriver(dbapi_driver.DbapiDriver):
             raise Exception('not an aiosqlite cursor')
         return tuple(item[0] for item in cursor.description)
 
+    @classmethod
+    def _set_row_factory(
+        cls,
+        cursor: spec.Cursor | spec.AsyncCursor,
+        output_format: spec.QueryOutputFormat,
+    ) -> bool:
+        if not isinstance(cursor, aiosqlite.Cursor):
+            raise Exception('not an aiosqlite cursor')
+        row_factory = sqlite3_driver.get_sqlite_row_factory(
+            cls.get_cursor_output_names(cursor), output_format
+        )
+        if row_factory is None:
+            return False
+        # aiosqlite cursors do not expose row_factory, set it on the wrapped
+        # sqlite3 cursor, which is idle between execute and fetch
+        cursor._cursor.row_factory = row_factory
+        return True
+
     @classmethod
     async def async_execute(
         cls,
@@ -51,16 +71,27 @@ class AiosqliteDriver(dbapi_driver.DbapiDriver):
         sql: str,
         parameters: spec.ExecuteParams | None = None,
         conn: spec.AsyncConnection,
-    ) -> None:
+    ) -> int:
 
         if not isinstance(conn, aiosqlite.Connection):
             raise Exception('not an aiosqlite conn')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='execute', parameters=parameters
+        )
         try:
             if parameters is None:
-                await conn.execute(sql)
+                cursor = await conn.execute(sql)
             else:
-                await conn.execute(sql, parameters)
+                cursor = await conn.execute(sql, parameters)
         except Exception as e:
+            if timer is not None:
+                timer.finish(error=e)
             raise spec.convert_exception(e, sql)
+        rowcount: int = cursor.rowcount
+        await cursor.close()
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
 
@@ -11,6 +11,7 @@ from toolsql import formats
 from toolsql import spec
 from toolsql import statements
 
+from .. import instrumentation_utils
 from . import abstract_driver
 
 
@@ -134,7 +135,7 @@ class ConnectorxDriver(abstract_driver.AbstractDriver):
         sql: str,
         parameters: spec.ExecuteManyParams,
         conn: spec.Connection,
-    ) -> None:
+    ) -> int:
         raise Exception('connectorx cannot use execute() or executemany()')
 
     @classmethod
@@ -144,7 +145,7 @@ class ConnectorxDriver(abstract_driver.AbstractDriver):
         sql: str,
         parameters: spec.ExecuteManyParams,
         conn: spec.AsyncConnection,
-    ) -> None:
+    ) -> int:
         raise Exception('connectorx cannot use execute() or executemany()')
 
     #
@@ -161,7 +162,16 @@ class ConnectorxDriver(abstract_driver.AbstractDriver):
         output_format: spec.QueryOutputFormat,
         decode_columns: spec.DecodeColumns | None = None,
         output_dtypes: spec.OutputDtypes | None = None,
+        partition_on: str | None = None,
+        partition_num: int | None = None,
+        partition_range: tuple[int, int] | None = None,
     ) -> spec.SelectOutput:
+        """select rows, optionally as parallel range queries
+
+        - partition_on: integer column used to split query into ranges
+        - partition_num: number of ranges, defaults to number of cpus
+        - partition_range: (min, max) of partition_on, queried if not given
+        """
         import connectorx  # type: ignore
 
         if output_format == 'cursor':
@@ -169,7 +179,7 @@ class ConnectorxDriver(abstract_driver.AbstractDriver):
         elif output_format == 'pandas':
             result_format = 'pandas'
         else:
-            result_format = 'polars'
+            result_format = 'arrow'
 
         if parameters is not None and len(parameters) > 0:
             sql = statements.populate_sql_parameters(
@@ -183,14 +193,45 @@ class ConnectorxDriver(abstract_driver.AbstractDriver):
             else:
                 raise Exception('unknown conn format: ' + str(type(conn)))
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='select'
+        )
+        partition_kwargs: dict[str, typing.Any] = {}
+        if partition_on is not None:
+            if partition_num is None:
+                partition_num = os.cpu_count() or 1
+            partition_kwargs['partition_on'] = partition_on
+            partition_kwargs['partition_num'] = partition_num
+            if partition_range is not None:
+                partition_kwargs['partition_range'] = partition_range
+
         try:
-            result = connectorx.read_sql(conn, sql, return_type=result_format)
+            result = connectorx.read_sql(
+                conn, sql, return_type=result_format, **partition_kwargs
+            )
         except Exception as e:
+            if timer is not None:
+                timer.finish(error=e)
             raise spec.convert_exception(e)
+        if timer is not None:
+            # connectorx executes and fetches in a single call
+            timer.mark('fetch')
+
+        # arrow output is returned without a round trip through polars
+        if output_format == 'arrow' and output_dtypes is None:
+            result = formats.decode_columns(rows=result, columns=decode_columns)
+            if timer is not None:
+                timer.mark('decode')
+                timer.finish(n_rows=len(result))
+            return result
+        elif result_format == 'arrow':
+            import polars as pl
+
+            result = pl.from_arrow(result)
 
         if decode_columns is None:
             decode_columns = [None] * len(result.columns)
-        if output_dtypes is not None:
+        if output_dtypes is not None and output_format != 'numpy':
             import polars as pl
 
             new_result = []
@@ -203,7 +244,15 @@ class ConnectorxDriver(abstract_driver.AbstractDriver):
                     new_result.append(result[column])
             result = pl.DataFrame(new_result)
         result = formats.decode_columns(rows=result, columns=decode_columns)
-        return formats.format_row_dataframe(result, output_format=output_format)
+        if timer is not None:
+            timer.mark('decode')
+        output = formats.format_row_dataframe(
+            result, output_format=output_format
+        )
+        if timer is not None:
+            timer.mark('format')
+            timer.finish(n_rows=len(result))
+        return output
 
     @classmethod
     async def _async_select(
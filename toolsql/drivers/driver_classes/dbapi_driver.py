@@ -5,6 +5,7 @@ import typing
 from toolsql import formats
 from toolsql import spec
 
+from .. import instrumentation_utils
 from . import abstract_driver
 
 
@@ -25,31 +26,78 @@ class DbapiDriver(abstract_driver.AbstractDriver):
         if isinstance(conn, dict):
             raise Exception('conn not initialized')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='select', parameters=parameters
+        )
+        execute_kwargs = cls._get_execute_kwargs(parameters)
         cursor = conn.cursor()
         try:
             if parameters is not None:
-                cursor = cursor.execute(sql, parameters)
+                cursor = cursor.execute(sql, parameters, **execute_kwargs)
             else:
-                cursor = cursor.execute(sql)
+                cursor = cursor.execute(sql, **execute_kwargs)
         except Exception as e:
+            if timer is not None:
+                timer.finish(error=e)
             raise spec.convert_exception(e, sql)
 
         if output_format == 'cursor':
+            if timer is not None:
+                timer.mark('execute')
+                timer.finish()
             return cursor
 
+        if timer is not None:
+            timer.mark('execute')
+
+        # build rows in final format during fetch when no decoding is needed
+        if _can_use_row_factory(
+            output_format, decode_columns
+        ) and cls._set_row_factory(cursor, output_format):
+            factory_rows: typing.Sequence[typing.Any] = cursor.fetchall()
+            if timer is not None:
+                timer.mark('fetch')
+                timer.finish(n_rows=len(factory_rows))
+            return factory_rows
+
+        # fill column arrays batch by batch instead of materializing rows
+        if output_format == 'numpy':
+            builder = _create_numpy_builder(cls, cursor, output_dtypes)
+            while True:
+                batch = cursor.fetchmany(_numpy_batch_size)
+                if len(batch) == 0:
+                    break
+                builder.append(
+                    formats.decode_columns(rows=batch, columns=decode_columns)
+                )
+            if timer is not None:
+                timer.mark('fetch')
+                timer.finish(n_rows=builder.n_rows)
+            return builder.finish()
+
         rows: typing.Sequence[tuple[typing.Any, ...]] = cursor.fetchall()
+        if timer is not None:
+            timer.mark('fetch')
         rows = formats.decode_columns(rows=rows, columns=decode_columns)
+        if timer is not None:
+            timer.mark('decode')
 
         if output_format == 'tuple':
-            return rows
+            result: spec.SelectOutput = rows
         else:
             names = cls.get_cursor_output_names(cursor)
-            return formats.format_row_tuples(
+            if output_format == 'polars':
+                output_dtypes = _fill_output_dtypes(cls, cursor, output_dtypes)
+            result = formats.format_row_tuples(
                 rows=rows,
                 names=names,
                 output_format=output_format,
                 output_dtypes=output_dtypes,
             )
+        if timer is not None:
+            timer.mark('format')
+            timer.finish(n_rows=len(rows))
+        return result
 
     @classmethod
     async def _async_select(
@@ -67,25 +115,181 @@ class DbapiDriver(abstract_driver.AbstractDriver):
         if isinstance(conn, dict):
             raise Exception('conn not initialized')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='select', parameters=parameters
+        )
+        execute_kwargs = cls._get_execute_kwargs(parameters)
         try:
-            cursor: spec.AsyncCursor = await conn.execute(sql, parameters)
+            cursor: spec.AsyncCursor = await conn.execute(
+                sql, parameters, **execute_kwargs
+            )
         except Exception as e:
+            if timer is not None:
+                timer.finish(error=e)
             raise spec.convert_exception(e, sql)
         if output_format == 'cursor':
+            if timer is not None:
+                timer.mark('execute')
+                timer.finish()
             return cursor
 
-        rows = await cursor.fetchall()
+        if timer is not None:
+            timer.mark('execute')
+
+        # build rows in final format during fetch when no decoding is needed
+        if _can_use_row_factory(
+            output_format, decode_columns
+        ) and cls._set_row_factory(cursor, output_format):
+            factory_rows = list(await cursor.fetchall())
+            if timer is not None:
+                timer.mark('fetch')
+                timer.finish(n_rows=len(factory_rows))
+            return factory_rows
+
+        if output_format == 'numpy':
+            builder = _create_numpy_builder(cls, cursor, output_dtypes)
+            while True:
+                batch = list(await cursor.fetchmany(_numpy_batch_size))
+                if len(batch) == 0:
+                    break
+                builder.append(
+                    formats.decode_columns(rows=batch, columns=decode_columns)
+                )
+            if timer is not None:
+                timer.mark('fetch')
+                timer.finish(n_rows=builder.n_rows)
+            return builder.finish()
+
+        rows = typing.cast(
+            typing.Sequence[typing.Any], await cursor.fetchall()
+        )
+        if timer is not None:
+            timer.mark('fetch')
         decoded_rows = formats.decode_columns(rows=rows, columns=decode_columns)
+        if timer is not None:
+            timer.mark('decode')
         if output_format == 'tuple':
-            return decoded_rows
+            result: spec.AsyncSelectOutput = decoded_rows
         else:
             names = cls.get_cursor_output_names(cursor)
-            return formats.format_row_tuples(
+            if output_format == 'polars':
+                output_dtypes = _fill_output_dtypes(cls, cursor, output_dtypes)
+            result = formats.format_row_tuples(
                 rows=decoded_rows,
                 names=names,
                 output_format=output_format,
                 output_dtypes=output_dtypes,
             )
+        if timer is not None:
+            timer.mark('format')
+            timer.finish(n_rows=len(rows))
+        return result
+
+    @classmethod
+    def _select_iter(
+        cls,
+        *,
+        sql: str,
+        parameters: spec.ExecuteParams | None = None,
+        conn: spec.Connection | spec.DBConfig | str,
+        batch_size: int,
+        decode_columns: spec.DecodeColumns | None = None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None = None,
+    ) -> typing.Iterator[spec.SelectOutputData]:
+        if isinstance(conn, str):
+            raise Exception('conn not initialized')
+        if isinstance(conn, dict):
+            raise Exception('conn not initialized')
+
+        cursor = conn.cursor()
+        try:
+            try:
+                if parameters is not None:
+                    cursor.execute(sql, parameters)
+                else:
+                    cursor.execute(sql)
+            except Exception as e:
+                raise spec.convert_exception(e, sql)
+
+            names = cls.get_cursor_output_names(cursor)
+            if output_format == 'polars':
+                output_dtypes = _fill_output_dtypes(cls, cursor, output_dtypes)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if len(rows) == 0:
+                    break
+                yield cls._format_batch(
+                    rows=rows,
+                    names=names,
+                    decode_columns=decode_columns,
+                    output_format=output_format,
+                    output_dtypes=output_dtypes,
+                )
+        finally:
+            cursor.close()
+
+    @classmethod
+    async def _async_select_iter(
+        cls,
+        *,
+        sql: str,
+        parameters: spec.ExecuteParams | None = None,
+        conn: spec.AsyncConnection | spec.DBConfig | str,
+        batch_size: int,
+        decode_columns: spec.DecodeColumns | None = None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None = None,
+    ) -> typing.AsyncIterator[spec.SelectOutputData]:
+        if isinstance(conn, str):
+            raise Exception('conn not initialized')
+        if isinstance(conn, dict):
+            raise Exception('conn not initialized')
+
+        try:
+            cursor: spec.AsyncCursor = await conn.execute(sql, parameters)
+        except Exception as e:
+            raise spec.convert_exception(e, sql)
+        try:
+            names = cls.get_cursor_output_names(cursor)
+            if output_format == 'polars':
+                output_dtypes = _fill_output_dtypes(cls, cursor, output_dtypes)
+            while True:
+                rows: typing.Sequence[typing.Any] = list(
+                    await cursor.fetchmany(batch_size)
+                )
+                if len(rows) == 0:
+                    break
+                yield cls._format_batch(
+                    rows=rows,
+                    names=names,
+                    decode_columns=decode_columns,
+                    output_format=output_format,
+                    output_dtypes=output_dtypes,
+                )
+        finally:
+            await cursor.close()
+
+    @classmethod
+    def _format_batch(
+        cls,
+        *,
+        rows: typing.Sequence[tuple[typing.Any, ...]],
+        names: typing.Sequence[str] | None,
+        decode_columns: spec.DecodeColumns | None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None,
+    ) -> spec.SelectOutputData:
+        rows = formats.decode_columns(rows=rows, columns=decode_columns)
+        if output_format == 'tuple':
+            return rows
+        else:
+            return formats.format_row_tuples(
+                rows=rows,
+                names=names,
+                output_format=output_format,
+                output_dtypes=output_dtypes,
+            )
 
     @classmethod
     async def async_execute(
@@ -94,20 +298,31 @@ class DbapiDriver(abstract_driver.AbstractDriver):
         sql: str,
         parameters: spec.ExecuteParams | None = None,
         conn: spec.AsyncConnection,
-    ) -> None:
+    ) -> int:
         # type check
         if not spec.is_psycopg_async_connection(conn):
             # currently only used by psycopg async connections
             raise Exception('invalid conn')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='execute', parameters=parameters
+        )
+        execute_kwargs = cls._get_execute_kwargs(parameters)
         async with conn.cursor() as cursor:
             try:
                 if parameters is None:
-                    await cursor.execute(sql)
+                    await cursor.execute(sql, **execute_kwargs)
                 else:
-                    await cursor.execute(sql, parameters)
+                    await cursor.execute(sql, parameters, **execute_kwargs)
             except Exception as e:
+                if timer is not None:
+                    timer.finish(error=e)
                 raise spec.convert_exception(e, sql)
+            rowcount: int = cursor.rowcount
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
 
     @classmethod
     async def async_executemany(
@@ -116,16 +331,82 @@ class DbapiDriver(abstract_driver.AbstractDriver):
         sql: str,
         parameters: spec.ExecuteManyParams,
         conn: spec.AsyncConnection,
-    ) -> None:
+    ) -> int:
         # type check
         if not spec.is_psycopg_async_connection(
             conn
         ) and not spec.is_aiosqlite_connection(conn):
             raise Exception('invalid conn')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql,
+            driver=cls.name,
+            operation='executemany',
+            parameters=parameters,
+        )
         async with conn.cursor() as cursor:
             try:
                 await cursor.executemany(sql, parameters)  # type: ignore
             except Exception as e:
+                if timer is not None:
+                    timer.finish(error=e)
                 raise spec.convert_exception(e, sql)
+            rowcount: int = cursor.rowcount
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
+
+
+def _can_use_row_factory(
+    output_format: spec.QueryOutputFormat,
+    decode_columns: spec.DecodeColumns | None,
+) -> bool:
+    if output_format not in ('dict', 'record'):
+        return False
+    return decode_columns is None or all(
+        decode_column is None for decode_column in decode_columns
+    )
+
+
+def _fill_output_dtypes(
+    driver: type[DbapiDriver],
+    cursor: spec.Cursor | spec.AsyncCursor,
+    output_dtypes: spec.OutputDtypes | None,
+) -> spec.OutputDtypes | None:
+    """use dtypes of cursor description where output_dtypes are unknown"""
+
+    cursor_dtypes = driver.get_cursor_output_dtypes(cursor)
+    if cursor_dtypes is None:
+        return output_dtypes
+    elif output_dtypes is None:
+        return cursor_dtypes
+    elif len(output_dtypes) != len(cursor_dtypes):
+        return output_dtypes
+    else:
+        return [
+            dtype if dtype is not None else cursor_dtype
+            for dtype, cursor_dtype in zip(output_dtypes, cursor_dtypes)
+        ]
+
+
+_numpy_batch_size = 10000
+
+
+def _create_numpy_builder(
+    driver: type[DbapiDriver],
+    cursor: spec.Cursor | spec.AsyncCursor,
+    output_dtypes: spec.OutputDtypes | None,
+) -> formats.NumpyColumnBuilder:
+    names = driver.get_cursor_output_names(cursor)
+    if names is None:
+        raise Exception('could not determine names of columns')
 
+    # psycopg knows number of result rows after execute, sqlite does not
+    if cursor.rowcount > 0:
+        capacity = cursor.rowcount
+    else:
+        capacity = _numpy_batch_size
+    return formats.NumpyColumnBuilder(
+        names=names, dtypes=output_dtypes, capacity=capacity
+    )
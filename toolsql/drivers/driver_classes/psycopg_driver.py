@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import functools
 import typing
+import uuid
 
 import psycopg
 
+from toolsql import formats
 from toolsql import spec
 from .. import conn_utils
 from . import dbapi_driver
@@ -25,6 +28,7 @@ class PsycopgAsyncConnWrapper:
 
     async def __aenter__(self) -> psycopg.AsyncConnection[typing.Any]:
         self.awaited = await self.conn
+        formats.configure_psycopg_json(self.awaited)
         return await self.awaited.__aenter__()
 
     async def __aexit__(self, *args: typing.Any) -> None:
@@ -38,6 +42,7 @@ class PsycopgAsyncConnWrapper:
         async def closure() -> psycopg.AsyncConnection[typing.Any]:
             if not hasattr(self, 'awaited'):
                 self.awaited = await self.conn
+                formats.configure_psycopg_json(self.awaited)
             return self.awaited
 
         return closure().__await__()
@@ -46,6 +51,19 @@ class PsycopgAsyncConnWrapper:
 class PsycopgDriver(dbapi_driver.DbapiDriver):
     name = 'psycopg'
 
+    # use server-side prepared statements for parameterized queries
+    # (disable when connecting through transaction-pooling pgbouncer)
+    prepare_statements = True
+
+    @classmethod
+    def _get_execute_kwargs(
+        cls, parameters: spec.ExecuteParams | None
+    ) -> typing.Mapping[str, typing.Any]:
+        if cls.prepare_statements and parameters is not None:
+            return {'prepare': True}
+        else:
+            return {}
+
     @classmethod
     def get_psycopg_conn_str(cls, target: str | spec.DBConfig) -> str:
         if isinstance(target, str):
@@ -79,12 +97,14 @@ class PsycopgDriver(dbapi_driver.DbapiDriver):
         connect_str = cls.get_psycopg_conn_str(uri)
         if extra_kwargs is None:
             extra_kwargs = {}
-        return psycopg.connect(
+        conn = psycopg.connect(
             connect_str,
             autocommit=autocommit,
             connect_timeout=timeout,
             **extra_kwargs,
         )
+        formats.configure_psycopg_json(conn)
+        return conn
 
     @classmethod
     def get_cursor_output_names(
@@ -97,6 +117,36 @@ class PsycopgDriver(dbapi_driver.DbapiDriver):
         else:
             return tuple(item.name for item in description)  # type: ignore
 
+    @classmethod
+    def get_cursor_output_dtypes(
+        cls,
+        cursor: spec.Cursor | spec.AsyncCursor,
+    ) -> spec.OutputDtypes | None:
+        description = cursor.description
+        if description is None:
+            return None
+        else:
+            return [
+                _get_oid_polars_dtype(item.type_code)  # type: ignore
+                for item in description
+            ]
+
+    @classmethod
+    def _set_row_factory(
+        cls,
+        cursor: spec.Cursor | spec.AsyncCursor,
+        output_format: spec.QueryOutputFormat,
+    ) -> bool:
+        import psycopg.rows
+
+        if output_format == 'dict':
+            cursor.row_factory = psycopg.rows.dict_row  # type: ignore
+        elif output_format == 'record':
+            cursor.row_factory = _record_row  # type: ignore
+        else:
+            return False
+        return True
+
     @classmethod
     def async_connect(
         cls,
@@ -127,3 +177,150 @@ class PsycopgDriver(dbapi_driver.DbapiDriver):
 
         return PsycopgAsyncConnWrapper(conn)  # type: ignore
 
+    @classmethod
+    def _select(
+        cls,
+        *,
+        conn: spec.Connection | spec.DBConfig | str,
+        **kwargs: typing.Any,
+    ) -> spec.SelectOutput:
+        if isinstance(conn, psycopg.Connection):
+            formats.configure_psycopg_json(conn)
+        return super()._select(conn=conn, **kwargs)
+
+    @classmethod
+    async def _async_select(
+        cls,
+        *,
+        conn: spec.AsyncConnection | spec.DBConfig | str,
+        **kwargs: typing.Any,
+    ) -> spec.AsyncSelectOutput:
+        if isinstance(conn, psycopg.AsyncConnection):
+            formats.configure_psycopg_json(conn)
+        return await super()._async_select(conn=conn, **kwargs)
+
+    @classmethod
+    def _select_iter(
+        cls,
+        *,
+        sql: str,
+        parameters: spec.ExecuteParams | None = None,
+        conn: spec.Connection | spec.DBConfig | str,
+        batch_size: int,
+        decode_columns: spec.DecodeColumns | None = None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None = None,
+    ) -> typing.Iterator[spec.SelectOutputData]:
+        """stream rows through a named server-side cursor
+
+        server-side cursors must be declared inside a transaction
+        """
+        if not isinstance(conn, psycopg.Connection):
+            raise Exception('not a psycopg conn')
+        formats.configure_psycopg_json(conn)
+
+        with conn.transaction():
+            with conn.cursor(name=_get_cursor_name()) as cursor:
+                cursor.itersize = batch_size
+                try:
+                    cursor.execute(sql, parameters)
+                except Exception as e:
+                    raise spec.convert_exception(e, sql)
+
+                names = cls.get_cursor_output_names(cursor)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if len(rows) == 0:
+                        break
+                    yield cls._format_batch(
+                        rows=rows,
+                        names=names,
+                        decode_columns=decode_columns,
+                        output_format=output_format,
+                        output_dtypes=output_dtypes,
+                    )
+
+    @classmethod
+    async def _async_select_iter(
+        cls,
+        *,
+        sql: str,
+        parameters: spec.ExecuteParams | None = None,
+        conn: spec.AsyncConnection | spec.DBConfig | str,
+        batch_size: int,
+        decode_columns: spec.DecodeColumns | None = None,
+        output_format: spec.QueryOutputFormat,
+        output_dtypes: spec.OutputDtypes | None = None,
+    ) -> typing.AsyncIterator[spec.SelectOutputData]:
+        """stream rows through a named server-side cursor
+
+        server-side cursors must be declared inside a transaction
+        """
+        if not isinstance(conn, psycopg.AsyncConnection):
+            raise Exception('not a psycopg async conn')
+        formats.configure_psycopg_json(conn)
+
+        async with conn.transaction():
+            async with conn.cursor(name=_get_cursor_name()) as cursor:
+                cursor.itersize = batch_size
+                try:
+                    await cursor.execute(sql, parameters)
+                except Exception as e:
+                    raise spec.convert_exception(e, sql)
+
+                names = cls.get_cursor_output_names(cursor)
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if len(rows) == 0:
+                        break
+                    yield cls._format_batch(
+                        rows=rows,
+                        names=names,
+                        decode_columns=decode_columns,
+                        output_format=output_format,
+                        output_dtypes=output_dtypes,
+                    )
+
+
+# polars dtypes of postgres type names, other types are inferred from values
+_polars_dtype_names = {
+    'bool': 'Boolean',
+    'int2': 'Int64',
+    'int4': 'Int64',
+    'int8': 'Int64',
+    'float4': 'Float64',
+    'float8': 'Float64',
+    'text': 'Utf8',
+    'varchar': 'Utf8',
+    'bpchar': 'Utf8',
+    'name': 'Utf8',
+    'bytea': 'Binary',
+    'json': 'Object',
+    'jsonb': 'Object',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_oid_polars_dtype(oid: int) -> typing.Any:
+    import polars as pl
+
+    info = psycopg.postgres.types.get(oid)
+    if info is None or info.name not in _polars_dtype_names:
+        return None
+    return getattr(pl, _polars_dtype_names[info.name])
+
+
+def _get_cursor_name() -> str:
+    return 'toolsql_cursor_' + uuid.uuid4().hex
+
+
+def _record_row(
+    cursor: typing.Any,
+) -> typing.Callable[[typing.Sequence[typing.Any]], typing.Any]:
+    """psycopg row factory of formats.get_record_class() records"""
+    import psycopg.rows
+
+    names = PsycopgDriver.get_cursor_output_names(cursor)
+    if names is None:
+        return psycopg.rows.no_result
+    return formats.get_record_class(names)._make
@@ -4,7 +4,9 @@ import typing
 
 import sqlite3
 
+from toolsql import formats
 from toolsql import spec
+from .. import instrumentation_utils
 from . import dbapi_driver
 
 
@@ -46,6 +48,22 @@ class Sqlite3Driver(dbapi_driver.DbapiDriver):
             raise Exception('not a sqlite3 cursor')
         return tuple(item[0] for item in cursor.description)
 
+    @classmethod
+    def _set_row_factory(
+        cls,
+        cursor: spec.Cursor | spec.AsyncCursor,
+        output_format: spec.QueryOutputFormat,
+    ) -> bool:
+        if not isinstance(cursor, sqlite3.Cursor):
+            raise Exception('not a sqlite3 cursor')
+        row_factory = get_sqlite_row_factory(
+            cls.get_cursor_output_names(cursor), output_format
+        )
+        if row_factory is None:
+            return False
+        cursor.row_factory = row_factory
+        return True
+
     @classmethod
     def executemany(
         cls,
@@ -53,19 +71,32 @@ class Sqlite3Driver(dbapi_driver.DbapiDriver):
         sql: str,
         parameters: spec.ExecuteManyParams,
         conn: spec.Connection,
-    ) -> None:
+    ) -> int:
 
         if not isinstance(conn, sqlite3.dbapi2.Connection):
             raise Exception('not a sqlite conn')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql,
+            driver=cls.name,
+            operation='executemany',
+            parameters=parameters,
+        )
         cursor = conn.cursor()
         try:
             try:
                 cursor.executemany(sql, parameters)
             except Exception as e:
+                if timer is not None:
+                    timer.finish(error=e)
                 raise spec.convert_exception(e, sql)
+            rowcount: int = cursor.rowcount
         finally:
             cursor.close()
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
 
     @classmethod
     def execute(
@@ -74,11 +105,14 @@ class Sqlite3Driver(dbapi_driver.DbapiDriver):
         sql: str,
         parameters: spec.ExecuteParams | None = None,
         conn: spec.Connection,
-    ) -> None:
+    ) -> int:
 
         if not isinstance(conn, sqlite3.dbapi2.Connection):
             raise Exception('not a sqlite conn')
 
+        timer = instrumentation_utils.start_query_timer(
+            sql=sql, driver=cls.name, operation='execute', parameters=parameters
+        )
         cursor = conn.cursor()
         try:
             try:
@@ -87,7 +121,45 @@ class Sqlite3Driver(dbapi_driver.DbapiDriver):
                 else:
                     cursor.execute(sql, parameters)
             except Exception as e:
+                if timer is not None:
+                    timer.finish(error=e)
                 raise spec.convert_exception(e, sql)
+            rowcount: int = cursor.rowcount
         finally:
             cursor.close()
+        if timer is not None:
+            timer.mark('execute')
+            timer.finish()
+        return rowcount
+
+
+
+def get_sqlite_row_factory(
+    names: typing.Sequence[str] | None,
+    output_format: spec.QueryOutputFormat,
+) -> typing.Callable[[sqlite3.Cursor, tuple[typing.Any, ...]], typing.Any] | None:
+    """get sqlite3 row_factory that builds rows of output_format"""
+
+    if names is None:
+        return None
+    elif output_format == 'dict':
+
+        def dict_factory(
+            cursor: sqlite3.Cursor, row: tuple[typing.Any, ...]
+        ) -> dict[str, typing.Any]:
+            return dict(zip(names, row))
+
+        return dict_factory
+
+    elif output_format == 'record':
+        make_record = formats.get_record_class(tuple(names))._make
+
+        def record_factory(
+            cursor: sqlite3.Cursor, row: tuple[typing.Any, ...]
+        ) -> typing.NamedTuple:
+            return make_record(row)
+
+        return record_factory
 
+    else:
+        return None
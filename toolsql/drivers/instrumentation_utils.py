@@ -0,0 +1,328 @@
+"""query instrumentation hooks
+
+hooks are callables that receive a QueryEvent after each query
+- register hooks using add_query_hook()
+- when no hooks are registered, queries skip all timing work
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import re
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from toolsql import spec
+
+    QueryHook = typing.Callable[[spec.QueryEvent], None]
+
+
+_hooks: list[QueryHook] = []
+
+# seconds spent building each statement of the current operation, and the
+# number of its statements not yet executed, see build_timer_scope()
+_build_seconds: contextvars.ContextVar[
+    tuple[float, int] | None
+] = contextvars.ContextVar('_build_seconds', default=None)
+
+
+#
+# # hook registry
+#
+
+
+def add_query_hook(hook: QueryHook) -> None:
+    """add hook to be called with a QueryEvent after each query"""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_query_hook(hook: QueryHook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def clear_query_hooks() -> None:
+    _hooks.clear()
+
+
+def is_instrumentation_enabled() -> bool:
+    return len(_hooks) > 0
+
+
+#
+# # timing
+#
+
+
+def start_build_timer() -> float | None:
+    """start timing statement build, None if instrumentation disabled"""
+    if not _hooks:
+        return None
+    return time.perf_counter()
+
+
+def end_build_timer(start: float | None, n_statements: int = 1) -> None:
+    """split build time evenly among the next n_statements queries"""
+    if start is not None and n_statements > 0:
+        seconds = (time.perf_counter() - start) / n_statements
+        _build_seconds.set((seconds, n_statements))
+
+
+@contextlib.contextmanager
+def build_timer_scope() -> typing.Iterator[None]:
+    """attribute build time only to queries executed within scope
+
+    build time of statements that are not executed, e.g. because there are
+    no rows or because building fails, is discarded at exit
+    """
+    token = _build_seconds.set(None)
+    try:
+        yield
+    finally:
+        _build_seconds.reset(token)
+
+
+def start_query_timer(
+    *,
+    sql: str,
+    driver: str,
+    operation: spec.QueryOperation,
+    parameters: typing.Any = None,
+) -> QueryTimer | None:
+    """start timing a query, None if instrumentation disabled"""
+    if not _hooks:
+        return None
+    return QueryTimer(
+        sql=sql, driver=driver, operation=operation, parameters=parameters
+    )
+
+
+class QueryTimer:
+    """accumulates phase timings of a single query then emits QueryEvent"""
+
+    __slots__ = (
+        'sql',
+        'driver',
+        'operation',
+        'n_parameters',
+        'n_rows',
+        'timings',
+        'start',
+        'last',
+    )
+
+    def __init__(
+        self,
+        *,
+        sql: str,
+        driver: str,
+        operation: spec.QueryOperation,
+        parameters: typing.Any,
+    ) -> None:
+        self.sql = sql
+        self.driver = driver
+        self.operation = operation
+        self.timings: dict[str, float] = {}
+        self.n_rows: int | None = None
+
+        if parameters is None:
+            self.n_parameters = 0
+        elif operation == 'executemany':
+            # parameters are a sequence of rows, do not consume iterators
+            if isinstance(parameters, typing.Sequence):
+                self.n_rows = len(parameters)
+                if len(parameters) > 0:
+                    self.n_parameters = len(parameters) * len(parameters[0])
+                else:
+                    self.n_parameters = 0
+            else:
+                self.n_parameters = 0
+        else:
+            self.n_parameters = len(parameters)
+
+        build = _build_seconds.get()
+        if build is not None:
+            build_seconds, n_statements = build
+            self.timings['build'] = build_seconds
+            if n_statements > 1:
+                _build_seconds.set((build_seconds, n_statements - 1))
+            else:
+                _build_seconds.set(None)
+
+        self.start = self.last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """record time elapsed since previous mark as phase"""
+        now = time.perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0) + now - self.last
+        self.last = now
+
+    def finish(
+        self,
+        *,
+        n_rows: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        end = time.perf_counter()
+        if n_rows is None:
+            n_rows = self.n_rows
+        event: spec.QueryEvent = {
+            'fingerprint': get_sql_fingerprint(self.sql),
+            'sql': self.sql,
+            'operation': self.operation,
+            'driver': self.driver,
+            'n_parameters': self.n_parameters,
+            'n_rows': n_rows,
+            'timings': self.timings,
+            'duration': self.timings.get('build', 0) + end - self.start,
+            'error': None if error is None else repr(error),
+        }
+        for hook in list(_hooks):
+            # failing hooks must not change query results or errors
+            try:
+                hook(event)
+            except Exception:
+                import logging
+
+                logging.getLogger('toolsql').exception(
+                    'query hook failed: %r', hook
+                )
+
+
+#
+# # fingerprints
+#
+
+_string_regex = re.compile(r"'(?:[^']|'')*'")
+_number_regex = re.compile(r'\b\d+(?:\.\d+)?\b')
+_placeholder_regex = re.compile(r'%s|\$\d+|\?')
+_placeholder_group_regex = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_repeated_group_regex = re.compile(r'\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+')
+_fingerprint_whitespace_regex = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=1024)
+def get_sql_fingerprint(sql: str) -> str:
+    """normalize sql so that queries differing only in values are equal
+
+    - literals and placeholders become ?
+    - placeholder lists of any length become (?...)
+    - repeated row groups of multi-row inserts are collapsed
+    """
+    sql = _string_regex.sub('?', sql)
+    sql = _placeholder_regex.sub('?', sql)
+    sql = _number_regex.sub('?', sql)
+    sql = _placeholder_group_regex.sub('(?...)', sql)
+    sql = _repeated_group_regex.sub('(?...), ...', sql)
+    return _fingerprint_whitespace_regex.sub(' ', sql).strip()
+
+
+#
+# # built-in hooks
+#
+
+
+class QueryStatsAggregator:
+    """in-memory hook that aggregates query durations by fingerprint
+
+    use as `toolsql.add_query_hook(aggregator)`, then `aggregator.get_stats()`
+    """
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        import collections
+        import threading
+
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._durations: typing.MutableMapping[
+            str, typing.Deque[float]
+        ] = collections.defaultdict(
+            lambda: collections.deque(maxlen=max_samples)
+        )
+        self._counts: typing.MutableMapping[str, list[int]] = {}
+        self._total_seconds: typing.MutableMapping[str, float] = {}
+
+    def __call__(self, event: spec.QueryEvent) -> None:
+        fingerprint = event['fingerprint']
+        with self._lock:
+            self._durations[fingerprint].append(event['duration'])
+            counts = self._counts.setdefault(fingerprint, [0, 0, 0])
+            counts[0] += 1
+            counts[1] += event['error'] is not None
+            counts[2] += event['n_rows'] or 0
+            self._total_seconds[fingerprint] = (
+                self._total_seconds.get(fingerprint, 0) + event['duration']
+            )
+
+    def get_stats(self) -> typing.Mapping[str, spec.QueryStats]:
+        """get stats of each fingerprint, percentiles use recent samples"""
+        with self._lock:
+            stats: dict[str, spec.QueryStats] = {}
+            for fingerprint, durations in self._durations.items():
+                n_queries, n_errors, n_rows = self._counts[fingerprint]
+                total_seconds = self._total_seconds[fingerprint]
+                ordered = sorted(durations)
+                stats[fingerprint] = {
+                    'n_queries': n_queries,
+                    'n_errors': n_errors,
+                    'n_rows': n_rows,
+                    'total_seconds': total_seconds,
+                    'mean_seconds': total_seconds / n_queries,
+                    'p50_seconds': _get_percentile(ordered, 0.50),
+                    'p99_seconds': _get_percentile(ordered, 0.99),
+                    'max_seconds': ordered[-1],
+                }
+            return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._total_seconds.clear()
+
+
+def _get_percentile(ordered: typing.Sequence[float], q: float) -> float:
+    """nearest-rank percentile of sorted values"""
+    import math
+
+    index = max(math.ceil(q * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class SlowQueryLogger:
+    """hook that logs queries slower than threshold seconds
+
+    logs to the 'toolsql' logger at WARNING level unless logger is given
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        *,
+        logger: typing.Any = None,
+    ) -> None:
+        if logger is None:
+            import logging
+
+            logger = logging.getLogger('toolsql')
+        self.threshold = threshold
+        self.logger = logger
+
+    def __call__(self, event: spec.QueryEvent) -> None:
+        if event['duration'] >= self.threshold:
+            timings = ', '.join(
+                phase + '=' + '{:.6f}'.format(seconds)
+                for phase, seconds in event['timings'].items()
+            )
+            self.logger.warning(
+                'slow query (%.6fs, %s, rows=%s, %s): %s',
+                event['duration'],
+                event['driver'],
+                event['n_rows'],
+                timings,
+                event['fingerprint'],
+            )
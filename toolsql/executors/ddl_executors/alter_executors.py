@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from toolsql import dbs
 from toolsql import drivers
 from toolsql import spec
 from toolsql import statements
@@ -25,6 +26,9 @@ def alter_table_rename(
     driver = drivers.get_driver_class(conn=conn)
     driver.execute(conn=conn, sql=sql)
 
+    dbs.invalidate_schema_cache(old_table)
+    dbs.invalidate_schema_cache(new_table)
+
 
 def alter_table_rename_column(
     table: str | spec.TableSchema,
@@ -47,6 +51,8 @@ def alter_table_rename_column(
     driver = drivers.get_driver_class(conn=conn)
     driver.execute(conn=conn, sql=sql)
 
+    dbs.invalidate_schema_cache(table)
+
 
 def alter_table_add_column(
     *,
@@ -70,6 +76,8 @@ def alter_table_add_column(
     driver = drivers.get_driver_class(conn=conn)
     driver.execute(conn=conn, sql=sql)
 
+    dbs.invalidate_schema_cache(table)
+
 
 def alter_table_drop_column(
     *,
@@ -91,3 +99,5 @@ def alter_table_drop_column(
     driver = drivers.get_driver_class(conn=conn)
     driver.execute(conn=conn, sql=sql)
 
+    dbs.invalidate_schema_cache(table)
+
@@ -21,6 +21,7 @@ def create_table(
         raise Exception('must use confirm=True to modify table')
 
     dialect = drivers.get_conn_dialect(conn)
+    driver = drivers.get_driver_class(conn=conn)
 
     if table_only:
         sql = statements.build_create_table_statement(
@@ -28,7 +29,7 @@ def create_table(
             dialect=dialect,
             if_not_exists=if_not_exists,
         )
-        conn.execute(sql)
+        driver.execute(conn=conn, sql=sql)
     else:
         sqls = statements.build_all_table_schema_create_statements(
             table,
@@ -36,7 +37,9 @@ def create_table(
             if_not_exists=if_not_exists,
         )
         for sql in sqls:
-            conn.execute(sql)
+            driver.execute(conn=conn, sql=sql)
+
+    dbs.invalidate_schema_cache(table)
 
 
 def create_db(
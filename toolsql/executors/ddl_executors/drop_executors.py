@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import typing
 
+from toolsql import dbs
+from toolsql import drivers
 from toolsql import spec
 from toolsql import statements
 
@@ -19,7 +21,10 @@ def drop_table(
         raise Exception('to drop table use confirm=True')
 
     sql = statements.build_drop_table_statement(table, if_exists=if_exists)
-    conn.execute(sql)
+    driver = drivers.get_driver_class(conn=conn)
+    driver.execute(conn=conn, sql=sql)
+
+    dbs.invalidate_schema_cache(table)
 
 
 def drop_tables(
@@ -68,21 +68,51 @@ def get_table_schemas(
 
 
 def get_table_raw_column_types(
-    table: str | spec.TableSchema, conn: spec.Connection | str | spec.DBConfig
+    table: str | spec.TableSchema,
+    conn: spec.Connection | str | spec.DBConfig,
+    *,
+    use_cache: bool = True,
 ) -> typing.Mapping[str, str]:
+
+    # check schema cache
+    if use_cache and dbs.is_schema_cache_enabled():
+        cache_key = dbs.get_schema_cache_key(conn)
+        cached = dbs.get_cached_table_raw_column_types(
+            table, cache_key=cache_key
+        )
+        if cached is not None:
+            return cached
+    else:
+        cache_key = None
+
     dialect = drivers.get_conn_dialect(conn)
     db = dbs.get_db_class(name=dialect)
     result = db.get_table_raw_column_types(table=table, conn=conn)
     if len(result) == 0:
         if not has_table(table=table, conn=conn):  # type: ignore
             raise spec.TableDoesNotExist
+    dbs.set_cached_table_raw_column_types(table, result, cache_key=cache_key)
     return result
 
 
 async def async_get_table_raw_column_types(
     table: str | spec.TableSchema,
     conn: spec.AsyncConnection | str | spec.DBConfig,
+    *,
+    use_cache: bool = True,
 ) -> typing.Mapping[str, str]:
+
+    # check schema cache
+    if use_cache and dbs.is_schema_cache_enabled():
+        cache_key = await dbs.async_get_schema_cache_key(conn)
+        cached = dbs.get_cached_table_raw_column_types(
+            table, cache_key=cache_key
+        )
+        if cached is not None:
+            return cached
+    else:
+        cache_key = None
+
     dialect = drivers.get_conn_dialect(conn)
     db = dbs.get_db_class(name=dialect)
     result = await db.async_get_table_raw_column_types(table=table, conn=conn)
@@ -90,6 +120,7 @@ async def async_get_table_raw_column_types(
         has_table = await async_has_table(table=table, conn=conn)  # type: ignore
         if not has_table:
             raise spec.TableDoesNotExist
+    dbs.set_cached_table_raw_column_types(table, result, cache_key=cache_key)
     return result
 
 
@@ -1,4 +1,9 @@
+from .copy_executors import *
 from .delete_executors import *
 from .insert_executors import *
+from .lazy_select_executors import *
 from .select_executors import *
+from .select_iter_executors import *
+from .select_many_executors import *
+from .select_pages_executors import *
 from .update_executors import *
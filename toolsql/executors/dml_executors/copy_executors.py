@@ -0,0 +1,303 @@
+"""insert rows into postgresql using the COPY protocol
+
+rows are streamed over an existing connection using psycopg's cursor.copy()
+- binary format is used when every column type has a known psycopg adapter
+- ON CONFLICT options stage rows in a temp table, then INSERT ... SELECT
+"""
+
+from __future__ import annotations
+
+import typing
+import uuid
+
+from toolsql import formats
+from toolsql import spec
+from toolsql import statements
+from .. import ddl_executors
+
+if typing.TYPE_CHECKING:
+    import polars as pl
+
+    CopyRows = typing.Union[spec.ExecuteManyParams, pl.DataFrame]
+
+
+def copy_insert(
+    *,
+    row: spec.ExecuteParams | None = None,
+    rows: CopyRows | None = None,
+    table: str | spec.TableSchema,
+    columns: typing.Sequence[str] | None = None,
+    conn: spec.Connection | spec.DBConfig,
+    on_conflict: spec.OnConflictOption | None = None,
+    upsert: bool | None = None,
+    binary: bool | None = None,
+) -> None:
+    """insert rows into postgresql table using COPY
+
+    - rows can be dict rows, tuple rows, or a polars DataFrame
+    - binary: use binary COPY format, None to use it when types are known
+    """
+
+    if isinstance(conn, dict):
+        from toolsql import drivers
+
+        with drivers.connect(conn) as new_conn:
+            return copy_insert(
+                row=row,
+                rows=rows,
+                table=table,
+                columns=columns,
+                conn=new_conn,
+                on_conflict=on_conflict,
+                upsert=upsert,
+                binary=binary,
+            )
+    if not spec.is_psycopg_sync_connection(conn):
+        raise Exception('COPY requires a psycopg connection')
+
+    raw_column_types = ddl_executors.get_table_raw_column_types(
+        table=table, conn=conn
+    )
+    columns, row_iterator = _prepare_copy_rows(
+        row=row,
+        rows=rows,
+        table=table,
+        columns=columns,
+        raw_column_types=raw_column_types,
+    )
+    if row_iterator is None:
+        return
+    copy_types = _get_copy_types(
+        columns=columns,
+        raw_column_types=raw_column_types,
+        conn=conn,
+        binary=binary,
+    )
+    if copy_types is None:
+        row_iterator = _encode_json_cells(row_iterator)
+    else:
+        formats.configure_psycopg_json(conn)
+
+    if on_conflict is None and not upsert:
+        sql = statements.build_copy_statement(
+            table=table, columns=columns, binary=copy_types is not None
+        )
+        with conn.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                if copy_types is not None:
+                    copy.set_types(copy_types)
+                for copy_row in row_iterator:
+                    copy.write_row(copy_row)
+
+    else:
+        staging_table = _get_staging_table_name()
+        staging_statements = statements.build_copy_staging_statements(
+            table=table,
+            staging_table=staging_table,
+            columns=columns,
+            on_conflict=on_conflict,
+            upsert=upsert,
+        )
+        create_sql, insert_sql, drop_sql = staging_statements
+        sql = statements.build_copy_statement(
+            table=staging_table, columns=columns, binary=copy_types is not None
+        )
+        with conn.transaction():
+            with conn.cursor() as cursor:
+                cursor.execute(create_sql)
+                with cursor.copy(sql) as copy:
+                    if copy_types is not None:
+                        copy.set_types(copy_types)
+                    for copy_row in row_iterator:
+                        copy.write_row(copy_row)
+                cursor.execute(insert_sql)
+                cursor.execute(drop_sql)
+
+
+async def async_copy_insert(
+    *,
+    row: spec.ExecuteParams | None = None,
+    rows: CopyRows | None = None,
+    table: str | spec.TableSchema,
+    columns: typing.Sequence[str] | None = None,
+    conn: spec.AsyncConnection,
+    on_conflict: spec.OnConflictOption | None = None,
+    upsert: bool | None = None,
+    binary: bool | None = None,
+) -> None:
+    """insert rows into postgresql table using COPY
+
+    see copy_insert() for description of parameters
+    """
+
+    if not spec.is_psycopg_async_connection(conn):
+        raise Exception('COPY requires a psycopg connection')
+
+    raw_column_types = await ddl_executors.async_get_table_raw_column_types(
+        table=table, conn=conn
+    )
+    columns, row_iterator = _prepare_copy_rows(
+        row=row,
+        rows=rows,
+        table=table,
+        columns=columns,
+        raw_column_types=raw_column_types,
+    )
+    if row_iterator is None:
+        return
+    copy_types = _get_copy_types(
+        columns=columns,
+        raw_column_types=raw_column_types,
+        conn=conn,
+        binary=binary,
+    )
+    if copy_types is None:
+        row_iterator = _encode_json_cells(row_iterator)
+    else:
+        formats.configure_psycopg_json(conn)
+
+    if on_conflict is None and not upsert:
+        sql = statements.build_copy_statement(
+            table=table, columns=columns, binary=copy_types is not None
+        )
+        async with conn.cursor() as cursor:
+            async with cursor.copy(sql) as copy:
+                if copy_types is not None:
+                    copy.set_types(copy_types)
+                for copy_row in row_iterator:
+                    await copy.write_row(copy_row)
+
+    else:
+        staging_table = _get_staging_table_name()
+        staging_statements = statements.build_copy_staging_statements(
+            table=table,
+            staging_table=staging_table,
+            columns=columns,
+            on_conflict=on_conflict,
+            upsert=upsert,
+        )
+        create_sql, insert_sql, drop_sql = staging_statements
+        sql = statements.build_copy_statement(
+            table=staging_table, columns=columns, binary=copy_types is not None
+        )
+        async with conn.transaction():
+            async with conn.cursor() as cursor:
+                await cursor.execute(create_sql)
+                async with cursor.copy(sql) as copy:
+                    if copy_types is not None:
+                        copy.set_types(copy_types)
+                    for copy_row in row_iterator:
+                        await copy.write_row(copy_row)
+                await cursor.execute(insert_sql)
+                await cursor.execute(drop_sql)
+
+
+def _get_staging_table_name() -> str:
+    return 'toolsql_copy_' + uuid.uuid4().hex
+
+
+def _prepare_copy_rows(
+    *,
+    row: spec.ExecuteParams | None,
+    rows: CopyRows | None,
+    table: str | spec.TableSchema,
+    columns: typing.Sequence[str] | None,
+    raw_column_types: typing.Mapping[str, str],
+) -> tuple[
+    typing.Sequence[str], typing.Iterator[typing.Sequence[typing.Any]] | None
+]:
+    """determine columns and create iterator of tuple rows
+
+    returns (columns, row_iterator), row_iterator is None if no rows given
+    """
+
+    if row is not None and rows is not None:
+        raise Exception('cannot specify both row and rows')
+    elif row is not None:
+        rows = [row]
+    elif rows is None:
+        raise Exception('must specify row or rows')
+
+    # polars dataframes
+    if spec.is_polars_dataframe(rows):
+        if columns is None:
+            columns = rows.columns
+        else:
+            rows = rows.select(columns)
+        if len(rows) == 0:
+            return columns, None
+        return columns, rows.iter_rows()
+
+    if len(rows) == 0:
+        return columns or [], None
+
+    # dict rows
+    first_row = rows[0]
+    if isinstance(first_row, dict):
+        if columns is None:
+            columns = list(first_row.keys())
+            for column in columns:
+                if column not in raw_column_types:
+                    raise Exception('not a column of table: ' + str(column))
+        dict_columns = columns
+        tuple_rows: typing.Iterator[typing.Sequence[typing.Any]] = (
+            [row[column] for column in dict_columns]  # type: ignore
+            for row in rows
+        )
+        return columns, tuple_rows
+
+    # tuple rows
+    elif isinstance(first_row, (list, tuple)):
+        if columns is None:
+            if isinstance(table, dict):
+                columns = [column['name'] for column in table['columns']]
+            else:
+                columns = list(raw_column_types.keys())
+        return columns, iter(rows)
+
+    else:
+        raise Exception('invalid row format: ' + str(type(first_row)))
+
+
+def _encode_json_cells(
+    rows: typing.Iterator[typing.Sequence[typing.Any]],
+) -> typing.Iterator[typing.Sequence[typing.Any]]:
+    """encode JSON cells as text for text COPY
+
+    binary COPY instead dumps JSON cells using the connection's json dumps
+    """
+    dumps = formats.get_json_codec()['dumps']
+    for row in rows:
+        if any(isinstance(cell, (dict, list, tuple)) for cell in row):
+            row = [
+                dumps(cell) if isinstance(cell, (dict, list, tuple)) else cell
+                for cell in row
+            ]
+        yield row
+
+
+def _get_copy_types(
+    *,
+    columns: typing.Sequence[str],
+    raw_column_types: typing.Mapping[str, str],
+    conn: typing.Any,
+    binary: bool | None,
+) -> typing.Sequence[str] | None:
+    """get types for binary COPY, or None to use text COPY"""
+
+    if binary is False:
+        return None
+
+    types = []
+    for column in columns:
+        raw_type = raw_column_types.get(column)
+        if raw_type is not None:
+            raw_type = raw_type.lower()
+        if raw_type is None or conn.adapters.types.get(raw_type) is None:
+            if binary:
+                raise Exception(
+                    'binary COPY requires known type for column: ' + column
+                )
+            return None
+        types.append(raw_type)
+    return types
@@ -4,6 +4,7 @@ import typing
 from toolsql import drivers
 from toolsql import spec
 from toolsql import statements
+from . import write_executors
 
 
 def delete(
@@ -19,26 +20,39 @@ def delete(
     where_ilike: typing.Mapping[str, str] | None = None,
     where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
-) -> None:
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
 
     dialect = drivers.get_conn_dialect(conn)
-    sql, parameters = statements.build_delete_statement(
-        dialect=dialect,
-        table=table,
-        where_equals=where_equals,
-        where_gt=where_gt,
-        where_gte=where_gte,
-        where_lt=where_lt,
-        where_lte=where_lte,
-        where_like=where_like,
-        where_ilike=where_ilike,
-        where_in=where_in,
-        where_or=where_or,
-    )
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_delete_statement(
+            dialect=dialect,
+            table=table,
+            where_equals=where_equals,
+            where_gt=where_gt,
+            where_gte=where_gte,
+            where_lt=where_lt,
+            where_lte=where_lte,
+            where_like=where_like,
+            where_ilike=where_ilike,
+            where_in=where_in,
+            where_or=where_or,
+            returning=returning,
+        )
+        drivers.end_build_timer(build_start)
 
-    # execute query
-    driver = drivers.get_driver_class(conn=conn)
-    driver.execute(conn=conn, sql=sql, parameters=parameters)
+        # execute query
+        return write_executors._execute_writes(
+            conn=conn,
+            table=table,
+            statements=[(sql, parameters)],
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
 
 
 async def async_delete(
@@ -54,24 +68,109 @@ async def async_delete(
     where_ilike: typing.Mapping[str, str] | None = None,
     where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
-) -> None:
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
+
+    dialect = drivers.get_conn_dialect(conn)
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_delete_statement(
+            dialect=dialect,
+            table=table,
+            where_equals=where_equals,
+            where_gt=where_gt,
+            where_gte=where_gte,
+            where_lt=where_lt,
+            where_lte=where_lte,
+            where_like=where_like,
+            where_ilike=where_ilike,
+            where_in=where_in,
+            where_or=where_or,
+            returning=returning,
+        )
+        drivers.end_build_timer(build_start)
+
+        # execute query
+        return await write_executors._async_execute_writes(
+            conn=conn,
+            table=table,
+            statements=[(sql, parameters)],
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
+
+
+
+def delete_many(
+    *,
+    conn: spec.Connection,
+    table: str | spec.TableSchema,
+    keys: typing.Iterable[typing.Any],
+    key_columns: str | typing.Sequence[str],
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
+    """delete rows matching each of many keys, returning rows deleted
+
+    - keys are scalars for a single key column, else tuples or dicts
+    - keys are streamed in chunks, each deleted by a single statement
+    - chunk_size: max keys per statement, capped by dialect limits
+    - returning: columns of deleted rows to return in output_format,
+      instead of number of rows deleted
+    """
 
     dialect = drivers.get_conn_dialect(conn)
-    sql, parameters = statements.build_delete_statement(
+    chunks = statements.build_delete_many_statements(
         dialect=dialect,
         table=table,
-        where_equals=where_equals,
-        where_gt=where_gt,
-        where_gte=where_gte,
-        where_lt=where_lt,
-        where_lte=where_lte,
-        where_like=where_like,
-        where_ilike=where_ilike,
-        where_in=where_in,
-        where_or=where_or,
+        keys=keys,
+        key_columns=key_columns,
+        chunk_size=chunk_size,
+        returning=returning,
+    )
+
+    # execute queries
+    return write_executors._execute_writes(
+        conn=conn,
+        table=table,
+        statements=chunks,
+        returning=returning,
+        return_count=returning is None,
+        output_format=output_format,
     )
 
-    # execute query
-    driver = drivers.get_driver_class(conn=conn)
-    await driver.async_execute(conn=conn, sql=sql, parameters=parameters)
 
+async def async_delete_many(
+    *,
+    conn: spec.AsyncConnection,
+    table: str | spec.TableSchema,
+    keys: typing.Iterable[typing.Any],
+    key_columns: str | typing.Sequence[str],
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
+
+    dialect = drivers.get_conn_dialect(conn)
+    chunks = statements.build_delete_many_statements(
+        dialect=dialect,
+        table=table,
+        keys=keys,
+        key_columns=key_columns,
+        chunk_size=chunk_size,
+        returning=returning,
+    )
+
+    # execute queries
+    return await write_executors._async_execute_writes(
+        conn=conn,
+        table=table,
+        statements=chunks,
+        returning=returning,
+        return_count=returning is None,
+        output_format=output_format,
+    )
@@ -8,6 +8,7 @@ if typing.TYPE_CHECKING:
 from toolsql import drivers
 from toolsql import spec
 from toolsql import statements
+from . import write_executors
 
 
 def insert(
@@ -19,13 +20,32 @@ def insert(
     conn: spec.Connection | spec.DBConfig,
     on_conflict: spec.OnConflictOption | None = None,
     upsert: bool | None = None,
+    multirow: bool = False,
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
     _use_postgresql_copy: bool = False,
-) -> None:
+) -> typing.Any:
+    """insert rows into table
+
+    - multirow: pack chunks of rows into each INSERT instead of executemany
+    - chunk_size: max rows per multirow INSERT, capped by dialect limits
+    - returning: columns of inserted rows to return in output_format,
+      implies multirow
+    - return_count: return number of rows inserted
+    """
+
+    write_executors._validate_write_output(returning, return_count)
+    if (returning is not None or return_count) and (
+        _use_postgresql_copy or spec.is_polars_dataframe(rows)
+    ):
+        raise Exception('returning and return_count require DBAPI inserts')
 
     if _use_postgresql_copy:
-        from toolsql.dbs.db_classes import postgresql_db
+        from . import copy_executors
 
-        return postgresql_db.PostgresqlDb._postgresql_copy(
+        return copy_executors.copy_insert(
             row=row,
             rows=rows,
             table=table,
@@ -44,21 +64,52 @@ def insert(
     elif isinstance(conn, dict):
         raise Exception()
 
+    if multirow or returning is not None:
+        dialect = drivers.get_conn_dialect(conn)
+        chunks = statements.build_multirow_insert_statements(
+            row=row,
+            rows=rows,
+            table=table,
+            columns=columns,
+            dialect=dialect,
+            on_conflict=on_conflict,
+            upsert=upsert,
+            chunk_size=chunk_size,
+            returning=returning,
+        )
+        return write_executors._execute_writes(
+            conn=conn,
+            table=table,
+            statements=chunks,
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
+
     # build insert statement
     dialect = drivers.get_conn_dialect(conn)
-    sql, parameters = statements.build_insert_statement(
-        row=row,
-        rows=rows,
-        table=table,
-        columns=columns,
-        dialect=dialect,
-        on_conflict=on_conflict,
-        upsert=upsert,
-    )
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_insert_statement(
+            row=row,
+            rows=rows,
+            table=table,
+            columns=columns,
+            dialect=dialect,
+            on_conflict=on_conflict,
+            upsert=upsert,
+        )
+        drivers.end_build_timer(build_start)
 
-    # execute query
-    driver = drivers.get_driver_class(conn=conn)
-    driver.executemany(conn=conn, sql=sql, parameters=parameters)
+        # execute query
+        driver = drivers.get_driver_class(conn=conn)
+        rowcount = driver.executemany(
+            conn=conn, sql=sql, parameters=parameters
+        )
+        if return_count:
+            return write_executors._sum_rowcounts([rowcount])
+        else:
+            return None
 
 
 def _insert_polars(
@@ -110,21 +161,75 @@ async def async_insert(
     conn: spec.AsyncConnection,
     on_conflict: spec.OnConflictOption | None = None,
     upsert: bool | None = None,
-) -> None:
+    multirow: bool = False,
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+    _use_postgresql_copy: bool = False,
+) -> typing.Any:
+
+    write_executors._validate_write_output(returning, return_count)
+    if (returning is not None or return_count) and _use_postgresql_copy:
+        raise Exception('returning and return_count require DBAPI inserts')
+
+    if _use_postgresql_copy:
+        from . import copy_executors
+
+        return await copy_executors.async_copy_insert(
+            row=row,
+            rows=rows,
+            table=table,
+            columns=columns,
+            conn=conn,
+            on_conflict=on_conflict,
+            upsert=upsert,
+        )
+
+    if multirow or returning is not None:
+        dialect = drivers.get_conn_dialect(conn)
+        chunks = statements.build_multirow_insert_statements(
+            row=row,
+            rows=rows,
+            table=table,
+            columns=columns,
+            dialect=dialect,
+            on_conflict=on_conflict,
+            upsert=upsert,
+            chunk_size=chunk_size,
+            returning=returning,
+        )
+        return await write_executors._async_execute_writes(
+            conn=conn,
+            table=table,
+            statements=chunks,
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
 
     # build insert statement
     dialect = drivers.get_conn_dialect(conn)
-    sql, parameters = statements.build_insert_statement(
-        row=row,
-        rows=rows,
-        table=table,
-        columns=columns,
-        dialect=dialect,
-        on_conflict=on_conflict,
-        upsert=upsert,
-    )
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_insert_statement(
+            row=row,
+            rows=rows,
+            table=table,
+            columns=columns,
+            dialect=dialect,
+            on_conflict=on_conflict,
+            upsert=upsert,
+        )
+        drivers.end_build_timer(build_start)
 
-    # execute query
-    driver = drivers.get_driver_class(conn=conn)
-    await driver.async_executemany(conn=conn, sql=sql, parameters=parameters)
+        # execute query
+        driver = drivers.get_driver_class(conn=conn)
+        rowcount = await driver.async_executemany(
+            conn=conn, sql=sql, parameters=parameters
+        )
+        if return_count:
+            return write_executors._sum_rowcounts([rowcount])
+        else:
+            return None
 
@@ -0,0 +1,336 @@
+"""lazy polars output, which compiles polars operations into the select query
+
+- filter: comparisons of columns to literals, is_in, combined by & and |
+- select: plain column names
+- sort: columns, ascending or descending
+- head / limit: number of rows
+
+operations that cannot be compiled continue as a polars LazyFrame over the
+rows of the query compiled so far
+"""
+
+from __future__ import annotations
+
+import json
+import typing
+
+from toolsql import spec
+
+if typing.TYPE_CHECKING:
+    import polars as pl
+
+
+class LazySelect:
+    """lazy select query that is executed by collect() as polars dataframe
+
+    pushed down sorts place nulls according to the database rather than
+    according to polars, e.g. postgres sorts nulls last in ascending order
+
+    conn must remain open until the query is collected
+    """
+
+    def __init__(self, select_kwargs: typing.Mapping[str, typing.Any]) -> None:
+        self.select_kwargs = dict(select_kwargs)
+
+    def __repr__(self) -> str:
+        kwargs = {
+            key: value
+            for key, value in self.select_kwargs.items()
+            if key != 'conn' and value is not None
+        }
+        return 'LazySelect(' + str(kwargs) + ')'
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith('__') or name == 'select_kwargs':
+            raise AttributeError(name)
+        return getattr(self.lazy(), name)
+
+    def collect(self) -> pl.DataFrame:
+        """execute query and return result as polars dataframe"""
+        from . import select_executors
+
+        return select_executors.select(  # type: ignore
+            output_format='polars', **self.select_kwargs
+        )
+
+    def lazy(self) -> pl.LazyFrame:
+        """execute query and return result as polars LazyFrame"""
+        return self.collect().lazy()
+
+    def filter(self, predicate: pl.Expr) -> LazySelect | pl.LazyFrame:
+        import polars as pl
+
+        if self._is_sliced() or not isinstance(predicate, pl.Expr):
+            return self.lazy().filter(predicate)
+
+        # push down each compilable term of top-level AND
+        group = _get_where_group(self.select_kwargs)
+        complete = True
+        for term in _split_and_terms(_serialize_expr(predicate)):
+            term_group = _compile_predicate(term)
+            merged = None
+            if term_group is not None:
+                merged = _merge_where_groups(group, term_group)
+            if merged is None:
+                complete = False
+            else:
+                group = merged
+
+        pushed = self._replace(**group)
+        if complete:
+            return pushed
+        else:
+            # pushed terms are reapplied, which does not change the result
+            return pushed.lazy().filter(predicate)
+
+    def select(
+        self,
+        exprs: str | pl.Expr | typing.Sequence[str | pl.Expr] | None = None,
+        *more_exprs: str | pl.Expr,
+    ) -> LazySelect | pl.LazyFrame:
+        if exprs is None:
+            items: list[typing.Any] = []
+        elif isinstance(exprs, (list, tuple)):
+            items = list(exprs)
+        else:
+            items = [exprs]
+        items.extend(more_exprs)
+
+        names = []
+        for item in items:
+            name = _get_column_name(item)
+            if name is None:
+                return self.lazy().select(exprs, *more_exprs)
+            names.append(name)
+
+        current = self.select_kwargs.get('columns')
+        if len(names) == 0 or (
+            current is not None
+            and not all(isinstance(column, str) for column in current)
+        ):
+            return self.lazy().select(exprs, *more_exprs)
+        if current is not None and not set(names).issubset(current):
+            return self.lazy().select(exprs, *more_exprs)
+        return self._replace(columns=names)
+
+    def sort(
+        self,
+        by: str | pl.Expr | typing.Sequence[str | pl.Expr],
+        *more_by: str | pl.Expr,
+        descending: bool | typing.Sequence[bool] = False,
+    ) -> LazySelect | pl.LazyFrame:
+        if isinstance(by, (list, tuple)):
+            items: list[typing.Any] = list(by)
+        else:
+            items = [by]
+        items.extend(more_by)
+        if isinstance(descending, bool):
+            descendings: typing.Sequence[bool] = [descending] * len(items)
+        else:
+            descendings = descending
+
+        names = [_get_column_name(item) for item in items]
+        if (
+            self._is_sliced()
+            or len(names) != len(descendings)
+            or any(name is None for name in names)
+        ):
+            return self.lazy().sort(by, *more_by, descending=descending)
+
+        order_by: list[spec.OrderByItem] = [
+            {'column': name, 'desc': desc}  # type: ignore
+            for name, desc in zip(names, descendings)
+        ]
+        return self._replace(order_by=order_by)
+
+    def head(self, n: int = 5) -> LazySelect | pl.LazyFrame:
+        current = self.select_kwargs.get('limit')
+        if isinstance(current, int):
+            n = min(n, current)
+        elif current is not None:
+            return self.lazy().head(n)
+        return self._replace(limit=n)
+
+    def limit(self, n: int = 5) -> LazySelect | pl.LazyFrame:
+        return self.head(n)
+
+    def _is_sliced(self) -> bool:
+        # filters and sorts cannot be pushed below a limit or offset
+        return (
+            self.select_kwargs.get('limit') is not None
+            or self.select_kwargs.get('offset') is not None
+        )
+
+    def _replace(self, **kwargs: typing.Any) -> LazySelect:
+        return LazySelect(dict(self.select_kwargs, **kwargs))
+
+
+#
+# # expression compilation
+#
+
+_comparison_keys = {
+    'Eq': 'where_equals',
+    'Gt': 'where_gt',
+    'GtEq': 'where_gte',
+    'Lt': 'where_lt',
+    'LtEq': 'where_lte',
+}
+
+# comparison when operands are swapped, e.g. 1 < a is a > 1
+_flipped_comparisons = {
+    'Eq': 'Eq',
+    'Gt': 'Lt',
+    'GtEq': 'LtEq',
+    'Lt': 'Gt',
+    'LtEq': 'GtEq',
+}
+
+_literal_types = (
+    'Boolean',
+    'Utf8',
+    'Int8',
+    'Int16',
+    'Int32',
+    'Int64',
+    'UInt8',
+    'UInt16',
+    'UInt32',
+    'UInt64',
+    'Float32',
+    'Float64',
+)
+
+_no_literal = object()
+
+
+def _serialize_expr(expr: pl.Expr) -> typing.Any:
+    """get tree of polars expression, using its pickle serialization"""
+    return json.loads(expr.__getstate__())
+
+
+def _get_column_name(item: typing.Any) -> str | None:
+    import polars as pl
+
+    if isinstance(item, str):
+        return item
+    elif isinstance(item, pl.Expr):
+        if item.meta.is_regex_projection():
+            return None
+        node = _serialize_expr(item)
+        if isinstance(node, dict) and isinstance(node.get('Column'), str):
+            return node['Column']  # type: ignore
+    return None
+
+
+def _get_where_group(
+    select_kwargs: typing.Mapping[str, typing.Any]
+) -> spec.WhereGroup:
+    return {
+        key: value  # type: ignore
+        for key, value in select_kwargs.items()
+        if key.startswith('where_') and value is not None
+    }
+
+
+def _split_and_terms(node: typing.Any) -> list[typing.Any]:
+    if isinstance(node, dict) and 'BinaryExpr' in node:
+        binary = node['BinaryExpr']
+        if binary['op'] == 'And':
+            return _split_and_terms(binary['left']) + _split_and_terms(
+                binary['right']
+            )
+    return [node]
+
+
+def _compile_predicate(node: typing.Any) -> spec.WhereGroup | None:
+    """compile serialized polars predicate to where filters, None if unable"""
+
+    if not isinstance(node, dict):
+        return None
+
+    if 'BinaryExpr' in node:
+        binary = node['BinaryExpr']
+        op = binary['op']
+        if op == 'And':
+            left = _compile_predicate(binary['left'])
+            right = _compile_predicate(binary['right'])
+            if left is None or right is None:
+                return None
+            return _merge_where_groups(left, right)
+        elif op == 'Or':
+            left = _compile_predicate(binary['left'])
+            right = _compile_predicate(binary['right'])
+            if left is None or right is None:
+                return None
+            return {'where_or': _get_or_groups(left) + _get_or_groups(right)}
+        elif op in _comparison_keys:
+            column = _get_column(binary['left'])
+            value = _get_literal(binary['right'])
+            if column is None or value is _no_literal:
+                column = _get_column(binary['right'])
+                value = _get_literal(binary['left'])
+                op = _flipped_comparisons[op]
+            if column is None or value is _no_literal or value is None:
+                return None
+            return {_comparison_keys[op]: {column: value}}  # type: ignore
+
+    elif 'Function' in node:
+        function = node['Function']
+        if function['function'] == {'Boolean': 'IsIn'}:
+            column_node, values_node = function['input']
+            column = _get_column(column_node)
+            series = values_node.get('Literal', {}).get('Series')
+            if column is None or not isinstance(series, dict):
+                return None
+            values = series.get('values')
+            if not isinstance(values, list) or None in values:
+                return None
+            return {'where_in': {column: values}}
+
+    return None
+
+
+def _get_column(node: typing.Any) -> str | None:
+    if isinstance(node, dict) and isinstance(node.get('Column'), str):
+        return node['Column']  # type: ignore
+    else:
+        return None
+
+
+def _get_literal(node: typing.Any) -> typing.Any:
+    if not isinstance(node, dict) or not isinstance(node.get('Literal'), dict):
+        return _no_literal
+    literal = node['Literal']
+    if len(literal) != 1:
+        return _no_literal
+    literal_type, value = next(iter(literal.items()))
+    if literal_type not in _literal_types:
+        return _no_literal
+    return value
+
+
+def _get_or_groups(group: spec.WhereGroup) -> list[spec.WhereGroup]:
+    if list(group.keys()) == ['where_or']:
+        return list(group['where_or'])  # type: ignore
+    else:
+        return [group]
+
+
+def _merge_where_groups(
+    group: spec.WhereGroup, other: spec.WhereGroup
+) -> spec.WhereGroup | None:
+    """combine where filters with AND, None if they constrain same keys"""
+
+    merged: dict[str, typing.Any] = dict(group)
+    for key, value in other.items():
+        current = merged.get(key)
+        if current is None:
+            merged[key] = value
+        elif key == 'where_or':
+            return None
+        elif len(set(current).intersection(value)) > 0:  # type: ignore
+            return None
+        else:
+            merged[key] = dict(current, **value)  # type: ignore
+    return merged  # type: ignore
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import typing
 
+from toolsql import dbs
 from toolsql import drivers
+from toolsql import formats
 from toolsql import spec
 from toolsql import statements
 from .. import ddl_executors
+from . import lazy_select_executors
 
 
 if typing.TYPE_CHECKING:
@@ -92,6 +95,33 @@ def select(
     ...
 
 
+@typing.overload
+def select(
+    *,
+    output_format: Literal['record'],
+    **kwargs: Unpack[spec.SelectKwargs],
+) -> spec.RecordRows:
+    ...
+
+
+@typing.overload
+def select(
+    *,
+    output_format: Literal['numpy'],
+    **kwargs: Unpack[spec.SelectKwargs],
+) -> spec.NumpyColumns:
+    ...
+
+
+@typing.overload
+def select(
+    *,
+    output_format: Literal['polars_lazy'],
+    **kwargs: Unpack[spec.SelectKwargs],
+) -> lazy_select_executors.LazySelect:
+    ...
+
+
 @typing.overload
 def select(
     **kwargs: Unpack[spec.SelectKwargs],
@@ -130,11 +160,61 @@ def select(  # type: ignore
     limit: int | str | None = None,
     offset: int | str | None = None,
     output_dtypes: spec.OutputDtypes | None = None,
+    json_decoding: spec.JsonDecoding = 'python',
+    json_dtypes: typing.Mapping[str, typing.Any] | None = None,
+    partition_on: str | None = None,
+    partition_num: int | None = None,
+    partition_range: tuple[int, int] | None = None,
     verbose: bool | int = False,
 ) -> spec.SelectOutput:
+    """select rows from table
+
+    json_decoding='polars' decodes JSON columns of polars output natively
+    into Struct / List dtypes, json_dtypes maps column names to dtypes
+    (dtypes of other JSON columns are inferred from a sample of rows)
+
+    connectorx reads can be split into partition_num parallel range queries
+    over integer column partition_on, which defaults to the primary key
+    """
 
     if columns is not None and len(columns) == 0:
         raise Exception('empty selection in query')
+    _validate_json_decoding(json_decoding, output_format)
+    if output_format == 'polars_lazy':
+        return lazy_select_executors.LazySelect(
+            {
+                'conn': conn,
+                'table': table,
+                'columns': columns,
+                'distinct': distinct,
+                'where_equals': where_equals,
+                'where_gt': where_gt,
+                'where_gte': where_gte,
+                'where_lt': where_lt,
+                'where_lte': where_lte,
+                'where_like': where_like,
+                'where_ilike': where_ilike,
+                'where_in': where_in,
+                'where_or': where_or,
+                'order_by': order_by,
+                'limit': limit,
+                'offset': offset,
+                'output_dtypes': output_dtypes,
+                'json_decoding': json_decoding,
+                'json_dtypes': json_dtypes,
+                'partition_on': partition_on,
+                'partition_num': partition_num,
+                'partition_range': partition_range,
+                'verbose': verbose,
+            }
+        )
+    if partition_on is not None or partition_num is not None:
+        if limit is not None or offset is not None or order_by is not None:
+            raise Exception(
+                'partitioned reads cannot use order_by, limit, or offset'
+            )
+        if partition_on is None:
+            partition_on = _get_partition_column(table=table, conn=conn)
 
     # gather raw column types for sqlite JSON or connectorx json
     dialect = drivers.get_conn_dialect(conn)
@@ -145,39 +225,51 @@ def select(  # type: ignore
         conn=conn,
         output_format=output_format,
         output_dtypes=output_dtypes,
+        json_decoding=json_decoding,
     )
 
     # create query
-    sql, parameters = statements.build_select_statement(
-        dialect=dialect,
-        table=table,
-        columns=columns,
-        distinct=distinct,
-        where_equals=where_equals,
-        where_gt=where_gt,
-        where_gte=where_gte,
-        where_lt=where_lt,
-        where_lte=where_lte,
-        where_like=where_like,
-        where_ilike=where_ilike,
-        where_in=where_in,
-        where_or=where_or,
-        order_by=order_by,
-        limit=limit,
-        offset=offset,
-    )
-
-    if verbose:
-        print(sql, parameters)
-
-    return raw_select(
-        sql=sql,
-        parameters=parameters,
-        conn=conn,
-        output_format=output_format,
-        decode_columns=decode_columns,
-        output_dtypes=output_dtypes,
-    )
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_select_statement(
+            dialect=dialect,
+            table=table,
+            columns=columns,
+            distinct=distinct,
+            where_equals=where_equals,
+            where_gt=where_gt,
+            where_gte=where_gte,
+            where_lt=where_lt,
+            where_lte=where_lte,
+            where_like=where_like,
+            where_ilike=where_ilike,
+            where_in=where_in,
+            where_or=where_or,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+        )
+        drivers.end_build_timer(build_start)
+
+        if verbose:
+            print(sql, parameters)
+
+        result = raw_select(
+            sql=sql,
+            parameters=parameters,
+            conn=conn,
+            output_format=output_format,
+            decode_columns=decode_columns,
+            output_dtypes=output_dtypes,
+            partition_on=partition_on,
+            partition_num=partition_num,
+            partition_range=partition_range,
+        )
+        if json_decoding == 'polars':
+            result = formats.decode_json_polars(
+                result, decode_columns=decode_columns, dtypes=json_dtypes
+            )
+        return result
 
 
 def _prepare_column_decoding(
@@ -188,6 +280,7 @@ def _prepare_column_decoding(
     columns: spec.ColumnsExpression | None = None,
     output_format: spec.QueryOutputFormat = 'dict',
     output_dtypes: spec.OutputDtypes | None = None,
+    json_decoding: spec.JsonDecoding = 'python',
 ) -> tuple[
     spec.ColumnsExpression | None,
     spec.DecodeColumns | None,
@@ -211,6 +304,7 @@ def _prepare_column_decoding(
         columns=columns,
         output_format=output_format,
         output_dtypes=output_dtypes,
+        json_decoding=json_decoding,
     )
 
 
@@ -222,6 +316,7 @@ def _get_column_decode_types(
     columns: spec.ColumnsExpression | None = None,
     output_format: spec.QueryOutputFormat = 'dict',
     output_dtypes: spec.OutputDtypes | None = None,
+    json_decoding: spec.JsonDecoding = 'python',
 ) -> tuple[
     spec.ColumnsExpression | None,
     spec.DecodeColumns | None,
@@ -229,13 +324,19 @@ def _get_column_decode_types(
 ]:
     if output_format == 'polars' and output_dtypes is not None:
         new_output_dtypes: typing.MutableSequence[
-            pl.datatypes.DataTypeClass | None
+            pl.datatypes.DataTypeClass | str | None
         ] | None = []
     else:
         new_output_dtypes = None
 
     if output_format == 'polars':
         new_output_dtypes = []
+    elif (
+        output_format == 'numpy'
+        and output_dtypes is None
+        and driver_name != 'connectorx'
+    ):
+        new_output_dtypes = []
 
     columns = _normalize_columns(columns, raw_column_types=raw_column_types)
 
@@ -243,7 +344,9 @@ def _get_column_decode_types(
     decode_columns: typing.MutableSequence[spec.DecodeColumn] = []
     if columns is None:
         for c, column_type in enumerate(raw_column_types.values()):
-            if column_type in ('JSON', 'JSONB') and (
+            if column_type in ('JSON', 'JSONB') and json_decoding == 'polars':
+                decode_columns.append('JSON_POLARS')
+            elif column_type in ('JSON', 'JSONB') and (
                 dialect == 'sqlite'
                 or (dialect == 'postgresql' and driver_name == 'connectorx')
             ):
@@ -254,13 +357,16 @@ def _get_column_decode_types(
                 decode_columns.append(None)
 
             if new_output_dtypes is not None:
-                new_output_type = spec.columntype_to_polars_dtype(column_type)
-                new_output_dtypes.append(new_output_type)
+                new_output_dtypes.append(
+                    _get_output_dtype(column_type, output_format)
+                )
 
     else:
         for column_expression in columns:
             column_type = raw_column_types.get(column_expression.get('column'))  # type: ignore
-            if column_type in ('JSON', 'JSONB') and (
+            if column_type in ('JSON', 'JSONB') and json_decoding == 'polars':
+                decode_columns.append('JSON_POLARS')
+            elif column_type in ('JSON', 'JSONB') and (
                 dialect == 'sqlite'
                 or (dialect == 'postgresql' and driver_name == 'connectorx')
             ):
@@ -279,8 +385,9 @@ def _get_column_decode_types(
                 decode_columns.append(None)
 
             if new_output_dtypes is not None:
-                new_output_type = spec.columntype_to_polars_dtype(column_type)  # type: ignore
-                new_output_dtypes.append(new_output_type)
+                new_output_dtypes.append(
+                    _get_output_dtype(column_type, output_format)  # type: ignore
+                )
 
     # cast columns as text
     if dialect == 'postgresql' and driver_name == 'connectorx':
@@ -288,12 +395,97 @@ def _get_column_decode_types(
             if decode_column == 'JSON' and columns[c].get('cast') is None:
                 columns[c]['cast'] = 'TEXT'
 
+    # JSON decoded by polars is fetched as text
+    if 'JSON_POLARS' in decode_columns:
+        for c, decode_column in enumerate(decode_columns):
+            if decode_column == 'JSON_POLARS':
+                if dialect == 'postgresql' and columns[c].get('cast') is None:
+                    columns[c]['cast'] = 'TEXT'
+                if new_output_dtypes is not None:
+                    new_output_dtypes[c] = spec.columntype_to_polars_dtype(
+                        'TEXT'
+                    )
+
     if new_output_dtypes is not None:
         output_dtypes = new_output_dtypes
 
     return columns, decode_columns, output_dtypes
 
 
+def _get_output_dtype(
+    column_type: spec.Columntype | None,
+    output_format: spec.QueryOutputFormat,
+) -> pl.datatypes.DataTypeClass | str | None:
+    if output_format == 'numpy':
+        return spec.columntype_to_numpy_dtype(column_type)
+    else:
+        return spec.columntype_to_polars_dtype(column_type)  # type: ignore
+
+
+def _get_partition_column(
+    *,
+    table: str | spec.TableSchema,
+    conn: spec.Connection | str | spec.DBConfig,
+) -> str:
+    """get integer primary key of table for partitioned connectorx reads"""
+
+    if isinstance(table, dict):
+        return _get_integer_primary_key(table)
+
+    if isinstance(conn, str):
+        db_config = drivers.parse_uri(conn)
+    elif isinstance(conn, dict):
+        db_config = conn
+    else:
+        raise Exception('partitioned reads require connectorx driver')
+
+    # check schema cache before connecting
+    cache_key = dbs.get_schema_cache_key(conn)
+    cached = dbs.get_cached_table_partition_column(table, cache_key=cache_key)
+    if cached is not None:
+        return cached
+
+    # connectorx cannot read schema metadata, use dbapi driver instead
+    if db_config['dbms'] == 'sqlite':
+        db_config = dict(db_config, driver='sqlite3')  # type: ignore
+    elif db_config['dbms'] == 'postgresql':
+        db_config = dict(db_config, driver='psycopg')  # type: ignore
+    else:
+        raise Exception('unknown dbms: ' + str(db_config['dbms']))
+    with drivers.connect(db_config) as schema_conn:
+        table_schema = ddl_executors.get_table_schema(
+            table=table, conn=schema_conn
+        )
+    partition_column = _get_integer_primary_key(table_schema)
+    dbs.set_cached_table_partition_column(
+        table, partition_column, cache_key=cache_key
+    )
+    return partition_column
+
+
+def _get_integer_primary_key(table_schema: spec.TableSchema) -> str:
+    primary = [
+        column for column in table_schema['columns'] if column.get('primary')
+    ]
+    if len(primary) != 1 or primary[0]['type'] not in spec.integer_columntypes:
+        raise Exception(
+            'table needs single integer primary key to choose partition_on'
+        )
+    return primary[0]['name']
+
+
+def _validate_json_decoding(
+    json_decoding: spec.JsonDecoding, output_format: spec.QueryOutputFormat
+) -> None:
+    if json_decoding == 'polars' and output_format not in (
+        'polars',
+        'polars_lazy',
+    ):
+        raise Exception('json_decoding=\'polars\' requires polars output_format')
+    elif json_decoding not in ('python', 'polars'):
+        raise Exception('unknown json_decoding: ' + str(json_decoding))
+
+
 def _normalize_columns(
     columns: spec.ColumnsExpression | None,
     raw_column_types: typing.Mapping[str, str],
@@ -409,6 +601,24 @@ def raw_select(
     ...
 
 
+@typing.overload
+def raw_select(
+    *,
+    output_format: Literal['record'],
+    **kwargs: Unpack[spec.RawSelectKwargs],
+) -> spec.RecordRows:
+    ...
+
+
+@typing.overload
+def raw_select(
+    *,
+    output_format: Literal['numpy'],
+    **kwargs: Unpack[spec.RawSelectKwargs],
+) -> spec.NumpyColumns:
+    ...
+
+
 @typing.overload
 def raw_select(
     **kwargs: Unpack[spec.RawSelectKwargs],
@@ -433,9 +643,30 @@ def raw_select(  # type: ignore
     output_format: spec.QueryOutputFormat = 'dict',
     decode_columns: spec.DecodeColumns | None = None,
     output_dtypes: spec.OutputDtypes | None = None,
+    partition_on: str | None = None,
+    partition_num: int | None = None,
+    partition_range: tuple[int, int] | None = None,
 ) -> spec.SelectOutput:
 
     driver = drivers.get_driver_class(conn=conn)
+
+    if partition_on is not None or partition_num is not None:
+        if driver.name != 'connectorx':
+            raise Exception('partitioned reads require connectorx driver')
+        if partition_on is None:
+            raise Exception('must specify partition_on for raw sql')
+        return driver._select(  # type: ignore
+            sql=sql,
+            conn=conn,
+            parameters=parameters,
+            output_format=output_format,
+            decode_columns=decode_columns,
+            output_dtypes=output_dtypes,
+            partition_on=partition_on,
+            partition_num=partition_num,
+            partition_range=partition_range,
+        )
+
     return driver._select(
         sql=sql,
         conn=conn,
@@ -523,6 +754,24 @@ async def async_select(
     ...
 
 
+@typing.overload
+async def async_select(
+    *,
+    output_format: Literal['record'],
+    **kwargs: Unpack[spec.AsyncSelectKwargs],
+) -> spec.RecordRows:
+    ...
+
+
+@typing.overload
+async def async_select(
+    *,
+    output_format: Literal['numpy'],
+    **kwargs: Unpack[spec.AsyncSelectKwargs],
+) -> spec.NumpyColumns:
+    ...
+
+
 @typing.overload
 async def async_select(
     **kwargs: Unpack[spec.AsyncSelectKwargs],
@@ -561,11 +810,17 @@ async def async_select(  # type: ignore
     limit: int | str | None = None,
     offset: int | str | None = None,
     output_dtypes: spec.OutputDtypes | None = None,
+    json_decoding: spec.JsonDecoding = 'python',
+    json_dtypes: typing.Mapping[str, typing.Any] | None = None,
     verbose: bool | int = False,
 ) -> spec.AsyncSelectOutput:
+    """select rows from table, see select() for description of parameters"""
 
     if columns is not None and len(columns) == 0:
         raise Exception('empty selection in query')
+    _validate_json_decoding(json_decoding, output_format)
+    if output_format == 'polars_lazy':
+        raise Exception('polars_lazy output_format requires sync select()')
 
     dialect = drivers.get_conn_dialect(conn)
     (
@@ -579,37 +834,46 @@ async def async_select(  # type: ignore
         conn=conn,
         output_format=output_format,
         output_dtypes=output_dtypes,
+        json_decoding=json_decoding,
     )
-    sql, parameters = statements.build_select_statement(
-        dialect=dialect,
-        table=table,
-        columns=columns,
-        distinct=distinct,
-        where_equals=where_equals,
-        where_gt=where_gt,
-        where_gte=where_gte,
-        where_lt=where_lt,
-        where_lte=where_lte,
-        where_like=where_like,
-        where_ilike=where_ilike,
-        where_in=where_in,
-        where_or=where_or,
-        order_by=order_by,
-        limit=limit,
-        offset=offset,
-    )
-
-    if verbose:
-        print(sql, parameters)
-
-    return await async_raw_select(
-        sql=sql,
-        parameters=parameters,
-        conn=conn,
-        output_format=output_format,
-        decode_columns=decode_columns,
-        output_dtypes=output_dtypes,
-    )
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_select_statement(
+            dialect=dialect,
+            table=table,
+            columns=columns,
+            distinct=distinct,
+            where_equals=where_equals,
+            where_gt=where_gt,
+            where_gte=where_gte,
+            where_lt=where_lt,
+            where_lte=where_lte,
+            where_like=where_like,
+            where_ilike=where_ilike,
+            where_in=where_in,
+            where_or=where_or,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+        )
+        drivers.end_build_timer(build_start)
+
+        if verbose:
+            print(sql, parameters)
+
+        result = await async_raw_select(
+            sql=sql,
+            parameters=parameters,
+            conn=conn,
+            output_format=output_format,
+            decode_columns=decode_columns,
+            output_dtypes=output_dtypes,
+        )
+        if json_decoding == 'polars':
+            result = formats.decode_json_polars(
+                result, decode_columns=decode_columns, dtypes=json_dtypes
+            )
+        return result
 
 
 async def _async_prepare_column_decoding(
@@ -620,6 +884,7 @@ async def _async_prepare_column_decoding(
     columns: spec.ColumnsExpression | None = None,
     output_format: spec.QueryOutputFormat = 'dict',
     output_dtypes: spec.OutputDtypes | None = None,
+    json_decoding: spec.JsonDecoding = 'python',
 ) -> tuple[
     spec.ColumnsExpression | None,
     spec.DecodeColumns | None,
@@ -644,6 +909,7 @@ async def _async_prepare_column_decoding(
         columns=columns,
         output_format=output_format,
         output_dtypes=output_dtypes,
+        json_decoding=json_decoding,
     )
 
 
@@ -728,6 +994,24 @@ async def async_raw_select(
     ...
 
 
+@typing.overload
+async def async_raw_select(
+    *,
+    output_format: Literal['record'],
+    **kwargs: Unpack[spec.AsyncRawSelectKwargs],
+) -> spec.RecordRows:
+    ...
+
+
+@typing.overload
+async def async_raw_select(
+    *,
+    output_format: Literal['numpy'],
+    **kwargs: Unpack[spec.AsyncRawSelectKwargs],
+) -> spec.NumpyColumns:
+    ...
+
+
 @typing.overload
 async def async_raw_select(
     **kwargs: Unpack[spec.AsyncRawSelectKwargs],
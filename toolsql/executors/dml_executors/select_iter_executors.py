@@ -0,0 +1,240 @@
+"""streaming selects that yield results in batches instead of all at once
+
+- sqlite uses cursor.fetchmany()
+- postgresql uses a named server-side cursor within a transaction
+- JSON and BOOLEAN decoding is applied to each batch
+"""
+
+from __future__ import annotations
+
+import typing
+
+from toolsql import drivers
+from toolsql import spec
+from toolsql import statements
+from . import select_executors
+
+
+_batch_output_formats = ('tuple', 'dict', 'polars', 'pandas', 'arrow')
+
+
+def select_iter(
+    *,
+    conn: spec.Connection | str | spec.DBConfig,
+    output_format: spec.QueryOutputFormat = 'dict',
+    batch_size: int = 10000,
+    #
+    # query parameters
+    table: str | spec.TableSchema,
+    columns: spec.ColumnsExpression | None = None,
+    distinct: bool = False,
+    where_equals: typing.Mapping[str, typing.Any] | None = None,
+    where_gt: typing.Mapping[str, typing.Any] | None = None,
+    where_gte: typing.Mapping[str, typing.Any] | None = None,
+    where_lt: typing.Mapping[str, typing.Any] | None = None,
+    where_lte: typing.Mapping[str, typing.Any] | None = None,
+    where_like: typing.Mapping[str, typing.Any] | None = None,
+    where_ilike: typing.Mapping[str, typing.Any] | None = None,
+    where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
+    where_or: typing.Sequence[spec.WhereGroup] | None = None,
+    order_by: spec.OrderBy | None = None,
+    limit: int | str | None = None,
+    offset: int | str | None = None,
+    output_dtypes: spec.OutputDtypes | None = None,
+    verbose: bool | int = False,
+) -> typing.Iterator[spec.SelectOutputData]:
+    """select rows in batches of up to batch_size rows
+
+    output_format is applied to each batch: tuple, dict, polars, pandas, arrow
+    """
+
+    _validate_batch_parameters(output_format, batch_size)
+    if columns is not None and len(columns) == 0:
+        raise Exception('empty selection in query')
+
+    dialect = drivers.get_conn_dialect(conn)
+    (
+        columns,
+        decode_columns,
+        output_dtypes,
+    ) = select_executors._prepare_column_decoding(
+        dialect=dialect,
+        table=table,
+        columns=columns,
+        conn=conn,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
+    sql, parameters = statements.build_select_statement(
+        dialect=dialect,
+        table=table,
+        columns=columns,
+        distinct=distinct,
+        where_equals=where_equals,
+        where_gt=where_gt,
+        where_gte=where_gte,
+        where_lt=where_lt,
+        where_lte=where_lte,
+        where_like=where_like,
+        where_ilike=where_ilike,
+        where_in=where_in,
+        where_or=where_or,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
+    )
+
+    if verbose:
+        print(sql, parameters)
+
+    return raw_select_iter(
+        sql=sql,
+        parameters=parameters,
+        conn=conn,
+        output_format=output_format,
+        batch_size=batch_size,
+        decode_columns=decode_columns,
+        output_dtypes=output_dtypes,
+    )
+
+
+def raw_select_iter(
+    sql: str,
+    *,
+    parameters: spec.ExecuteParams | None = None,
+    conn: spec.Connection | str | spec.DBConfig,
+    output_format: spec.QueryOutputFormat = 'dict',
+    batch_size: int = 10000,
+    decode_columns: spec.DecodeColumns | None = None,
+    output_dtypes: spec.OutputDtypes | None = None,
+) -> typing.Iterator[spec.SelectOutputData]:
+
+    _validate_batch_parameters(output_format, batch_size)
+    driver = drivers.get_driver_class(conn=conn)
+    return driver._select_iter(
+        sql=sql,
+        parameters=parameters,
+        conn=conn,
+        batch_size=batch_size,
+        output_format=output_format,
+        decode_columns=decode_columns,
+        output_dtypes=output_dtypes,
+    )
+
+
+async def async_select_iter(
+    *,
+    conn: spec.AsyncConnection | str | spec.DBConfig,
+    output_format: spec.QueryOutputFormat = 'dict',
+    batch_size: int = 10000,
+    #
+    # query parameters
+    table: str | spec.TableSchema,
+    columns: spec.ColumnsExpression | None = None,
+    distinct: bool = False,
+    where_equals: typing.Mapping[str, typing.Any] | None = None,
+    where_gt: typing.Mapping[str, typing.Any] | None = None,
+    where_gte: typing.Mapping[str, typing.Any] | None = None,
+    where_lt: typing.Mapping[str, typing.Any] | None = None,
+    where_lte: typing.Mapping[str, typing.Any] | None = None,
+    where_like: typing.Mapping[str, typing.Any] | None = None,
+    where_ilike: typing.Mapping[str, typing.Any] | None = None,
+    where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
+    where_or: typing.Sequence[spec.WhereGroup] | None = None,
+    order_by: spec.OrderBy | None = None,
+    limit: int | str | None = None,
+    offset: int | str | None = None,
+    output_dtypes: spec.OutputDtypes | None = None,
+    verbose: bool | int = False,
+) -> typing.AsyncIterator[spec.SelectOutputData]:
+    """select rows in batches of up to batch_size rows
+
+    use as `async for batch in toolsql.async_select_iter(...):`
+    """
+
+    _validate_batch_parameters(output_format, batch_size)
+    if columns is not None and len(columns) == 0:
+        raise Exception('empty selection in query')
+
+    dialect = drivers.get_conn_dialect(conn)
+    (
+        columns,
+        decode_columns,
+        output_dtypes,
+    ) = await select_executors._async_prepare_column_decoding(
+        dialect=dialect,
+        table=table,
+        columns=columns,
+        conn=conn,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
+    sql, parameters = statements.build_select_statement(
+        dialect=dialect,
+        table=table,
+        columns=columns,
+        distinct=distinct,
+        where_equals=where_equals,
+        where_gt=where_gt,
+        where_gte=where_gte,
+        where_lt=where_lt,
+        where_lte=where_lte,
+        where_like=where_like,
+        where_ilike=where_ilike,
+        where_in=where_in,
+        where_or=where_or,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
+    )
+
+    if verbose:
+        print(sql, parameters)
+
+    async for batch in async_raw_select_iter(
+        sql=sql,
+        parameters=parameters,
+        conn=conn,
+        output_format=output_format,
+        batch_size=batch_size,
+        decode_columns=decode_columns,
+        output_dtypes=output_dtypes,
+    ):
+        yield batch
+
+
+async def async_raw_select_iter(
+    sql: str,
+    *,
+    parameters: spec.ExecuteParams | None = None,
+    conn: spec.AsyncConnection | str | spec.DBConfig,
+    output_format: spec.QueryOutputFormat = 'dict',
+    batch_size: int = 10000,
+    decode_columns: spec.DecodeColumns | None = None,
+    output_dtypes: spec.OutputDtypes | None = None,
+) -> typing.AsyncIterator[spec.SelectOutputData]:
+
+    _validate_batch_parameters(output_format, batch_size)
+    driver = drivers.get_driver_class(conn=conn)
+    async for batch in driver._async_select_iter(
+        sql=sql,
+        parameters=parameters,
+        conn=conn,
+        batch_size=batch_size,
+        output_format=output_format,
+        decode_columns=decode_columns,
+        output_dtypes=output_dtypes,
+    ):
+        yield batch
+
+
+def _validate_batch_parameters(
+    output_format: spec.QueryOutputFormat, batch_size: int
+) -> None:
+    if output_format not in _batch_output_formats:
+        raise Exception(
+            'output_format for batches must be one of '
+            + ', '.join(_batch_output_formats)
+        )
+    if batch_size < 1:
+        raise Exception('batch_size must be positive')
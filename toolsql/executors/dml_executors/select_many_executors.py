@@ -0,0 +1,173 @@
+"""run many independent selects concurrently
+
+- queries are spread across the connections of an async pool
+- schema lookups are shared by queries of the same table
+"""
+
+from __future__ import annotations
+
+import contextlib
+import typing
+
+from toolsql import dbs
+from toolsql import drivers
+from toolsql import spec
+from .. import ddl_executors
+from . import select_executors
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+
+async def async_select_many(
+    queries: typing.Sequence[spec.AsyncSelectManyQuery],
+    conn: drivers.AsyncConnectionPool
+    | spec.AsyncConnection
+    | str
+    | spec.DBConfig,
+    *,
+    max_concurrency: int | None = None,
+    timeout: float | None = None,
+    return_exceptions: bool = False,
+) -> list[typing.Any]:
+    """run async_select() of each query concurrently, results in query order
+
+    - queries are kwargs of async_select() excluding conn
+    - conn is an async pool, a uri / db_config for a temporary pool, or a
+      single async connection, which runs one query at a time
+    - max_concurrency: max queries in flight, defaults to pool max_size
+    - timeout: seconds allowed for each query before raising QueryTimeout
+    - if a query fails, pending queries are cancelled and the error raised,
+      unless return_exceptions=True, which puts errors in the results
+    """
+
+    for query in queries:
+        if 'conn' in query:
+            raise Exception('queries should not specify conn')
+    if max_concurrency is not None and max_concurrency < 1:
+        raise Exception('max_concurrency must be positive')
+    if len(queries) == 0:
+        return []
+
+    if isinstance(conn, drivers.AsyncConnectionPool):
+        if max_concurrency is None:
+            max_concurrency = conn.max_size
+        return await _async_select_many(
+            queries=queries,
+            acquire=_get_pool_acquirer(conn),
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            return_exceptions=return_exceptions,
+        )
+
+    elif isinstance(conn, (str, dict)):
+        if max_concurrency is None:
+            max_concurrency = 10
+        pool = drivers.async_pool(conn, min_size=0, max_size=max_concurrency)
+        async with pool:
+            return await _async_select_many(
+                queries=queries,
+                acquire=_get_pool_acquirer(pool),
+                max_concurrency=max_concurrency,
+                timeout=timeout,
+                return_exceptions=return_exceptions,
+            )
+
+    else:
+        return await _async_select_many(
+            queries=queries,
+            acquire=_get_conn_acquirer(conn),  # type: ignore
+            max_concurrency=1,
+            timeout=timeout,
+            return_exceptions=return_exceptions,
+        )
+
+
+async def _async_select_many(
+    *,
+    queries: typing.Sequence[spec.AsyncSelectManyQuery],
+    acquire: typing.Callable[
+        [], typing.AsyncContextManager[spec.AsyncConnection]
+    ],
+    max_concurrency: int,
+    timeout: float | None,
+    return_exceptions: bool,
+) -> list[typing.Any]:
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    schema_locks: dict[str, asyncio.Lock] = {}
+
+    async def run_query(query: spec.AsyncSelectManyQuery) -> typing.Any:
+        async with semaphore:
+            async with acquire() as conn:
+
+                # first query of each table looks up schema for the others
+                table = query.get('table')
+                if isinstance(table, str):
+                    lock = schema_locks.setdefault(table, asyncio.Lock())
+                    async with lock:
+                        await _async_lookup_schema(table=table, conn=conn)
+
+                try:
+                    return await asyncio.wait_for(
+                        select_executors.async_select(  # type: ignore
+                            conn=conn, **query
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise spec.QueryTimeout(
+                        'query exceeded timeout of ' + str(timeout) + 's'
+                    )
+
+    tasks = [asyncio.ensure_future(run_query(query)) for query in queries]
+    try:
+        results = await asyncio.gather(
+            *tasks, return_exceptions=return_exceptions
+        )
+    finally:
+        # cancel pending queries and wait for connections to be released
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return list(results)
+
+
+async def _async_lookup_schema(
+    *, table: str, conn: spec.AsyncConnection
+) -> None:
+    if not dbs.is_schema_cache_enabled():
+        return
+    try:
+        await ddl_executors.async_get_table_raw_column_types(
+            table=table, conn=conn
+        )
+    except Exception:
+        # errors are raised by the query itself
+        pass
+
+
+def _get_pool_acquirer(
+    pool: drivers.AsyncConnectionPool,
+) -> typing.Callable[[], typing.AsyncContextManager[spec.AsyncConnection]]:
+    def acquire() -> typing.AsyncContextManager[spec.AsyncConnection]:
+        return pool.connection(readonly=True)
+
+    return acquire
+
+
+def _get_conn_acquirer(
+    conn: spec.AsyncConnection,
+) -> typing.Callable[[], typing.AsyncContextManager[spec.AsyncConnection]]:
+    import asyncio
+
+    lock = asyncio.Lock()
+
+    @contextlib.asynccontextmanager
+    async def acquire() -> typing.AsyncIterator[spec.AsyncConnection]:
+        async with lock:
+            yield conn
+
+    return acquire
@@ -0,0 +1,307 @@
+"""keyset pagination, which seeks past the last row of each page
+
+- each page is `WHERE key > last_key ORDER BY key LIMIT page_size`
+- unlike OFFSET, the cost of a page does not grow with its depth
+- order_by must be unique, e.g. a primary key or unique columns
+- composite keys compare columns lexicographically, each ASC or DESC
+"""
+
+from __future__ import annotations
+
+import typing
+
+from toolsql import spec
+from .. import ddl_executors
+from . import select_executors
+
+
+_page_output_formats = ('tuple', 'dict', 'record', 'polars', 'pandas', 'arrow')
+
+
+def select_pages(
+    *,
+    conn: spec.Connection | str | spec.DBConfig,
+    table: str | spec.TableSchema,
+    order_by: spec.OrderBy,
+    page_size: int = 10000,
+    output_format: spec.QueryOutputFormat = 'dict',
+    #
+    # query parameters
+    columns: spec.ColumnsExpression | None = None,
+    where_equals: typing.Mapping[str, typing.Any] | None = None,
+    where_gt: typing.Mapping[str, typing.Any] | None = None,
+    where_gte: typing.Mapping[str, typing.Any] | None = None,
+    where_lt: typing.Mapping[str, typing.Any] | None = None,
+    where_lte: typing.Mapping[str, typing.Any] | None = None,
+    where_like: typing.Mapping[str, typing.Any] | None = None,
+    where_ilike: typing.Mapping[str, typing.Any] | None = None,
+    where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
+    where_or: typing.Sequence[spec.WhereGroup] | None = None,
+    output_dtypes: spec.OutputDtypes | None = None,
+    verbose: bool | int = False,
+) -> typing.Iterator[spec.SelectOutputData]:
+    """select rows in pages of up to page_size rows using keyset pagination
+
+    order_by columns must uniquely identify rows and be included in columns
+    """
+
+    keys = _get_page_keys(order_by)
+    _validate_page_parameters(output_format, page_size)
+    filters: spec.WhereGroup = {
+        'where_equals': where_equals,
+        'where_gt': where_gt,
+        'where_gte': where_gte,
+        'where_lt': where_lt,
+        'where_lte': where_lte,
+        'where_like': where_like,
+        'where_ilike': where_ilike,
+        'where_in': where_in,
+        'where_or': where_or,
+    }
+
+    names = None
+    last_key = None
+    while True:
+        page = select_executors.select(  # type: ignore
+            conn=conn,
+            table=table,
+            columns=columns,
+            output_format=output_format,
+            order_by=order_by,
+            limit=page_size,
+            output_dtypes=output_dtypes,
+            verbose=verbose,
+            **_get_page_filters(filters, keys, last_key),
+        )
+        n_rows = len(page)
+        if n_rows > 0:
+            yield page
+        if n_rows < page_size:
+            return
+
+        if output_format == 'tuple' and names is None:
+            if columns is None and not isinstance(table, dict):
+                raw_column_types = ddl_executors.get_table_raw_column_types(
+                    table=table, conn=conn
+                )
+                names = list(raw_column_types.keys())
+            else:
+                names = _get_output_names(table=table, columns=columns)
+        last_key = _get_last_key(page, keys, names)
+
+
+async def async_select_pages(
+    *,
+    conn: spec.AsyncConnection | str | spec.DBConfig,
+    table: str | spec.TableSchema,
+    order_by: spec.OrderBy,
+    page_size: int = 10000,
+    output_format: spec.QueryOutputFormat = 'dict',
+    #
+    # query parameters
+    columns: spec.ColumnsExpression | None = None,
+    where_equals: typing.Mapping[str, typing.Any] | None = None,
+    where_gt: typing.Mapping[str, typing.Any] | None = None,
+    where_gte: typing.Mapping[str, typing.Any] | None = None,
+    where_lt: typing.Mapping[str, typing.Any] | None = None,
+    where_lte: typing.Mapping[str, typing.Any] | None = None,
+    where_like: typing.Mapping[str, typing.Any] | None = None,
+    where_ilike: typing.Mapping[str, typing.Any] | None = None,
+    where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
+    where_or: typing.Sequence[spec.WhereGroup] | None = None,
+    output_dtypes: spec.OutputDtypes | None = None,
+    verbose: bool | int = False,
+) -> typing.AsyncIterator[spec.SelectOutputData]:
+    """select rows in pages of up to page_size rows using keyset pagination
+
+    use as `async for page in toolsql.async_select_pages(...):`
+    """
+
+    keys = _get_page_keys(order_by)
+    _validate_page_parameters(output_format, page_size)
+    filters: spec.WhereGroup = {
+        'where_equals': where_equals,
+        'where_gt': where_gt,
+        'where_gte': where_gte,
+        'where_lt': where_lt,
+        'where_lte': where_lte,
+        'where_like': where_like,
+        'where_ilike': where_ilike,
+        'where_in': where_in,
+        'where_or': where_or,
+    }
+
+    names = None
+    last_key = None
+    while True:
+        page = await select_executors.async_select(  # type: ignore
+            conn=conn,
+            table=table,
+            columns=columns,
+            output_format=output_format,
+            order_by=order_by,
+            limit=page_size,
+            output_dtypes=output_dtypes,
+            verbose=verbose,
+            **_get_page_filters(filters, keys, last_key),
+        )
+        n_rows = len(page)
+        if n_rows > 0:
+            yield page
+        if n_rows < page_size:
+            return
+
+        if output_format == 'tuple' and names is None:
+            if columns is None and not isinstance(table, dict):
+                raw_column_types = (
+                    await ddl_executors.async_get_table_raw_column_types(
+                        table=table, conn=conn
+                    )
+                )
+                names = list(raw_column_types.keys())
+            else:
+                names = _get_output_names(table=table, columns=columns)
+        last_key = _get_last_key(page, keys, names)
+
+
+#
+# # helpers
+#
+
+
+def _validate_page_parameters(
+    output_format: spec.QueryOutputFormat, page_size: int
+) -> None:
+    if output_format not in _page_output_formats:
+        raise Exception(
+            'output_format for pages must be one of '
+            + ', '.join(_page_output_formats)
+        )
+    if page_size < 1:
+        raise Exception('page_size must be positive')
+
+
+def _get_page_keys(order_by: spec.OrderBy) -> list[tuple[str, bool]]:
+    """get (column, ascending) of each order_by column"""
+
+    if isinstance(order_by, (str, dict)):
+        items: typing.Sequence[spec.OrderByItem] = [order_by]
+    else:
+        items = order_by  # type: ignore
+    if len(items) == 0:
+        raise Exception('keyset pagination requires order_by columns')
+
+    keys = []
+    for item in items:
+        if isinstance(item, str):
+            keys.append((item, True))
+        elif isinstance(item, dict):
+            asc = item.get('asc')
+            desc = item.get('desc')
+            if asc is None:
+                asc = True if desc is None else not desc
+            keys.append((item['column'], asc))
+        else:
+            raise Exception('unknown order_by format: ' + str(item))
+    return keys
+
+
+def _get_page_filters(
+    filters: spec.WhereGroup,
+    keys: typing.Sequence[tuple[str, bool]],
+    last_key: typing.Sequence[typing.Any] | None,
+) -> spec.WhereGroup:
+    """add filters that select rows after last_key
+
+    (a, b) > (x, y) is expanded as (a > x) OR (a = x AND b > y), so that
+    each column can have its own direction
+    """
+
+    if last_key is None:
+        return filters
+
+    groups: list[spec.WhereGroup] = []
+    for k, (column, asc) in enumerate(keys):
+        group: spec.WhereGroup = {}
+        if k > 0:
+            group['where_equals'] = {
+                previous: value
+                for (previous, _), value in zip(keys[:k], last_key)
+            }
+        if asc:
+            group['where_gt'] = {column: last_key[k]}
+        else:
+            group['where_lt'] = {column: last_key[k]}
+        if filters.get('where_or') is not None:
+            group['where_or'] = filters['where_or']
+        groups.append(group)
+    page_filters: dict[str, typing.Any] = dict(filters, where_or=groups)
+
+    # bound leading key column so that indices can seek to first row
+    if len(keys) > 1:
+        column, asc = keys[0]
+        bound_key = 'where_gte' if asc else 'where_lte'
+        bound: typing.Mapping[str, typing.Any] | None = page_filters[bound_key]
+        if bound is None:
+            page_filters[bound_key] = {column: last_key[0]}
+        elif column not in bound:
+            page_filters[bound_key] = dict(bound, **{column: last_key[0]})
+
+    return page_filters  # type: ignore
+
+
+def _get_output_names(
+    *,
+    table: str | spec.TableSchema,
+    columns: spec.ColumnsExpression | None,
+) -> list[str]:
+    if columns is None:
+        if isinstance(table, dict):
+            return [column['name'] for column in table['columns']]
+        else:
+            raise Exception('table schema required for output names')
+
+    names = []
+    for column in columns:
+        if isinstance(column, str):
+            names.append(column)
+        elif isinstance(column, dict):
+            name = column.get('alias')
+            if name is None:
+                name = column.get('column')
+            if name is None:
+                raise Exception('could not determine name of column')
+            names.append(name)
+        else:
+            raise Exception('unknown column format: ' + str(column))
+    return names
+
+
+def _get_last_key(
+    page: typing.Any,
+    keys: typing.Sequence[tuple[str, bool]],
+    names: typing.Sequence[str] | None,
+) -> tuple[typing.Any, ...]:
+    """get order_by values of last row of page"""
+
+    try:
+        if spec.is_polars_dataframe(page):
+            return tuple(page[column][-1] for column, _ in keys)
+        elif spec.is_pandas_dataframe(page):
+            values = [page[column].iloc[-1] for column, _ in keys]
+            return tuple(
+                value.item() if hasattr(value, 'item') else value
+                for value in values
+            )
+        elif spec.is_arrow_table(page):
+            return tuple(page.column(column)[-1].as_py() for column, _ in keys)
+        elif isinstance(page[-1], dict):
+            return tuple(page[-1][column] for column, _ in keys)
+        elif hasattr(page[-1], '_fields'):
+            return tuple(getattr(page[-1], column) for column, _ in keys)
+        elif names is not None:
+            return tuple(page[-1][names.index(column)] for column, _ in keys)
+        else:
+            raise Exception('could not determine output column names')
+    except (AttributeError, KeyError, ValueError):
+        raise Exception('order_by columns must be included in columns')
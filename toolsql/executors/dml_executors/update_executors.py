@@ -5,6 +5,7 @@ import typing
 from toolsql import drivers
 from toolsql import spec
 from toolsql import statements
+from . import write_executors
 
 
 def update(
@@ -22,28 +23,41 @@ def update(
     where_ilike: typing.Mapping[str, str] | None = None,
     where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
-) -> None:
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
 
     dialect = drivers.get_conn_dialect(conn)
-    sql, parameters = statements.build_update_statement(
-        dialect=dialect,
-        table=table,
-        columns=columns,
-        values=values,
-        where_equals=where_equals,
-        where_gt=where_gt,
-        where_gte=where_gte,
-        where_lt=where_lt,
-        where_lte=where_lte,
-        where_like=where_like,
-        where_ilike=where_ilike,
-        where_in=where_in,
-        where_or=where_or,
-    )
-
-    # execute query
-    driver = drivers.get_driver_class(conn=conn)
-    driver.execute(conn=conn, sql=sql, parameters=parameters)
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_update_statement(
+            dialect=dialect,
+            table=table,
+            columns=columns,
+            values=values,
+            where_equals=where_equals,
+            where_gt=where_gt,
+            where_gte=where_gte,
+            where_lt=where_lt,
+            where_lte=where_lte,
+            where_like=where_like,
+            where_ilike=where_ilike,
+            where_in=where_in,
+            where_or=where_or,
+            returning=returning,
+        )
+        drivers.end_build_timer(build_start)
+
+        # execute query
+        return write_executors._execute_writes(
+            conn=conn,
+            table=table,
+            statements=[(sql, parameters)],
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
 
 
 async def async_update(
@@ -61,26 +75,123 @@ async def async_update(
     where_ilike: typing.Mapping[str, str] | None = None,
     where_in: typing.Mapping[str, typing.Sequence[typing.Any]] | None = None,
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
-) -> None:
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
+
+    dialect = drivers.get_conn_dialect(conn)
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        sql, parameters = statements.build_update_statement(
+            dialect=dialect,
+            table=table,
+            columns=columns,
+            values=values,
+            where_equals=where_equals,
+            where_gt=where_gt,
+            where_gte=where_gte,
+            where_lt=where_lt,
+            where_lte=where_lte,
+            where_like=where_like,
+            where_ilike=where_ilike,
+            where_in=where_in,
+            where_or=where_or,
+            returning=returning,
+        )
+        drivers.end_build_timer(build_start)
+
+        # execute query
+        return await write_executors._async_execute_writes(
+            conn=conn,
+            table=table,
+            statements=[(sql, parameters)],
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
+
+
+
+def update_many(
+    *,
+    conn: spec.Connection,
+    table: str | spec.TableSchema,
+    rows: spec.ExecuteManyParams,
+    key_columns: str | typing.Sequence[str],
+    columns: typing.Sequence[str] | None = None,
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
+    """update many rows with distinct values, matched by key_columns
+
+    - rows are dicts, or tuples whose fields are named by columns
+    - each chunk of rows is sent as a single UPDATE ... FROM (VALUES ...)
+    - chunk_size: max rows per statement, capped by dialect limits
+    - returning: columns of updated rows to return in output_format
+    - return_count: return number of rows updated
+    """
+
+    dialect = drivers.get_conn_dialect(conn)
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        chunks = statements.build_update_many_statements(
+            dialect=dialect,
+            table=table,
+            rows=rows,
+            key_columns=key_columns,
+            columns=columns,
+            chunk_size=chunk_size,
+            returning=returning,
+        )
+        drivers.end_build_timer(build_start, n_statements=len(chunks))
+
+        # execute queries
+        return write_executors._execute_writes(
+            conn=conn,
+            table=table,
+            statements=chunks,
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
+
+
+async def async_update_many(
+    *,
+    conn: spec.AsyncConnection,
+    table: str | spec.TableSchema,
+    rows: spec.ExecuteManyParams,
+    key_columns: str | typing.Sequence[str],
+    columns: typing.Sequence[str] | None = None,
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+    return_count: bool = False,
+    output_format: spec.QueryOutputFormat = 'dict',
+) -> typing.Any:
 
     dialect = drivers.get_conn_dialect(conn)
-    sql, parameters = statements.build_update_statement(
-        dialect=dialect,
-        table=table,
-        columns=columns,
-        values=values,
-        where_equals=where_equals,
-        where_gt=where_gt,
-        where_gte=where_gte,
-        where_lt=where_lt,
-        where_lte=where_lte,
-        where_like=where_like,
-        where_ilike=where_ilike,
-        where_in=where_in,
-        where_or=where_or,
-    )
-
-    # execute query
-    driver = drivers.get_driver_class(conn=conn)
-    await driver.async_execute(conn=conn, sql=sql, parameters=parameters)
+    with drivers.build_timer_scope():
+        build_start = drivers.start_build_timer()
+        chunks = statements.build_update_many_statements(
+            dialect=dialect,
+            table=table,
+            rows=rows,
+            key_columns=key_columns,
+            columns=columns,
+            chunk_size=chunk_size,
+            returning=returning,
+        )
+        drivers.end_build_timer(build_start, n_statements=len(chunks))
 
+        # execute queries
+        return await write_executors._async_execute_writes(
+            conn=conn,
+            table=table,
+            statements=chunks,
+            returning=returning,
+            return_count=return_count,
+            output_format=output_format,
+        )
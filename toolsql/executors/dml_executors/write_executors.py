@@ -0,0 +1,219 @@
+"""shared execution of INSERT, UPDATE, and DELETE statements
+
+- returning: fetch rows of RETURNING clause in any select output_format
+- return_count: sum cursor.rowcount over statements, -1 if unknown
+"""
+
+from __future__ import annotations
+
+import typing
+
+from toolsql import drivers
+from toolsql import formats
+from toolsql import spec
+from . import select_executors
+
+
+def _validate_write_output(
+    returning: spec.Returning | None, return_count: bool
+) -> None:
+    if returning is not None and return_count:
+        raise Exception('cannot specify both returning and return_count')
+
+
+def _execute_writes(
+    *,
+    conn: spec.Connection,
+    table: str | spec.TableSchema,
+    statements: typing.Iterable[tuple[str, spec.ExecuteParams]],
+    returning: spec.Returning | None,
+    return_count: bool,
+    output_format: spec.QueryOutputFormat,
+    output_dtypes: spec.OutputDtypes | None = None,
+) -> typing.Any:
+    _validate_write_output(returning, return_count)
+    driver = drivers.get_driver_class(conn=conn)
+
+    if returning is None:
+        rowcounts = [
+            driver.execute(conn=conn, sql=sql, parameters=parameters)
+            for sql, parameters in statements
+        ]
+        if return_count:
+            return _sum_rowcounts(rowcounts)
+        else:
+            return None
+
+    decode_columns, output_dtypes = _prepare_returning_decoding(
+        conn=conn,
+        table=table,
+        returning=returning,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
+    rows: list[typing.Any] = []
+    names = None
+    for sql, parameters in statements:
+        cursor = driver._select(
+            conn=conn, sql=sql, parameters=parameters, output_format='cursor'
+        )
+        try:
+            rows.extend(cursor.fetchall())  # type: ignore
+            names = driver.get_cursor_output_names(cursor)  # type: ignore
+        finally:
+            cursor.close()  # type: ignore
+    return _format_returning_rows(
+        rows=rows,
+        names=names,
+        returning=returning,
+        decode_columns=decode_columns,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
+
+
+async def _async_execute_writes(
+    *,
+    conn: spec.AsyncConnection,
+    table: str | spec.TableSchema,
+    statements: typing.Iterable[tuple[str, spec.ExecuteParams]],
+    returning: spec.Returning | None,
+    return_count: bool,
+    output_format: spec.QueryOutputFormat,
+    output_dtypes: spec.OutputDtypes | None = None,
+) -> typing.Any:
+    _validate_write_output(returning, return_count)
+    driver = drivers.get_driver_class(conn=conn)
+
+    if returning is None:
+        rowcounts = []
+        for sql, parameters in statements:
+            rowcount = await driver.async_execute(
+                conn=conn, sql=sql, parameters=parameters
+            )
+            rowcounts.append(rowcount)
+        if return_count:
+            return _sum_rowcounts(rowcounts)
+        else:
+            return None
+
+    decode_columns, output_dtypes = await _async_prepare_returning_decoding(
+        conn=conn,
+        table=table,
+        returning=returning,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
+    rows: list[typing.Any] = []
+    names = None
+    for sql, parameters in statements:
+        cursor = await driver._async_select(
+            conn=conn, sql=sql, parameters=parameters, output_format='cursor'
+        )
+        try:
+            rows.extend(await cursor.fetchall())  # type: ignore
+            names = driver.get_cursor_output_names(cursor)  # type: ignore
+        finally:
+            await cursor.close()  # type: ignore
+    return _format_returning_rows(
+        rows=rows,
+        names=names,
+        returning=returning,
+        decode_columns=decode_columns,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
+
+
+#
+# # helpers
+#
+
+
+def _sum_rowcounts(rowcounts: typing.Sequence[int]) -> int:
+    # rowcount is -1 when unknown, e.g. in psycopg pipeline mode
+    if any(rowcount < 0 for rowcount in rowcounts):
+        return -1
+    else:
+        return sum(rowcounts)
+
+
+def _get_returning_columns(returning: spec.Returning) -> list[str] | None:
+    if isinstance(returning, str):
+        returning = [returning]
+    if '*' in returning:
+        return None
+    else:
+        return list(returning)
+
+
+def _prepare_returning_decoding(
+    *,
+    conn: spec.Connection,
+    table: str | spec.TableSchema,
+    returning: spec.Returning,
+    output_format: spec.QueryOutputFormat,
+    output_dtypes: spec.OutputDtypes | None,
+) -> tuple[spec.DecodeColumns | None, spec.OutputDtypes | None]:
+    dialect = drivers.get_conn_dialect(conn)
+    # table metadata queries do not take build time of write statements
+    with drivers.build_timer_scope():
+        (
+            _,
+            decode_columns,
+            output_dtypes,
+        ) = select_executors._prepare_column_decoding(
+            dialect=dialect,
+            table=table,
+            conn=conn,
+            columns=_get_returning_columns(returning),
+            output_format=output_format,
+            output_dtypes=output_dtypes,
+        )
+    return decode_columns, output_dtypes
+
+
+async def _async_prepare_returning_decoding(
+    *,
+    conn: spec.AsyncConnection,
+    table: str | spec.TableSchema,
+    returning: spec.Returning,
+    output_format: spec.QueryOutputFormat,
+    output_dtypes: spec.OutputDtypes | None,
+) -> tuple[spec.DecodeColumns | None, spec.OutputDtypes | None]:
+    dialect = drivers.get_conn_dialect(conn)
+    # table metadata queries do not take build time of write statements
+    with drivers.build_timer_scope():
+        (
+            _,
+            decode_columns,
+            output_dtypes,
+        ) = await select_executors._async_prepare_column_decoding(
+            dialect=dialect,
+            table=table,
+            conn=conn,
+            columns=_get_returning_columns(returning),
+            output_format=output_format,
+            output_dtypes=output_dtypes,
+        )
+    return decode_columns, output_dtypes
+
+
+def _format_returning_rows(
+    *,
+    rows: typing.Sequence[typing.Any],
+    names: typing.Sequence[str] | None,
+    returning: spec.Returning,
+    decode_columns: spec.DecodeColumns | None,
+    output_format: spec.QueryOutputFormat,
+    output_dtypes: spec.OutputDtypes | None,
+) -> spec.SelectOutputData:
+    if names is None:
+        names = _get_returning_columns(returning)
+    rows = formats.decode_columns(rows=rows, columns=decode_columns)
+    return formats.format_row_tuples(
+        rows=rows,
+        names=names,
+        output_format=output_format,
+        output_dtypes=output_dtypes,
+    )
@@ -1,3 +1,5 @@
 from .encoding_format_utils import *
+from .json_codec_utils import *
 from .json_format_utils import *
+from .numpy_format_utils import *
 from .row_format_utils import *
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import typing
 
 if typing.TYPE_CHECKING:
@@ -7,21 +8,25 @@ if typing.TYPE_CHECKING:
 
     import pandas as pd  # type: ignore
     import polars as pl
+    import pyarrow as pa  # type: ignore
 
     R = TypeVar(
         'R',
         typing.Sequence[tuple[typing.Any, ...]],
         pl.DataFrame,
         pd.DataFrame,
+        pa.Table,
     )
 
 from toolsql import spec
+from . import json_codec_utils
 
 
 def decode_columns(
     *,
     rows: R,
     columns: spec.DecodeColumns | None = None,
+    codec: str | None = None,
 ) -> R:
 
     if columns is None:
@@ -33,14 +38,14 @@ def decode_columns(
     ] = []
     for column in columns:
         if column == 'JSON':
-            import json
-
-            column_decoders.append(json.loads)
+            loads = json_codec_utils.get_json_codec(codec)['loads']
+            column_decoders.append(loads)
         elif column == 'BOOLEAN':
             column_decoders.append(bool)
         elif column == 'INTEGER':
             column_decoders.append(int)
-        elif column is None:
+        elif column is None or column == 'JSON_POLARS':
+            # JSON_POLARS is decoded after conversion to polars
             column_decoders.append(None)
         else:
             raise Exception('unknown decoding type: ' + str(column))
@@ -67,7 +72,7 @@ def decode_columns(
                 pl_types.append(pl.datatypes.Boolean)
             elif column == 'INTEGER':
                 pl_types.append(pl.datatypes.Int64)
-            elif column is None:
+            elif column is None or column == 'JSON_POLARS':
                 pl_types.append(None)
             else:
                 raise Exception('unknown decoding type: ' + str(column))
@@ -84,6 +89,12 @@ def decode_columns(
             column_decoders=column_decoders,
         )
 
+    elif spec.is_arrow_table(rows):
+        return _decode_columns_arrow(  # type: ignore
+            rows=rows,
+            column_decoders=column_decoders,
+        )
+
     else:
         raise Exception('invalid rows format: ' + str(type(rows)))
 
@@ -94,13 +105,52 @@ def _decode_columns_sequence(
     column_decoders: typing.Sequence[None | typing.Callable[..., typing.Any]],
 ) -> typing.Sequence[tuple[typing.Any, ...]]:
 
-    return [
-        tuple(
-            (decoder(cell) if decoder is not None else cell)
-            for cell, decoder in zip(row, column_decoders)
-        )
-        for row in rows
-    ]
+    transform = _compile_row_transformer(tuple(column_decoders))
+    return transform(rows)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_row_transformer(
+    column_decoders: tuple[None | typing.Callable[..., typing.Any], ...],
+) -> typing.Callable[
+    [typing.Sequence[tuple[typing.Any, ...]]],
+    list[tuple[typing.Any, ...]],
+]:
+    """compile function that decodes rows of a given decode plan
+
+    only columns with decoders are touched, runs of other columns are copied
+    as slices
+    """
+
+    namespace: dict[str, typing.Any] = {}
+    cells = []
+    c = 0
+    while c < len(column_decoders):
+        decoder = column_decoders[c]
+        if decoder is not None:
+            namespace['decode_' + str(c)] = decoder
+            cells.append('decode_' + str(c) + '(row[' + str(c) + '])')
+            c += 1
+            continue
+
+        run_end = c + 1
+        while (
+            run_end < len(column_decoders)
+            and column_decoders[run_end] is None
+        ):
+            run_end += 1
+        if run_end - c == 1:
+            cells.append('row[' + str(c) + ']')
+        else:
+            cells.append('*row[' + str(c) + ':' + str(run_end) + ']')
+        c = run_end
+
+    source = (
+        'def transform(rows):\n'
+        '    return [(' + ', '.join(cells) + ',) for row in rows]\n'
+    )
+    exec(source, namespace)
+    return namespace['transform']  # type: ignore
 
 
 def _decode_columns_polars(
@@ -122,6 +172,9 @@ def _decode_columns_polars(
 
         if len(rows) == 0:
             decoded = pl.Series(name=column_name, dtype=pl_type)
+        elif pl_type in (pl.datatypes.Boolean, pl.datatypes.Int64):
+            # numeric casts stay vectorized
+            decoded = rows[column_name].cast(pl_type)
         # elif rows[column_name].null_count() == 0:
         #     decoded = rows[column_name].apply(decoder, return_dtype=pl_type)
         else:
@@ -152,3 +205,78 @@ def _decode_columns_pandas(
 
     return rows
 
+
+def _decode_columns_arrow(
+    *,
+    rows: pa.Table,
+    column_decoders: typing.Sequence[None | typing.Callable[..., typing.Any]],
+) -> pa.Table:
+
+    import pyarrow as pa
+
+    for c, decoder in enumerate(column_decoders):
+        if decoder is None:
+            continue
+        decoded = pa.array(
+            [
+                decoder(item) if item not in (None, '') else None
+                for item in rows.column(c).to_pylist()
+            ]
+        )
+        rows = rows.set_column(c, rows.column_names[c], decoded)
+
+    return rows
+
+
+def decode_json_polars(
+    rows: R,
+    *,
+    decode_columns: spec.DecodeColumns | None,
+    dtypes: typing.Mapping[str, typing.Any] | None = None,
+    infer_length: int = 100,
+) -> R:
+    """decode JSON_POLARS text columns into native polars dtypes
+
+    - dtypes maps column names to polars dtypes, e.g. pl.Struct or pl.List
+    - dtypes of other columns are inferred from first infer_length values
+    """
+
+    if decode_columns is None or 'JSON_POLARS' not in decode_columns:
+        return rows
+    if not spec.is_polars_dataframe(rows):
+        raise Exception('native JSON decoding requires polars dataframe')
+
+    import polars as pl
+
+    decoded = []
+    for column_name, decode_column in zip(rows.columns, decode_columns):
+        if decode_column != 'JSON_POLARS':
+            continue
+        column = rows[column_name]
+        if column.dtype != pl.datatypes.Utf8:
+            continue
+
+        # treat empty strings as null
+        column = column.set(column == '', None)  # type: ignore
+
+        if dtypes is not None and column_name in dtypes:
+            dtype = dtypes[column_name]
+        else:
+            sample = column.drop_nulls().head(infer_length)
+            if len(sample) == 0:
+                continue
+            dtype = _json_decode_series(sample, None).dtype
+        decoded.append(_json_decode_series(column, dtype).alias(column_name))
+
+    if len(decoded) == 0:
+        return rows  # type: ignore
+    return rows.with_columns(decoded)  # type: ignore
+
+
+def _json_decode_series(series: pl.Series, dtype: typing.Any) -> pl.Series:
+    # polars renamed json_extract() to json_decode() in 0.19
+    namespace = series.str
+    if hasattr(namespace, 'json_decode'):
+        return namespace.json_decode(dtype)  # type: ignore
+    else:
+        return namespace.json_extract(dtype)
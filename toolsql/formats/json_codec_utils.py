@@ -0,0 +1,140 @@
+"""JSON codecs used for encoding and decoding JSON columns
+
+- 'orjson' and 'msgspec' are used when installed, 'stdlib' is the fallback
+- set_json_codec() configures the codec globally
+- using_json_codec() configures the codec within a context
+- psycopg connections decode JSON with the codec active at each query
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import typing
+import weakref
+
+if typing.TYPE_CHECKING:
+    from toolsql import spec
+
+
+_codecs: dict[str, spec.JsonCodec] = {}
+_global_codec: str = 'auto'
+_context_codec: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    '_context_codec', default=None
+)
+_codec_preference = ['orjson', 'msgspec', 'stdlib']
+
+# codec currently configured on each psycopg connection
+_psycopg_codecs: weakref.WeakKeyDictionary[
+    typing.Any, spec.JsonCodec
+] = weakref.WeakKeyDictionary()
+
+
+def register_json_codec(
+    name: str,
+    *,
+    dumps: typing.Callable[[typing.Any], str],
+    loads: typing.Callable[[str | bytes], typing.Any],
+) -> None:
+    """register JSON codec, dumps should return str"""
+    _codecs[name] = {'name': name, 'dumps': dumps, 'loads': loads}
+
+
+def set_json_codec(name: str) -> None:
+    """set global JSON codec, 'auto' uses fastest installed codec"""
+    if name != 'auto':
+        _load_codec(name)
+    global _global_codec
+    _global_codec = name
+
+
+@contextlib.contextmanager
+def using_json_codec(name: str) -> typing.Iterator[spec.JsonCodec]:
+    """use JSON codec for queries within context"""
+    codec = get_json_codec(name)
+    token = _context_codec.set(name)
+    try:
+        yield codec
+    finally:
+        _context_codec.reset(token)
+
+
+def get_json_codec(name: str | None = None) -> spec.JsonCodec:
+    """get JSON codec by name, or the codec of the current context"""
+    if name is None:
+        name = _context_codec.get()
+        if name is None:
+            name = _global_codec
+    if name == 'auto':
+        for preferred in _codec_preference:
+            try:
+                return _load_codec(preferred)
+            except ImportError:
+                continue
+        raise Exception('no JSON codec available')
+    return _load_codec(name)
+
+
+def get_available_json_codecs() -> list[str]:
+    available = []
+    for name in list(_codecs.keys()) + _codec_preference:
+        if name in available:
+            continue
+        try:
+            _load_codec(name)
+            available.append(name)
+        except ImportError:
+            pass
+    return available
+
+
+def _load_codec(name: str) -> spec.JsonCodec:
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+
+    if name == 'orjson':
+        import orjson
+
+        def orjson_dumps(obj: typing.Any) -> str:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        register_json_codec('orjson', dumps=orjson_dumps, loads=orjson.loads)
+
+    elif name == 'msgspec':
+        import msgspec  # type: ignore
+
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+
+        def msgspec_dumps(obj: typing.Any) -> str:
+            return encoder.encode(obj).decode()  # type: ignore
+
+        register_json_codec('msgspec', dumps=msgspec_dumps, loads=decoder.decode)
+
+    elif name == 'stdlib':
+        import json
+
+        register_json_codec('stdlib', dumps=json.dumps, loads=json.loads)
+
+    else:
+        raise Exception('unknown JSON codec: ' + str(name))
+
+    return _codecs[name]
+
+
+def configure_psycopg_json(conn: typing.Any, codec: str | None = None) -> None:
+    """use JSON codec for JSON / JSONB values of psycopg connection
+
+    called before each query so that the codec of the current context is
+    used, connections already using the codec are left unchanged
+    """
+    json_codec = get_json_codec(codec)
+    if _psycopg_codecs.get(conn) is json_codec:
+        return
+
+    from psycopg.types import json
+
+    json.set_json_dumps(json_codec['dumps'], conn)
+    json.set_json_loads(json_codec['loads'], conn)
+    _psycopg_codecs[conn] = json_codec
@@ -22,14 +22,17 @@ if typing.TYPE_CHECKING:
     )
 
 from toolsql import spec
+from . import json_codec_utils
 
 
 def encode_json_columns(
     *,
     rows: spec.ExecuteManyParams,
     dialect: Literal['sqlite', 'postgresql'],
+    codec: str | None = None,
 ) -> spec.ExecuteManyParams:
 
+    dumps = json_codec_utils.get_json_codec(codec)['dumps']
     new_rows: list[typing.Any] | None = None
     for r, row in enumerate(rows):
         new_row: typing.MutableSequence[typing.Any] | typing.MutableMapping[
@@ -40,7 +43,7 @@ def encode_json_columns(
                 new_row = [
                     cell
                     if not isinstance(cell, (dict, list, tuple))
-                    else encode_json_cell(cell, dialect)
+                    else dumps(cell)
                     for cell in row
                 ]
         elif isinstance(row, dict):
@@ -48,7 +51,7 @@ def encode_json_columns(
                 if isinstance(value, (dict, list, tuple)):
                     if new_row is None:
                         new_row = row.copy()
-                    new_row[key] = encode_json_cell(value, dialect)
+                    new_row[key] = dumps(value)
         else:
             raise Exception('unknown row')
 
@@ -63,15 +66,14 @@ def encode_json_columns(
     return rows
 
 
-def encode_json_cell(item: typing.Any, dialect: spec.Dialect) -> typing.Any:
-    if dialect == 'postgresql':
-        from psycopg.types.json import Jsonb
+def encode_json_cell(
+    item: typing.Any, dialect: spec.Dialect, codec: str | None = None
+) -> typing.Any:
+    """encode JSON cell as text
 
-        return Jsonb(item)
-    elif dialect == 'sqlite':
-        import json
-
-        return json.dumps(item)
+    postgresql casts the text parameter to the JSON / JSONB column type
+    """
+    if dialect in ('postgresql', 'sqlite'):
+        return json_codec_utils.get_json_codec(codec)['dumps'](item)
     else:
         raise Exception('unknown dialect: ' + str(dialect))
-
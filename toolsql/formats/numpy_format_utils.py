@@ -0,0 +1,192 @@
+"""columnar numpy output, a dict of column name to ndarray
+
+- arrays are preallocated and filled batch by batch as rows are fetched
+- capacity doubles when exceeded, arrays are trimmed to length at the end
+- columns with nulls are masked arrays, nulls are masked fill values
+- object columns (text, binary, json, decimal) keep None instead of a mask
+"""
+
+from __future__ import annotations
+
+import typing
+
+from toolsql import spec
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    import polars as pl
+
+
+_fill_values: typing.Mapping[str, typing.Any] = {
+    'int64': 0,
+    'float64': 0.0,
+    'bool': False,
+}
+
+
+class NumpyColumnBuilder:
+    """fill preallocated column arrays from batches of row tuples
+
+    columns whose dtype is None are inferred from their values at finish
+    """
+
+    def __init__(
+        self,
+        *,
+        names: typing.Sequence[str],
+        dtypes: spec.OutputDtypes | None = None,
+        capacity: int = 10000,
+    ) -> None:
+        import numpy as np
+
+        if dtypes is None:
+            dtypes = [None] * len(names)
+        elif len(dtypes) != len(names):
+            raise Exception('number of dtypes does not match number of names')
+        for dtype in dtypes:
+            if dtype is not None and not isinstance(dtype, str):
+                raise Exception('numpy output_dtypes must be dtype names')
+
+        capacity = max(capacity, 1)
+        self.names = list(names)
+        self.dtypes: list[str | None] = list(dtypes)  # type: ignore
+        self.data = [
+            np.empty(capacity, dtype=dtype or 'object')
+            for dtype in self.dtypes
+        ]
+        self.masks: list[npt.NDArray[np.bool_] | None] = [None] * len(names)
+        self.capacity = capacity
+        self.n_rows = 0
+
+    def append(self, rows: typing.Sequence[tuple[typing.Any, ...]]) -> None:
+        n_new = len(rows)
+        if n_new == 0:
+            return
+        start = self.n_rows
+        end = start + n_new
+        if end > self.capacity:
+            self._grow(max(end, 2 * self.capacity))
+
+        for c, values in enumerate(zip(*rows)):
+            data = self.data[c]
+            if data.dtype.kind != 'O' and None in values:
+                self._set_nulls(c, start, end, values)
+                values = tuple(
+                    _fill_values[data.dtype.name] if value is None else value
+                    for value in values
+                )
+            try:
+                data[start:end] = values
+            except (TypeError, ValueError, OverflowError):
+                # values that do not fit column dtype fall back to objects
+                self.data[c] = data = data.astype(object)
+                self.dtypes[c] = 'object'
+                data[start:end] = values
+        self.n_rows = end
+
+    def finish(self) -> spec.NumpyColumns:
+        import numpy as np
+
+        output: spec.NumpyColumns = {}
+        for c, name in enumerate(self.names):
+            data = self.data[c][: self.n_rows]
+            mask = self.masks[c]
+            if mask is not None:
+                mask = mask[: self.n_rows]
+            if self.dtypes[c] is None:
+                data, mask = _infer_numpy_dtype(data)
+            if mask is not None:
+                output[name] = np.ma.MaskedArray(  # type: ignore
+                    data, mask=mask
+                )
+            else:
+                output[name] = data
+        return output
+
+    def _grow(self, capacity: int) -> None:
+        import numpy as np
+
+        for c, data in enumerate(self.data):
+            self.data[c] = np.empty(capacity, dtype=data.dtype)
+            self.data[c][: self.n_rows] = data[: self.n_rows]
+            mask = self.masks[c]
+            if mask is not None:
+                new_mask = np.zeros(capacity, dtype=bool)
+                new_mask[: self.n_rows] = mask[: self.n_rows]
+                self.masks[c] = new_mask
+        self.capacity = capacity
+
+    def _set_nulls(
+        self, c: int, start: int, end: int, values: typing.Sequence[typing.Any]
+    ) -> None:
+        import numpy as np
+
+        mask = self.masks[c]
+        if mask is None:
+            mask = np.zeros(self.capacity, dtype=bool)
+            self.masks[c] = mask
+        mask[start:end] = [value is None for value in values]
+
+
+def _infer_numpy_dtype(
+    data: npt.NDArray[typing.Any],
+) -> tuple[npt.NDArray[typing.Any], npt.NDArray[np.bool_] | None]:
+    """convert object array to numeric dtype if all non-null values are numeric
+
+    nulls are replaced by fill values and returned as a mask
+    """
+    import numpy as np
+
+    values = data.tolist()
+    non_null = [value for value in values if value is not None]
+    if len(non_null) == 0:
+        return data, None
+    for value in non_null:
+        if not isinstance(value, (int, float)):
+            return data, None
+    if len(non_null) == len(values):
+        return np.array(values), None
+
+    inferred = np.array(non_null)
+    fill_value = _fill_values.get(inferred.dtype.name)
+    if fill_value is None:
+        return data, None
+    mask = np.array([value is None for value in values])
+    output = np.full(len(values), fill_value, dtype=inferred.dtype)
+    output[~mask] = inferred
+    return output, mask
+
+
+def rows_to_numpy(
+    rows: typing.Sequence[tuple[typing.Any, ...]],
+    *,
+    names: typing.Sequence[str],
+    output_dtypes: spec.OutputDtypes | None = None,
+) -> spec.NumpyColumns:
+    """convert row tuples to dict of column name to ndarray"""
+
+    builder = NumpyColumnBuilder(
+        names=names, dtypes=output_dtypes, capacity=len(rows)
+    )
+    builder.append(rows)
+    return builder.finish()
+
+
+def dataframe_to_numpy(df: pl.DataFrame) -> spec.NumpyColumns:
+    """convert polars dataframe to dict of column name to ndarray"""
+    import numpy as np
+
+    output: spec.NumpyColumns = {}
+    for series in df.get_columns():
+        if series.null_count() == 0:
+            output[series.name] = series.to_numpy()
+        elif series.is_numeric() or series.is_boolean():
+            data = series.fill_null(False if series.is_boolean() else 0)
+            mask = series.is_null().to_numpy()
+            output[series.name] = np.ma.MaskedArray(  # type: ignore
+                data.to_numpy(), mask=mask
+            )
+        else:
+            output[series.name] = np.array(series.to_list(), dtype=object)
+    return output
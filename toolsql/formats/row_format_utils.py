@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import functools
 import typing
 
 from toolsql import spec
 
 if typing.TYPE_CHECKING:
     import polars as pl
+    import pyarrow as pa  # type: ignore
 
 
 def format_row_tuples(
@@ -70,6 +72,10 @@ def format_row_tuples(
     if output_format == 'dict':
         return [dict(zip(names, row)) for row in rows]
 
+    elif output_format == 'record':
+        make_record = get_record_class(tuple(names))._make
+        return [make_record(row) for row in rows]
+
     elif output_format in ['single_dict', 'single_dict_or_none']:
         if len(rows) > 1:
             raise Exception('too many rows in result')
@@ -81,32 +87,187 @@ def format_row_tuples(
         else:
             return dict(zip(names, rows[0]))
 
+    elif output_format == 'arrow':
+        return rows_to_arrow(rows=rows, names=names)
+
+    elif output_format == 'numpy':
+        from . import numpy_format_utils
+
+        return numpy_format_utils.rows_to_numpy(
+            rows=rows, names=names, output_dtypes=output_dtypes
+        )
+
     elif output_format == 'polars':
         import polars as pl
 
-        if output_dtypes is not None:
-            dtypes = output_dtypes
-        else:
-            test_df = pl.DataFrame(rows[:100], schema=names)
-            dtypes = [
-                dtype if not isinstance(dtype, (pl.List, pl.Struct)) else pl.Object  # type: ignore
-                for dtype in test_df.dtypes
-            ]
-        return pl.DataFrame(
-            [tuple(row) for row in rows],
-            schema=list(zip(names, dtypes)),
-            orient='row',
-        )
+        if output_dtypes is None or pl.Object not in output_dtypes:
+            as_polars = _rows_to_polars_via_arrow(
+                rows=rows, names=names, output_dtypes=output_dtypes
+            )
+            if as_polars is not None:
+                return as_polars
+
+        return rows_to_polars(rows, names=names, output_dtypes=output_dtypes)
 
     elif output_format == 'pandas':
         import pandas as pd  # type: ignore
 
+        table = _rows_to_flat_arrow(rows=rows, names=names)
+        if table is not None:
+            return table.to_pandas()
+
         # better way to convert rows to dataframes?
         return pd.DataFrame([tuple(row) for row in rows], columns=names)
     else:
         raise Exception('unknown output format: ' + str(output_format))
 
 
+@functools.lru_cache(maxsize=256)
+def get_record_class(names: tuple[str, ...]) -> type[typing.NamedTuple]:
+    """get namedtuple class of rows with given column names
+
+    records are tuples whose fields are also accessible as attributes,
+    without the per-row key storage of dicts
+
+    names that are not identifiers, e.g. COUNT(*), are renamed _0, _1, ...
+    """
+    import collections
+
+    return collections.namedtuple('Record', names, rename=True)  # type: ignore
+
+
+def rows_to_polars(
+    rows: typing.Sequence[tuple[typing.Any, ...]],
+    *,
+    names: typing.Sequence[str],
+    output_dtypes: spec.OutputDtypes | None = None,
+) -> pl.DataFrame:
+    """build polars dataframe from series of columns, in one pass over rows
+
+    columns without a dtype are inferred from their values, with nested
+    values kept as objects
+    """
+    import polars as pl
+
+    if len(rows) > 0:
+        columns: typing.Sequence[typing.Sequence[typing.Any]] = list(
+            zip(*rows)
+        )
+    else:
+        columns = [() for name in names]
+    if output_dtypes is None:
+        output_dtypes = [None] * len(names)
+    elif len(output_dtypes) != len(names):
+        raise Exception('number of output_dtypes does not match columns')
+
+    series = []
+    for name, column, dtype in zip(names, columns, output_dtypes):
+        if dtype is None:
+            dtype = _infer_column_dtype(column)
+        elif dtype == pl.Decimal:
+            # decimals are floats, as when converted through arrow
+            dtype = pl.Float64
+        series.append(pl.Series(name, column, dtype=dtype))  # type: ignore
+    return pl.DataFrame(series)
+
+
+def _infer_column_dtype(
+    column: typing.Sequence[typing.Any],
+) -> pl.datatypes.DataTypeClass | None:
+    """get dtype of column values that polars would not infer as arrow does"""
+    import decimal
+    import polars as pl
+
+    for value in column:
+        if value is not None:
+            if isinstance(value, (list, dict)):
+                return pl.Object
+            elif isinstance(value, decimal.Decimal):
+                return pl.Float64
+            else:
+                return None
+    return None
+
+
+def rows_to_arrow(
+    rows: typing.Sequence[tuple[typing.Any, ...]],
+    *,
+    names: typing.Sequence[str],
+) -> pa.Table:
+    """build arrow table column by column, without per-row intermediates"""
+    import pyarrow as pa
+
+    if len(rows) > 0:
+        columns: typing.Sequence[typing.Sequence[typing.Any]] = list(
+            zip(*rows)
+        )
+    else:
+        columns = [[] for name in names]
+    arrays = [pa.array(column) for column in columns]
+    return pa.Table.from_arrays(arrays, names=list(names))
+
+
+def _rows_to_flat_arrow(
+    rows: typing.Sequence[tuple[typing.Any, ...]],
+    *,
+    names: typing.Sequence[str],
+) -> pa.Table | None:
+    """convert rows to arrow, None if pyarrow missing or columns are nested
+
+    nested values are left to row-based paths, which keep them as objects
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    # skip building nested arrays that would be discarded
+    if len(rows) > 0 and any(
+        isinstance(value, (list, dict)) for value in rows[0]
+    ):
+        return None
+
+    try:
+        table = rows_to_arrow(rows=rows, names=names)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    for field in table.schema:
+        if pa.types.is_nested(field.type):
+            return None
+    return table
+
+
+def _rows_to_polars_via_arrow(
+    rows: typing.Sequence[tuple[typing.Any, ...]],
+    *,
+    names: typing.Sequence[str],
+    output_dtypes: spec.OutputDtypes | None,
+) -> pl.DataFrame | None:
+    """convert rows to polars through arrow, None if arrow cannot be used"""
+    import polars as pl
+
+    table = _rows_to_flat_arrow(rows=rows, names=names)
+    if table is None:
+        return None
+
+    df = pl.from_arrow(table)
+    if not isinstance(df, pl.DataFrame):
+        raise Exception('could not convert arrow table to polars')
+    if output_dtypes is not None:
+        casts = []
+        for name, dtype in zip(names, output_dtypes):
+            current = df.schema[name]
+            if dtype is None or current == dtype:
+                continue
+            if dtype == pl.Decimal:
+                # decimals are kept as floats, casting floats truncates them
+                continue
+            casts.append(pl.col(name).cast(dtype))  # type: ignore
+        if len(casts) > 0:
+            df = df.with_columns(casts)
+    return df
+
+
 def format_row_dataframe(
     rows: pl.DataFrame, output_format: spec.QueryOutputFormat
 ) -> spec.SelectOutputData:
@@ -128,9 +289,18 @@ def format_row_dataframe(
             return rows
         else:
             raise Exception('improper format')
+    elif output_format == 'arrow':
+        return rows.to_arrow()
+    elif output_format == 'numpy':
+        from . import numpy_format_utils
+
+        return numpy_format_utils.dataframe_to_numpy(rows)
     elif output_format == 'tuple':
         # return list(zip(*rows.to_dict().values()))
         return rows.rows()
+    elif output_format == 'record':
+        make_record = get_record_class(tuple(rows.columns))._make
+        return [make_record(row) for row in rows.iter_rows()]
     elif output_format == 'dict':
         as_dicts: spec.DictRows = rows.to_dicts()
         return as_dicts
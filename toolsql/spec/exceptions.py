@@ -11,6 +11,14 @@ class TableDoesNotExist(Exception):
     pass
 
 
+class PoolTimeout(Exception):
+    pass
+
+
+class QueryTimeout(Exception):
+    pass
+
+
 def convert_exception(e: Exception, context: typing.Any = None) -> Exception:
     name = type(e).__name__
     module = type(e).__module__
@@ -86,3 +86,23 @@ def columntype_to_polars_dtype(
         else:
             return None
 
+
+
+def columntype_to_numpy_dtype(
+    columntype: typedefs.Columntype | None,
+) -> str | None:
+    """get numpy dtype name of columntype, object if no fixed-width dtype
+
+    None if columntype is unknown, in which case the dtype is inferred
+    """
+
+    if columntype is None:
+        return None
+    elif columntype in integer_columntypes:
+        return 'int64'
+    elif columntype in float_columntypes:
+        return 'float64'
+    elif columntype == 'BOOLEAN':
+        return 'bool'
+    else:
+        return 'object'
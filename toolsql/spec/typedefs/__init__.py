@@ -1,5 +1,6 @@
 from .dataset_types import *
 from .driver_types import *
+from .json_types import *
 from .permission_types import *
 from .schema_types import *
 from .statement_types import *
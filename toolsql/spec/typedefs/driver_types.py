@@ -67,3 +67,36 @@ class DBConfig(TypedDict, total=False):
     # timeout: typing.Union[int, float]
     # pool_timeout: typing.Union[int, float]
 
+
+class PoolStats(TypedDict):
+    n_open: int
+    n_idle: int
+    n_in_use: int
+    has_writer: bool
+
+
+
+QueryOperation = Literal['execute', 'executemany', 'select']
+
+
+class QueryEvent(TypedDict):
+    fingerprint: str
+    sql: str
+    operation: QueryOperation
+    driver: str
+    n_parameters: int
+    n_rows: int | None
+    timings: dict[str, float]  # seconds of build, execute, fetch, decode, format
+    duration: float
+    error: str | None
+
+
+class QueryStats(TypedDict):
+    n_queries: int
+    n_errors: int
+    n_rows: int
+    total_seconds: float
+    mean_seconds: float
+    p50_seconds: float
+    p99_seconds: float
+    max_seconds: float
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import typing
+from typing_extensions import TypedDict
+
+
+class JsonCodec(TypedDict):
+    name: str
+    dumps: typing.Callable[[typing.Any], str]
+    loads: typing.Callable[[typing.Union[str, bytes]], typing.Any]
@@ -6,8 +6,10 @@ from typing_extensions import TypedDict
 from typing_extensions import NotRequired
 
 import aiosqlite
+import numpy.typing as npt
 import pandas as pd  # type: ignore
 import polars as pl
+import pyarrow as pa  # type: ignore
 import psycopg
 import sqlite3
 
@@ -19,8 +21,12 @@ QueryOutputFormat = Literal[
     'cursor',
     'dict',
     'tuple',
+    'record',  # namedtuple rows, fields accessible by index or attribute
     'polars',
+    'polars_lazy',  # toolsql.LazySelect, operations compiled into query
     'pandas',
+    'arrow',
+    'numpy',  # dict of column name to ndarray, masked if column has nulls
     'single_tuple',  # reqiure output is single row, return row as tuple
     'single_tuple_or_none',  # like single_tuple, but None if no results
     'single_dict',  # require output is single row, return row as dict
@@ -40,7 +46,10 @@ AsyncCursor = typing.Union[
     psycopg.AsyncClientCursor,
 ]
 
-OutputDtypes = typing.Sequence[typing.Union[pl.datatypes.DataTypeClass, None]]
+# polars dtypes for polars output, numpy dtype names for numpy output
+OutputDtypes = typing.Sequence[
+    typing.Union[pl.datatypes.DataTypeClass, str, None]
+]
 
 #
 # # output params
@@ -50,8 +59,10 @@ TupleRow = typing.Tuple[typing.Any, ...]
 TupleRows = typing.Sequence[TupleRow]
 DictRow = typing.Dict[str, typing.Any]
 DictRows = typing.Sequence[DictRow]
+RecordRows = typing.Sequence[typing.NamedTuple]
 Cell = typing.Any
 TupleColumn = typing.Tuple[typing.Any, ...]
+NumpyColumns = typing.Dict[str, npt.NDArray[typing.Any]]
 SelectOutputData = typing.Union[
     TupleRow,
     TupleRows,
@@ -61,6 +72,8 @@ SelectOutputData = typing.Union[
     TupleColumn,
     pl.DataFrame,
     pd.DataFrame,
+    pa.Table,
+    NumpyColumns,
     None,
 ]
 SelectOutput = typing.Union[
@@ -73,6 +86,8 @@ SelectOutput = typing.Union[
     TupleColumn,
     pl.DataFrame,
     pd.DataFrame,
+    pa.Table,
+    NumpyColumns,
     None,
 ]
 AsyncSelectOutput = typing.Union[
@@ -85,6 +100,8 @@ AsyncSelectOutput = typing.Union[
     TupleColumn,
     pl.DataFrame,
     pd.DataFrame,
+    pa.Table,
+    NumpyColumns,
     None,
 ]
 
@@ -105,6 +122,9 @@ OrderBy = typing.Union[OrderByItem, typing.Sequence[OrderByItem]]
 
 OnConflictOption = Literal['ignore', 'update']
 
+# columns of RETURNING clause, '*' for all columns
+Returning = typing.Union[str, typing.Sequence[str]]
+
 ExecuteParams = typing.Union[
     typing.Sequence[typing.Any],
     typing.Mapping[str, typing.Any],
@@ -142,6 +162,11 @@ class SelectKwargs(TypedDict, total=False):
     limit: int | str | None
     offset: int | str | None
     output_dtypes: OutputDtypes | None
+    json_decoding: JsonDecoding
+    json_dtypes: typing.Mapping[str, typing.Any] | None
+    partition_on: str | None
+    partition_num: int | None
+    partition_range: tuple[int, int] | None
 
 
 class RawSelectKwargs(TypedDict, total=False):
@@ -150,6 +175,9 @@ class RawSelectKwargs(TypedDict, total=False):
     parameters: ExecuteParams | None
     decode_columns: DecodeColumns | None
     output_dtypes: OutputDtypes | None
+    partition_on: str | None
+    partition_num: int | None
+    partition_range: tuple[int, int] | None
 
 
 class AsyncSelectKwargs(TypedDict, total=False):
@@ -170,6 +198,12 @@ class AsyncSelectKwargs(TypedDict, total=False):
     limit: int | str | None
     offset: int | str | None
     output_dtypes: OutputDtypes | None
+    json_decoding: JsonDecoding
+    json_dtypes: typing.Mapping[str, typing.Any] | None
+
+
+class AsyncSelectManyQuery(AsyncSelectKwargs, total=False):
+    output_format: QueryOutputFormat
 
 
 class AsyncRawSelectKwargs(TypedDict, total=False):
@@ -197,6 +231,7 @@ ColumnExpression = typing.Union[str, ColumnExpressionDict]
 
 ColumnsExpression = typing.Sequence[ColumnExpression]
 
-DecodeColumn = typing.Literal['JSON', 'BOOLEAN', 'INTEGER', None]
+DecodeColumn = typing.Literal['JSON', 'JSON_POLARS', 'BOOLEAN', 'INTEGER', None]
+JsonDecoding = typing.Literal['python', 'polars']
 DecodeColumns = typing.Sequence[DecodeColumn]
 
@@ -13,6 +13,7 @@ if typing.TYPE_CHECKING:
 
     import pandas as pd  # type: ignore
     import polars as pl
+    import pyarrow as pa  # type: ignore
 
     from . import typedefs
 
@@ -68,6 +69,16 @@ def is_polars_dataframe(
     )
 
 
+def is_arrow_table(
+    item: typing.Any,
+) -> TypeGuard[pa.Table]:
+    item_type = type(item)
+    return (
+        item_type.__name__ == 'Table'
+        and item_type.__module__ == 'pyarrow.lib'
+    )
+
+
 #
 # # connections
 #
@@ -1,3 +1,4 @@
+from .copy_statements import *
 from .delete_statements import *
 from .insert_statements import *
 from .select_statements import *
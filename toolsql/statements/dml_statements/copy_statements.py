@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import typing
+
+from toolsql import spec
+from .. import statement_utils
+from . import insert_statements
+
+
+def build_copy_statement(
+    *,
+    table: str | spec.TableSchema,
+    columns: typing.Sequence[str],
+    binary: bool = False,
+) -> str:
+    """build postgresql COPY FROM STDIN statement
+
+    - https://www.postgresql.org/docs/current/sql-copy.html
+    """
+
+    table_name = statement_utils.get_table_name(table)
+    for column in columns:
+        if not statement_utils.is_column_name(column):
+            raise Exception('not a valid column name: ' + str(column))
+
+    sql = 'COPY {table_name} ({columns}) FROM STDIN'.format(
+        table_name=table_name,
+        columns=', '.join(columns),
+    )
+    if binary:
+        sql += ' (FORMAT BINARY)'
+    return sql
+
+
+def build_copy_staging_statements(
+    *,
+    table: str | spec.TableSchema,
+    staging_table: str,
+    columns: typing.Sequence[str],
+    on_conflict: spec.OnConflictOption | None = None,
+    upsert: bool | None = None,
+) -> tuple[str, str, str]:
+    """build statements for COPY into a temp table followed by INSERT SELECT
+
+    allows ON CONFLICT clauses, which COPY does not support directly
+
+    returns (create staging table, insert from staging table, drop staging)
+    """
+
+    table_name = statement_utils.get_table_name(table)
+    if not statement_utils.is_table_name(staging_table):
+        raise Exception('not a valid table name: ' + str(staging_table))
+
+    conflict_expression = insert_statements._create_conflict_expression(
+        on_conflict=on_conflict,
+        upsert=upsert,
+        dialect='postgresql',
+        columns=columns,
+        rows=None,
+        table=table,
+    )
+
+    create_sql = """
+    CREATE TEMP TABLE {staging_table}
+    (LIKE {table_name} INCLUDING DEFAULTS)
+    ON COMMIT DROP
+    """.format(
+        staging_table=staging_table,
+        table_name=table_name,
+    )
+
+    columns_str = ', '.join(columns)
+    insert_sql = """
+    INSERT INTO {table_name} ({columns})
+    SELECT {columns} FROM {staging_table}
+    {conflict_expression}
+    """.format(
+        table_name=table_name,
+        columns=columns_str,
+        staging_table=staging_table,
+        conflict_expression=conflict_expression,
+    )
+
+    drop_sql = 'DROP TABLE {staging_table}'.format(staging_table=staging_table)
+
+    return (
+        statement_utils.statement_to_single_line(create_sql.strip()),
+        statement_utils.statement_to_single_line(insert_sql.strip()),
+        drop_sql,
+    )
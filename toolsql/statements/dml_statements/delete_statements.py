@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import typing
 
 from toolsql import spec
 from .. import statement_utils
+from . import insert_statements
 
 
 def build_delete_statement(
@@ -24,6 +27,7 @@ def build_delete_statement(
     where_ilike: typing.Mapping[str, str] | None = None,
     where_in: typing.Mapping[str, typing.Sequence[str]] | None = None,
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
+    returning: spec.Returning | None = None,
 ) -> tuple[str, spec.ExecuteParams]:
     """
     - sqlite: https://www.sqlite.org/lang_delete.html
@@ -46,14 +50,153 @@ def build_delete_statement(
         table=table,
     )
 
+    returning_clause = statement_utils._get_returning_clause(
+        returning, dialect
+    )
+
+    # reuse sql text of previous queries with same shape
+    cache_key = (
+        'delete',
+        dialect,
+        single_line,
+        table_name,
+        where_clause,
+        returning_clause,
+    )
+    cached = statement_utils.get_cached_statement(cache_key)
+    if cached is not None:
+        return cached, parameters
+
     sql = """
     DELETE FROM
         {table_name}
     {where_clause}
-    """.format(table_name=table_name, where_clause=where_clause)
+    {returning_clause}
+    """.format(
+        table_name=table_name,
+        where_clause=where_clause,
+        returning_clause=returning_clause,
+    )
 
     if single_line:
         sql = statement_utils.statement_to_single_line(sql)
 
+    statement_utils.set_cached_statement(cache_key, sql)
+
     return sql, parameters
 
+
+
+# default number of keys per statement of delete_many()
+_default_delete_chunk_size = 10000
+
+
+def build_delete_many_statements(
+    *,
+    dialect: spec.Dialect,
+    table: str | spec.TableSchema,
+    keys: typing.Iterable[typing.Any],
+    key_columns: str | typing.Sequence[str],
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+) -> typing.Iterator[tuple[str, spec.ExecuteParams]]:
+    """build DELETE statements that each delete a chunk of keys
+
+    - keys are consumed lazily, so they can be a generator
+    - a single key column deletes `WHERE key IN (...)`, with each chunk
+      bound as one array (postgresql) or JSON (sqlite) parameter
+    - composite keys are tuples or dicts, deleted as
+      DELETE FROM t WHERE (...) IN (VALUES (...), (...), ...)
+    - chunk_size is capped so that statements stay within parameter limits
+
+    yields (sql, parameters) pairs, one per chunk
+    """
+
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    if len(key_columns) == 0:
+        raise Exception('must specify at least one key column')
+    for key_column in key_columns:
+        if not statement_utils.is_column_name(key_column):
+            raise Exception('not a valid column name: ' + str(key_column))
+
+    # determine number of keys per statement
+    max_parameters = insert_statements.get_max_parameters(dialect)
+    max_chunk_size = max(1, max_parameters // len(key_columns))
+    if chunk_size is None:
+        chunk_size = min(_default_delete_chunk_size, max_chunk_size)
+    elif chunk_size < 1:
+        raise Exception('chunk_size must be positive')
+    elif chunk_size > max_chunk_size:
+        chunk_size = max_chunk_size
+
+    returning_clause = statement_utils._get_returning_clause(
+        returning, dialect
+    )
+    table_name = statement_utils.get_table_name(table)
+    iterator = iter(keys)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+
+        if len(key_columns) == 1:
+            values = [
+                key[key_columns[0]] if isinstance(key, dict) else key
+                for key in chunk
+            ]
+            yield build_delete_statement(
+                dialect=dialect,
+                table=table,
+                where_in={key_columns[0]: values},
+                returning=returning,
+            )
+        else:
+            parameters: list[typing.Any] = []
+            for key in chunk:
+                if isinstance(key, dict):
+                    parameters.extend(key[column] for column in key_columns)
+                elif isinstance(key, (list, tuple)):
+                    if len(key) != len(key_columns):
+                        raise Exception('keys should match key_columns')
+                    parameters.extend(key)
+                else:
+                    raise Exception('composite keys should be tuples or dicts')
+            sql = _get_delete_many_template(
+                table_name=table_name,
+                key_columns=tuple(key_columns),
+                n_rows=len(chunk),
+                dialect=dialect,
+                returning_clause=returning_clause,
+            )
+            yield sql, parameters
+
+
+@functools.lru_cache(maxsize=256)
+def _get_delete_many_template(
+    *,
+    table_name: str,
+    key_columns: tuple[str, ...],
+    n_rows: int,
+    dialect: spec.Dialect,
+    returning_clause: str = '',
+) -> str:
+
+    values_expression = statement_utils._get_values_expression(
+        table_name=table_name,
+        columns=key_columns,
+        n_rows=n_rows,
+        dialect=dialect,
+    )
+    sql = """
+    DELETE FROM
+        {table_name}
+    WHERE ({key_columns}) IN ({values_expression})
+    {returning_clause}
+    """.format(
+        table_name=table_name,
+        key_columns=', '.join(key_columns),
+        values_expression=values_expression,
+        returning_clause=returning_clause,
+    )
+    return statement_utils.statement_to_single_line(sql)
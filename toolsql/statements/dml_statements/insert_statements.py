@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import typing
 from typing_extensions import Literal
 
@@ -18,6 +19,7 @@ def build_insert_statement(
     single_line: bool = True,
     on_conflict: spec.OnConflictOption | None = None,
     upsert: bool | None = None,
+    returning: spec.Returning | None = None,
 ) -> tuple[str, spec.ExecuteManyParams]:
     """
     - sqlite: https://www.sqlite.org/lang_insert.html
@@ -60,16 +62,22 @@ def build_insert_statement(
         table=table,
     )
 
+    returning_clause = statement_utils._get_returning_clause(
+        returning, dialect
+    )
+
     sql = """
     INSERT INTO {table_name}
     {columns_expression}
     VALUES ({values_expression})
     {conflict_expression}
+    {returning_clause}
     """.format(
         table_name=table_name,
         columns_expression=columns_expression,
         values_expression=values_expression,
         conflict_expression=conflict_expression,
+        returning_clause=returning_clause,
     )
     sql = sql.strip()
 
@@ -79,6 +87,158 @@ def build_insert_statement(
     return sql, rows
 
 
+# maximum number of bound parameters per statement
+_postgresql_max_parameters = 65535
+
+
+def build_multirow_insert_statements(
+    *,
+    row: spec.ExecuteParams | None = None,
+    rows: spec.ExecuteManyParams | None = None,
+    table: str | spec.TableSchema,
+    columns: typing.Sequence[str] | None = None,
+    dialect: Literal['sqlite', 'postgresql'],
+    on_conflict: spec.OnConflictOption | None = None,
+    upsert: bool | None = None,
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+) -> list[tuple[str, list[typing.Any]]]:
+    """build INSERT statements that each insert a chunk of rows
+
+    - each statement has form INSERT INTO t (...) VALUES (...), (...), ...
+    - chunk_size is capped so that statements stay within parameter limits
+    - statement templates are cached by (table, columns, chunk size)
+
+    returns list of (sql, parameters) pairs, one per chunk
+    """
+
+    table_name = statement_utils.get_table_name(table)
+    rows = _prepare_rows_for_insert(row=row, rows=rows, dialect=dialect)
+    if len(rows) == 0:
+        return []
+
+    # determine columns
+    first_row = rows[0]
+    if isinstance(first_row, dict):
+        if columns is None:
+            columns = list(first_row.keys())
+            if isinstance(table, dict):
+                table_columns = {column['name'] for column in table['columns']}
+                columns = [column for column in columns if column in table_columns]
+        n_columns = len(columns)
+    elif isinstance(first_row, (list, tuple)):
+        if columns is None:
+            n_columns = len(first_row)
+        else:
+            n_columns = len(columns)
+    else:
+        raise Exception('invalid row format: ' + str(type(first_row)))
+    if n_columns == 0:
+        raise Exception('must insert at least one column')
+
+    # determine number of rows per statement
+    max_chunk_size = max(1, get_max_parameters(dialect) // n_columns)
+    if chunk_size is None or chunk_size > max_chunk_size:
+        chunk_size = max_chunk_size
+    elif chunk_size < 1:
+        raise Exception('chunk_size must be positive')
+
+    conflict_expression = _create_conflict_expression(
+        on_conflict=on_conflict,
+        upsert=upsert,
+        dialect=dialect,
+        columns=columns,
+        rows=rows,
+        table=table,
+    )
+    returning_clause = statement_utils._get_returning_clause(
+        returning, dialect
+    )
+    if columns is not None:
+        columns = tuple(columns)
+
+    # build statements
+    statements = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start : start + chunk_size]
+        sql = _get_multirow_insert_template(
+            table_name=table_name,
+            columns=columns,
+            n_columns=n_columns,
+            n_rows=len(chunk),
+            dialect=dialect,
+            conflict_expression=conflict_expression,
+            returning_clause=returning_clause,
+        )
+        parameters: list[typing.Any] = []
+        if isinstance(first_row, dict):
+            for chunk_row in chunk:
+                if not isinstance(chunk_row, dict):
+                    raise Exception('all rows should have same format')
+                parameters.extend(chunk_row[column] for column in columns)  # type: ignore
+        else:
+            for chunk_row in chunk:
+                if len(chunk_row) != n_columns:
+                    raise Exception('all rows should have same columns')
+                parameters.extend(chunk_row)
+        statements.append((sql, parameters))
+
+    return statements
+
+
+def get_max_parameters(dialect: spec.Dialect) -> int:
+    """get maximum number of bound parameters allowed in one statement"""
+    if dialect == 'sqlite':
+        import sqlite3
+
+        # SQLITE_MAX_VARIABLE_NUMBER default was raised in 3.32.0
+        if sqlite3.sqlite_version_info >= (3, 32, 0):
+            return 32766
+        else:
+            return 999
+    elif dialect == 'postgresql':
+        return _postgresql_max_parameters
+    else:
+        raise Exception('unknown dialect: ' + str(dialect))
+
+
+@functools.lru_cache(maxsize=256)
+def _get_multirow_insert_template(
+    *,
+    table_name: str,
+    columns: tuple[str, ...] | None,
+    n_columns: int,
+    n_rows: int,
+    dialect: spec.Dialect,
+    conflict_expression: str,
+    returning_clause: str = '',
+) -> str:
+
+    if columns is not None:
+        columns_expression = '(' + ','.join(columns) + ')'
+    else:
+        columns_expression = ''
+
+    placeholder = statement_utils.get_dialect_placeholder(dialect)
+    row_expression = '(' + ', '.join([placeholder] * n_columns) + ')'
+    values_expression = ', '.join([row_expression] * n_rows)
+
+    sql = """
+    INSERT INTO {table_name}
+    {columns_expression}
+    VALUES {values_expression}
+    {conflict_expression}
+    {returning_clause}
+    """.format(
+        table_name=table_name,
+        columns_expression=columns_expression,
+        values_expression=values_expression,
+        conflict_expression=conflict_expression,
+        returning_clause=returning_clause,
+    )
+    return statement_utils.statement_to_single_line(sql.strip())
+
+
 def _prepare_rows_for_insert(
     *,
     row: spec.ExecuteParams | None = None,
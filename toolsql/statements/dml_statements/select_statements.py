@@ -33,12 +33,6 @@ def build_select_statement(
     - postgresql https://www.postgresql.org/docs/current/sql-select.html
     """
 
-    columns_str = statement_utils.build_columns_expression(
-        columns=columns,
-        distinct=distinct,
-        dialect=dialect,
-    )
-
     table_name = statement_utils.get_table_name(table)
 
     where_clause, parameters = statement_utils._where_clause_to_str(
@@ -55,6 +49,29 @@ def build_select_statement(
         table=table,
     )
 
+    # reuse sql text of previous queries with same shape
+    cache_key = (
+        'select',
+        dialect,
+        single_line,
+        table_name,
+        statement_utils.freeze_statement_arg(columns),
+        distinct,
+        where_clause,
+        statement_utils.freeze_statement_arg(order_by),
+        limit,
+        offset,
+    )
+    cached = statement_utils.get_cached_statement(cache_key)
+    if cached is not None:
+        return cached, parameters
+
+    columns_str = statement_utils.build_columns_expression(
+        columns=columns,
+        distinct=distinct,
+        dialect=dialect,
+    )
+
     sql = """
     SELECT
         {columns}
@@ -76,6 +93,7 @@ def build_select_statement(
     if single_line:
         sql = statement_utils.statement_to_single_line(sql)
 
+    statement_utils.set_cached_statement(cache_key, sql)
     return sql, parameters
 
 
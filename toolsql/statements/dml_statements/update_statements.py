@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import functools
 import typing
 
+from toolsql import formats
 from toolsql import spec
 from .. import statement_utils
+from . import insert_statements
 
 
 def build_update_statement(
@@ -22,6 +25,7 @@ def build_update_statement(
     where_ilike: typing.Mapping[str, str] | None = None,
     where_in: typing.Mapping[str, typing.Sequence[str]] | None = None,
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
+    returning: spec.Returning | None = None,
 ) -> tuple[str, spec.ExecuteParams]:
     """
     - sqlite: https://www.sqlite.org/lang_update.html
@@ -34,10 +38,6 @@ def build_update_statement(
     columns, value_parameters = _get_columns_and_parameters(
         columns=columns, values=values
     )
-    placeholder = statement_utils.get_dialect_placeholder(dialect)
-    subclauses = [column + ' = ' + placeholder for column in columns]
-    value_set = ', '.join(subclauses)
-
     # where clause
     where_clause, where_parameters = statement_utils._where_clause_to_str(
         where_equals=where_equals,
@@ -54,6 +54,27 @@ def build_update_statement(
     )
 
     parameters = tuple(value_parameters) + where_parameters
+    returning_clause = statement_utils._get_returning_clause(
+        returning, dialect
+    )
+
+    # reuse sql text of previous queries with same shape
+    cache_key = (
+        'update',
+        dialect,
+        single_line,
+        table_name,
+        tuple(columns),
+        where_clause,
+        returning_clause,
+    )
+    cached = statement_utils.get_cached_statement(cache_key)
+    if cached is not None:
+        return cached, parameters
+
+    placeholder = statement_utils.get_dialect_placeholder(dialect)
+    subclauses = [column + ' = ' + placeholder for column in columns]
+    value_set = ', '.join(subclauses)
 
     sql = """
     UPDATE
@@ -61,27 +82,220 @@ def build_update_statement(
     SET
         {value_set}
     {where_clause}
+    {returning_clause}
     """.format(
         table_name=table_name,
         value_set=value_set,
         where_clause=where_clause,
+        returning_clause=returning_clause,
     )
 
     if single_line:
         sql = statement_utils.statement_to_single_line(sql)
 
+    statement_utils.set_cached_statement(cache_key, sql)
+
     return sql, tuple(parameters)
 
 
+def build_update_many_statements(
+    *,
+    dialect: spec.Dialect,
+    table: str | spec.TableSchema,
+    rows: spec.ExecuteManyParams,
+    key_columns: str | typing.Sequence[str],
+    columns: typing.Sequence[str] | None = None,
+    chunk_size: int | None = None,
+    returning: spec.Returning | None = None,
+) -> list[tuple[str, spec.ExecuteParams]]:
+    """build UPDATE statements that each set distinct values of many rows
+
+    - each statement has form
+      UPDATE t SET ... FROM (SELECT ... FROM (VALUES (...), ...)) AS v
+    - rows are matched to table rows by key_columns, other columns are set
+    - columns names the fields of tuple rows, required unless rows are dicts
+    - chunk_size is capped so that statements stay within parameter limits
+    - sqlite before 3.33 lacks UPDATE FROM, uses one statement per row
+
+    returns list of (sql, parameters) pairs, one per chunk
+    """
+
+    table_name = statement_utils.get_table_name(table)
+    if len(rows) == 0:
+        return []
+    rows = formats.encode_json_columns(rows=rows, dialect=dialect)
+
+    # determine columns
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    first_row = rows[0]
+    if columns is None:
+        if not isinstance(first_row, dict):
+            raise Exception('must specify columns or use dicts for rows')
+        columns = list(first_row.keys())
+        if isinstance(table, dict):
+            table_columns = {column['name'] for column in table['columns']}
+            for column in columns:
+                if column not in table_columns:
+                    raise Exception('not a column of table: ' + str(column))
+    for column in columns:
+        if not statement_utils.is_column_name(column):
+            raise Exception('not a valid column name: ' + str(column))
+    if len(key_columns) == 0:
+        raise Exception('must specify at least one key column')
+    for key_column in key_columns:
+        if key_column not in columns:
+            raise Exception('key column not in columns: ' + str(key_column))
+    set_columns = [column for column in columns if column not in key_columns]
+    if len(set_columns) == 0:
+        raise Exception('must update at least one non-key column')
+
+    # order parameters of each row as key columns then set columns
+    row_columns = list(key_columns) + set_columns
+    if isinstance(first_row, dict):
+        ordered_rows = []
+        for row in rows:
+            if not isinstance(row, dict):
+                raise Exception('all rows should have same format')
+            ordered_rows.append([row[column] for column in row_columns])
+    else:
+        indices = [columns.index(column) for column in row_columns]
+        ordered_rows = []
+        for row in rows:
+            if not isinstance(row, (list, tuple)) or len(row) != len(columns):
+                raise Exception('all rows should have same columns')
+            ordered_rows.append([row[index] for index in indices])
+
+    returning_clause = statement_utils._get_returning_clause(
+        returning, dialect
+    )
+    if dialect == 'sqlite':
+        import sqlite3
+
+        if sqlite3.sqlite_version_info < (3, 33, 0):
+            return _build_update_row_statements(
+                table=table,
+                key_columns=key_columns,
+                set_columns=set_columns,
+                ordered_rows=ordered_rows,
+            )
+
+    # determine number of rows per statement
+    max_parameters = insert_statements.get_max_parameters(dialect)
+    max_chunk_size = max(1, max_parameters // len(row_columns))
+    if chunk_size is None or chunk_size > max_chunk_size:
+        chunk_size = max_chunk_size
+    elif chunk_size < 1:
+        raise Exception('chunk_size must be positive')
+
+    # build statements
+    statements: list[tuple[str, spec.ExecuteParams]] = []
+    for start in range(0, len(ordered_rows), chunk_size):
+        chunk = ordered_rows[start : start + chunk_size]
+        sql = _get_update_many_template(
+            table_name=table_name,
+            key_columns=tuple(key_columns),
+            set_columns=tuple(set_columns),
+            n_rows=len(chunk),
+            dialect=dialect,
+            returning_clause=returning_clause,
+        )
+        parameters: list[typing.Any] = []
+        for ordered_row in chunk:
+            parameters.extend(ordered_row)
+        statements.append((sql, parameters))
+
+    return statements
+
+
+@functools.lru_cache(maxsize=256)
+def _get_update_many_template(
+    *,
+    table_name: str,
+    key_columns: tuple[str, ...],
+    set_columns: tuple[str, ...],
+    n_rows: int,
+    dialect: spec.Dialect,
+    returning_clause: str = '',
+) -> str:
+
+    # VALUES columns are named column1, column2, ... in both dialects
+    row_columns = key_columns + set_columns
+    values_expression = statement_utils._get_values_expression(
+        table_name=table_name,
+        columns=row_columns,
+        n_rows=n_rows,
+        dialect=dialect,
+    )
+    values_columns = ', '.join(
+        'column' + str(c + 1) + ' AS ' + column
+        for c, column in enumerate(row_columns)
+    )
+    values_table = (
+        'SELECT '
+        + values_columns
+        + ' FROM ('
+        + values_expression
+        + ') AS update_rows'
+    )
+    value_set = ', '.join(
+        column + ' = update_values.' + column for column in set_columns
+    )
+    key_matches = ' AND '.join(
+        table_name + '.' + column + ' = update_values.' + column
+        for column in key_columns
+    )
+
+    sql = """
+    UPDATE
+        {table_name}
+    SET
+        {value_set}
+    FROM
+        ({values_table}) AS update_values
+    WHERE {key_matches}
+    {returning_clause}
+    """.format(
+        table_name=table_name,
+        value_set=value_set,
+        values_table=values_table,
+        key_matches=key_matches,
+        returning_clause=returning_clause,
+    )
+    return statement_utils.statement_to_single_line(sql)
+
+
+def _build_update_row_statements(
+    *,
+    table: str | spec.TableSchema,
+    key_columns: typing.Sequence[str],
+    set_columns: typing.Sequence[str],
+    ordered_rows: typing.Sequence[typing.Sequence[typing.Any]],
+) -> list[tuple[str, spec.ExecuteParams]]:
+    n_keys = len(key_columns)
+    statements = []
+    for ordered_row in ordered_rows:
+        statements.append(
+            build_update_statement(
+                dialect='sqlite',
+                table=table,
+                columns=set_columns,
+                values=list(ordered_row[n_keys:]),
+                where_equals=dict(zip(key_columns, ordered_row[:n_keys])),
+            )
+        )
+    return statements
+
+
 def _get_columns_and_parameters(
     columns: typing.Sequence[str] | None,
     values: spec.ExecuteParams,
 ) -> tuple[typing.Sequence[str], typing.Sequence[str]]:
     if columns is None:
-        if not isinstance(values, dict):
-            raise Exception('must specify columns or use a dict for values')
-        elif isinstance(values, (list, tuple)):
+        if isinstance(values, dict):
             return tuple(values.keys()), tuple(values.values())
+        elif isinstance(values, (list, tuple)):
+            raise Exception('must specify columns or use a dict for values')
         else:
             raise Exception('invalid format for values: ' + str(type(values)))
     elif columns is not None:
@@ -1,31 +1,33 @@
 from __future__ import annotations
 
+import functools
+import re
 import typing
 
+from toolsql import formats
 from toolsql import spec
 
 
+_identifier_regex = re.compile(r'^[A-Za-z0-9_]+$')
+_function_call_regex = re.compile(r'^[A-Za-z0-9_]+\([A-Za-z0-9_]*\)$')
+_whitespace_regex = re.compile('[\n\t ]{2,}')
+
+
 #
 # # validation
 #
 
 
 def is_cast_type(cast_type: str) -> bool:
-    import re
-
-    return re.match(r'^[A-Za-z0-9_]+$', cast_type) is not None
+    return _identifier_regex.match(cast_type) is not None
 
 
 def is_table_name(table_name: str) -> bool:
-    import re
-
-    return re.match(r'^[A-Za-z0-9_]+$', table_name) is not None
+    return _identifier_regex.match(table_name) is not None
 
 
 def is_column_name(column: str) -> bool:
-    import re
-
-    return re.match(r'^[A-Za-z0-9_]+$', column) is not None
+    return _identifier_regex.match(column) is not None
 
 
 def is_function_call(column: str) -> bool:
@@ -38,9 +40,7 @@ def is_function_call(column: str) -> bool:
         return is_column_name(column[s])
 
     else:
-        import re
-
-        return re.match(r'^[A-Za-z0-9_]+\([A-Za-z0-9_]*\)$', column) is not None
+        return _function_call_regex.match(column) is not None
 
 
 def get_table_name(table: str | spec.TableSchema) -> str:
@@ -64,10 +64,8 @@ def get_table_name(table: str | spec.TableSchema) -> str:
 
 
 def statement_to_single_line(sql: str) -> str:
-    import re
-
     # https://stackoverflow.com/a/1546245
-    return re.sub('[\n\t ]{2,}', ' ', sql).strip()
+    return _whitespace_regex.sub(' ', sql).strip()
 
 
 def get_dialect_placeholder(dialect: spec.Dialect) -> str:
@@ -79,6 +77,58 @@ def get_dialect_placeholder(dialect: spec.Dialect) -> str:
         raise Exception('unknown dialect: ' + str(dialect))
 
 
+def _get_returning_clause(
+    returning: spec.Returning | None,
+    dialect: spec.Dialect,
+) -> str:
+    """build RETURNING clause of INSERT, UPDATE, or DELETE statement
+
+    sqlite supports RETURNING since 3.35
+    """
+
+    if returning is None:
+        return ''
+    if dialect == 'sqlite':
+        import sqlite3
+
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise Exception('RETURNING requires sqlite 3.35 or later')
+    if isinstance(returning, str):
+        returning = [returning]
+    if len(returning) == 0:
+        raise Exception('must specify at least one returning column')
+    for column in returning:
+        if column != '*' and not is_column_name(column):
+            raise Exception('not a valid column name: ' + str(column))
+    return 'RETURNING ' + ', '.join(returning)
+
+
+def _get_values_expression(
+    *,
+    table_name: str,
+    columns: typing.Sequence[str],
+    n_rows: int,
+    dialect: spec.Dialect,
+) -> str:
+    """build `VALUES (...), (...), ...` of placeholders for table columns
+
+    postgresql infers types of VALUES columns from a leading row of typed
+    NULLs taken from the table, which never matches because NULL = NULL is
+    not true
+    """
+
+    placeholder = get_dialect_placeholder(dialect)
+    row_expression = '(' + ', '.join([placeholder] * len(columns)) + ')'
+    row_expressions = [row_expression] * n_rows
+    if dialect == 'postgresql':
+        typed_nulls = [
+            '(NULL::' + table_name + ').' + column for column in columns
+        ]
+        row_expressions.insert(0, '(' + ', '.join(typed_nulls) + ')')
+
+    return 'VALUES ' + ', '.join(row_expressions)
+
+
 #
 # # statement creation
 #
@@ -268,104 +318,356 @@ def _where_filters_to_str(
     where_or: typing.Sequence[spec.WhereGroup] | None = None,
     table: str | spec.TableSchema | None,
 ) -> tuple[list[str], list[typing.Any]]:
+    """build where subclauses, reusing compiled clauses of the same shape"""
+
+    filters: _WhereFilters = (
+        where_equals,
+        where_gt,
+        where_gte,
+        where_lt,
+        where_lte,
+        where_like,
+        where_ilike,
+        where_in,
+        where_or,
+    )
 
     if isinstance(table, dict):
-        column_types = {
-            column['name']: column['type'].upper()
+        table_mode = 'schema'
+        binary_columns = frozenset(
+            column['name']
             for column in table['columns']
-        }
+            if column['type'].upper() in spec.binary_columntypes
+        )
+    elif isinstance(table, str):
+        table_mode = 'name'
+        binary_columns = frozenset()
+    else:
+        table_mode = None
+        binary_columns = frozenset()
+
+    subclauses, plan = _compile_where_filters(
+        dialect=dialect,
+        table_mode=table_mode,
+        binary_columns=binary_columns,
+        shape=_get_where_shape(filters, dialect, binary_columns),
+    )
+    parameters = _bind_where_parameters(plan, filters)
+    return list(subclauses), parameters
+
+
+#
+# # where clause compilation
+#
+
+# where filters in fixed order: 7 operators, where_in, where_or
+_WhereFilters = typing.Tuple[typing.Any, ...]
+_WhereShape = typing.Tuple[typing.Any, ...]
+_WherePlan = typing.Tuple[typing.Tuple[int, typing.Any, typing.Any], ...]
+
+_where_symbols = (' = ', ' > ', ' >= ', ' < ', ' <= ', ' LIKE ', ' ILIKE ')
+_where_in_index = 7
+_where_or_index = 8
+
+# where_in lists bound as a single parameter, see _get_where_in_size()
+_where_in_array_index = 9
+_where_in_json_index = 10
+
+# sqlite where_in lists longer than this are bound as a JSON array
+sqlite_where_in_json_threshold = 100
+_where_group_keys = (
+    'where_equals',
+    'where_gt',
+    'where_gte',
+    'where_lt',
+    'where_lte',
+    'where_like',
+    'where_ilike',
+    'where_in',
+    'where_or',
+)
+
+# how a parameter value is bound
+_bind_value = 0
+_bind_hex_to_bytes = 1
+_bind_warn_hex = 2
+
+
+def clear_statement_cache() -> None:
+    """clear cached statement compilations"""
+    _compile_where_filters.cache_clear()
+    _statement_cache.clear()
+
+
+def _get_where_shape(
+    filters: _WhereFilters,
+    dialect: spec.Dialect,
+    binary_columns: typing.FrozenSet[str],
+) -> _WhereShape:
+    """shape is the filter structure of a query, independent of its values
+
+    - column names of each operator
+    - number of values of each WHERE IN, or None if bound as one parameter
+    - shapes of each WHERE OR group
+    """
+    shape: list[typing.Any] = []
+    for item in filters[:_where_in_index]:
+        if item is None:
+            shape.append(None)
+        else:
+            shape.append(tuple(item.keys()))
+
+    where_in = filters[_where_in_index]
+    if where_in is None:
+        shape.append(None)
+    else:
+        shape.append(
+            tuple(
+                (
+                    column_name,
+                    _get_where_in_size(
+                        column_name, column_value, dialect, binary_columns
+                    ),
+                )
+                for column_name, column_value in where_in.items()
+            )
+        )
+
+    where_or = filters[_where_or_index]
+    if where_or is None:
+        shape.append(None)
+    else:
+        shape.append(
+            tuple(
+                _get_where_shape(
+                    _get_where_group_filters(group), dialect, binary_columns
+                )
+                for group in where_or
+            )
+        )
+
+    return tuple(shape)
+
+
+def _get_where_in_size(
+    column_name: str,
+    values: typing.Sequence[typing.Any],
+    dialect: spec.Dialect,
+    binary_columns: typing.FrozenSet[str],
+) -> int | None:
+    """get number of WHERE IN placeholders, None to bind as one parameter
+
+    - postgresql binds lists of one type as an array, `column = ANY(%s)`
+    - sqlite binds long lists of scalars as a JSON array,
+      `column IN (SELECT +value FROM json_each(?))`, where unary + lets the
+      column's type affinity apply to json values as it does to placeholders
+    """
+    if len(values) == 0:
+        return 0
+    elif dialect == 'postgresql':
+        # psycopg cannot dump lists of mixed types as an array
+        value_types = {type(value) for value in values if value is not None}
+        if len(value_types) == 1:
+            return None
+        else:
+            return len(values)
+    elif (
+        dialect == 'sqlite'
+        and len(values) > sqlite_where_in_json_threshold
+        and column_name not in binary_columns
+        and all(
+            isinstance(value, (int, float, str)) or value is None
+            for value in values
+        )
+    ):
+        return None
     else:
-        column_types = {}
+        return len(values)
+
+
+def _get_where_group_filters(group: spec.WhereGroup) -> _WhereFilters:
+    for key in group.keys():
+        if key not in _where_group_keys:
+            raise Exception('unknown where filter: ' + str(key))
+    return tuple(group.get(key) for key in _where_group_keys)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_where_filters(
+    *,
+    dialect: spec.Dialect,
+    table_mode: str | None,
+    binary_columns: typing.FrozenSet[str],
+    shape: _WhereShape,
+) -> tuple[tuple[str, ...], _WherePlan]:
+    """compile where shape into subclauses and a parameter binding plan"""
 
     placeholder = get_dialect_placeholder(dialect)
     subclauses = []
-    parameters = []
-
-    for item, symbol in [
-        (where_equals, ' = '),
-        (where_gt, ' > '),
-        (where_gte, ' >= '),
-        (where_lt, ' < '),
-        (where_lte, ' <= '),
-        (where_like, ' LIKE '),
-        (where_ilike, ' ILIKE '),
-    ]:
-        if item is not None:
-            for column_name, column_value in item.items():
-                if not is_column_name(column_name):
-                    raise Exception('not a valid column name')
-
-                # handle dialect-specific operations
-                if dialect == 'sqlite':
-                    if symbol == ' ILIKE ':
-                        # in sqlite LIKE Is case-insensitive by default
-                        symbol = ' LIKE '
-                    elif symbol == ' LIKE ':
-                        raise NotImplementedError(
-                            'case-sensitive LIKE for sqlite'
-                        )
-
-                # convert hex to binary
-                if (
-                    symbol == ' = '
-                    and column_types.get(column_name) in spec.binary_columntypes
-                ):
-                    column_value = _convert_hex_to_bytes(column_value)
-                elif (
-                    symbol == ' = '
-                    and isinstance(table, str)
-                    and _is_hex_str(column_value)
-                ):
-                    import warnings
-
-                    warnings.warn(
-                        'should provide full table schema in order to convert hex byte strs to binary'
-                    )
-
-                subclauses.append(column_name + symbol + placeholder)
-                parameters.append(column_value)
-
-    if where_in is not None:
-        for column_name, column_value in where_in.items():
-
-            if len(column_value) == 0:
+    plan: list[tuple[int, typing.Any, typing.Any]] = []
+
+    for index, symbol in enumerate(_where_symbols):
+        column_names = shape[index]
+        if column_names is None:
+            continue
+        for column_name in column_names:
+            if not is_column_name(column_name):
+                raise Exception('not a valid column name')
+
+            # handle dialect-specific operations
+            if dialect == 'sqlite':
+                if symbol == ' ILIKE ':
+                    # in sqlite LIKE Is case-insensitive by default
+                    symbol = ' LIKE '
+                elif symbol == ' LIKE ':
+                    raise NotImplementedError('case-sensitive LIKE for sqlite')
+
+            # convert hex to binary
+            if symbol == ' = ' and column_name in binary_columns:
+                mode = _bind_hex_to_bytes
+            elif symbol == ' = ' and table_mode == 'name':
+                mode = _bind_warn_hex
+            else:
+                mode = _bind_value
+
+            subclauses.append(column_name + symbol + placeholder)
+            plan.append((index, column_name, mode))
+
+    where_in_shape = shape[_where_in_index]
+    if where_in_shape is not None:
+        for column_name, n_values in where_in_shape:
+
+            if n_values == 0:
                 raise Exception('cannot use WHERE IN with empty list')
 
             # convert hex to binary
-            if (
-                column_types is not None
-                and column_types.get(column_name) in spec.binary_columntypes
-            ):
-                column_value = [
-                    _convert_hex_to_bytes(subvalue) for subvalue in column_value
-                ]
-            elif isinstance(table, str):
-                for subvalue in column_value:
-                    if _is_hex_str(subvalue):
-                        import warnings
-
-                        warnings.warn(
-                            'should provide full table schema in order to convert hex byte strs to binary'
-                        )
+            if column_name in binary_columns:
+                mode = _bind_hex_to_bytes
+            elif table_mode == 'name':
+                mode = _bind_warn_hex
+            else:
+                mode = _bind_value
 
             if not is_column_name(column_name):
                 raise Exception('not a valid column name')
-            multiplaceholder = ','.join([placeholder] * len(column_value))
-            subclauses.append(column_name + ' IN (' + multiplaceholder + ')')
-            for subitem in column_value:
-                parameters.append(subitem)
+            if n_values is None and dialect == 'postgresql':
+                subclauses.append(column_name + ' = ANY(' + placeholder + ')')
+                plan.append((_where_in_array_index, column_name, mode))
+            elif n_values is None:
+                subclauses.append(
+                    column_name
+                    + ' IN (SELECT +value FROM json_each('
+                    + placeholder
+                    + '))'
+                )
+                plan.append((_where_in_json_index, column_name, mode))
+            else:
+                multiplaceholder = ','.join([placeholder] * n_values)
+                subclauses.append(
+                    column_name + ' IN (' + multiplaceholder + ')'
+                )
+                plan.append((_where_in_index, column_name, mode))
 
-    if where_or is not None and len(where_or) > 0:
+    where_or_shape = shape[_where_or_index]
+    if where_or_shape is not None and len(where_or_shape) > 0:
         subsubclauses = []
-        for sub_where_or in where_or:
-            subsubclause, subparameters = _where_filters_to_str(
-                dialect=dialect, table=table, **sub_where_or
+        for g, group_shape in enumerate(where_or_shape):
+            group_subclauses, group_plan = _compile_where_filters(
+                dialect=dialect,
+                table_mode=table_mode,
+                binary_columns=binary_columns,
+                shape=group_shape,
             )
-            subsubclauses.append(' AND '.join(subsubclause))
-            parameters.extend(subparameters)
+            subsubclauses.append(' AND '.join(group_subclauses))
+            plan.append((_where_or_index, g, group_plan))
         subclauses.append('(' + ' OR '.join(subsubclauses) + ')')
 
-    return subclauses, parameters
+    return tuple(subclauses), tuple(plan)
+
+
+def _bind_where_parameters(
+    plan: _WherePlan, filters: _WhereFilters
+) -> list[typing.Any]:
+    """gather parameter values of filters in the order given by plan"""
+
+    parameters: list[typing.Any] = []
+    for index, key, mode in plan:
+        if index < _where_in_index:
+            parameters.append(_bind_value_mode(filters[index][key], mode))
+        elif index == _where_in_index:
+            for subvalue in filters[index][key]:
+                parameters.append(_bind_value_mode(subvalue, mode))
+        elif index == _where_or_index:
+            group = filters[_where_or_index][key]
+            parameters.extend(
+                _bind_where_parameters(mode, _get_where_group_filters(group))
+            )
+        else:
+            values = [
+                _bind_value_mode(subvalue, mode)
+                for subvalue in filters[_where_in_index][key]
+            ]
+            if index == _where_in_array_index:
+                parameters.append(values)
+            else:
+                parameters.append(formats.get_json_codec()['dumps'](values))
+    return parameters
+
+
+def _bind_value_mode(value: typing.Any, mode: int) -> typing.Any:
+    if mode == _bind_value:
+        return value
+    elif mode == _bind_hex_to_bytes:
+        return _convert_hex_to_bytes(value)
+    elif mode == _bind_warn_hex:
+        if _is_hex_str(value):
+            import warnings
+
+            warnings.warn(
+                'should provide full table schema in order to convert hex byte strs to binary'
+            )
+        return value
+    else:
+        raise Exception('unknown bind mode: ' + str(mode))
+
+
+#
+# # statement text cache
+#
+
+_statement_cache: typing.MutableMapping[typing.Hashable, str] = {}
+_max_cached_statements = 4096
+
+
+def get_cached_statement(key: typing.Hashable) -> str | None:
+    """get finished sql text for key, None if not cached or unhashable"""
+    try:
+        return _statement_cache.get(key)
+    except TypeError:
+        return None
+
+
+def set_cached_statement(key: typing.Hashable, sql: str) -> None:
+    try:
+        if len(_statement_cache) >= _max_cached_statements:
+            _statement_cache.clear()
+        _statement_cache[key] = sql
+    except TypeError:
+        pass
+
+
+def freeze_statement_arg(arg: typing.Any) -> typing.Hashable:
+    """convert statement argument to hashable form for use in cache keys"""
+    if isinstance(arg, (list, tuple)):
+        return (type(arg).__name__,) + tuple(
+            freeze_statement_arg(item) for item in arg
+        )
+    elif isinstance(arg, dict):
+        return ('dict',) + tuple(
+            (key, freeze_statement_arg(value)) for key, value in arg.items()
+        )
+    else:
+        return arg  # type: ignore
 
 
 def _is_hex_str(s: typing.Any) -> bool:
@@ -406,10 +708,10 @@ def populate_sql_parameters(
         sql = sql.replace('?', "{}")
         formatted_parameters = []
         for parameter in parameters:
-            if isinstance(parameter, int):
+            if isinstance(parameter, (int, float)):
                 formated_parameter = str(parameter)
             elif isinstance(parameter, str):
-                formated_parameter = '"' + parameter + '"'
+                formated_parameter = "'" + parameter.replace("'", "''") + "'"
             elif isinstance(parameter, bytes):
                 formated_parameter = "x'" + parameter.hex() + "'"
             else: